@@ -1,4 +1,5 @@
 import os
+import sqlite3
 import sys
 from pathlib import Path
 
@@ -8,7 +9,29 @@ sys.path.append(src_dir)
 
 from src.database import db
 
+def split_statements(sql):
+    """Divide un script SQL en sentencias completas.
+
+    A diferencia de un simple split(';') respeta los ';' dentro de los cuerpos
+    BEGIN ... END de los triggers.
+    """
+    statements = []
+    current = ''
+    for line in sql.splitlines(keepends=True):
+        if not current and line.strip().startswith('--'):
+            continue
+        current += line
+        if sqlite3.complete_statement(current):
+            statements.append(current.strip())
+            current = ''
+    if current.strip():
+        statements.append(current.strip())
+    return statements
+
 def run_migrations():
+    # Las migraciones parten del esquema base
+    db.preparar_esquema()
+    
     # Get the directory containing migration files
     migrations_dir = os.path.join(src_dir, 'src', 'database', 'migrations')
     
@@ -39,8 +62,8 @@ def run_migrations():
                     sql = f.read()
                 
                 # Execute each statement separately
-                for statement in sql.split(';'):
-                    statement = statement.strip()
+                for statement in split_statements(sql):
+                    statement = statement.rstrip(';').strip()
                     if not statement:
                         continue
                         
@@ -58,8 +81,7 @@ def run_migrations():
                         # Check if column exists
                         result = db.execute_query(
                             f"SELECT 1 FROM pragma_table_info('{table_name}') WHERE name = ?", 
-                            (column_name,),
-                            fetch_one=True
+                            (column_name,)
                         )
                         
                         if not result:
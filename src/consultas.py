@@ -0,0 +1,557 @@
+import re
+import sqlite3
+import threading
+from collections import namedtuple
+
+# Formas de resultado de una consulta registrada
+FILAS = 'filas'      # lista de filas (fetchall)
+FILA = 'fila'        # primera fila o None
+ESCALAR = 'escalar'  # primera columna de la primera fila o None
+ID = 'id'            # lastrowid de un INSERT
+CAMBIOS = 'cambios'  # número de filas afectadas
+
+
+def _escalar(cursor):
+    fila = cursor.fetchone()
+    return fila[0] if fila is not None else None
+
+
+# Cómo se lee el resultado según la forma declarada (sin inspeccionar el SQL)
+LECTORES = {
+    FILAS: lambda cursor: cursor.fetchall(),
+    FILA: lambda cursor: cursor.fetchone(),
+    ESCALAR: _escalar,
+    ID: lambda cursor: cursor.lastrowid,
+    CAMBIOS: lambda cursor: cursor.rowcount,
+}
+
+Consulta = namedtuple('Consulta', 'nombre sql forma')
+
+# Registro central: nombre → Consulta. Las sentencias cuyo texto depende de los
+# argumentos (listas IN de tamaño variable, filtros opcionales de los listados
+# de ventas, lotes VALUES) se siguen armando en los modelos con execute_query.
+CONSULTAS = {}
+
+
+def registrar(nombre, sql, forma=FILAS):
+    """Agrega una consulta al registro.
+
+    El SQL debe ser una única sentencia completa con parámetros ``?``. La
+    forma indica qué devuelve ``Database.consultar``.
+    """
+    if nombre in CONSULTAS:
+        raise ValueError(f"Consulta registrada dos veces: {nombre}")
+    if forma not in LECTORES:
+        raise ValueError(f"Forma de resultado desconocida para {nombre}: {forma!r}")
+    sql = sql.strip().rstrip(';').strip()
+    if not sqlite3.complete_statement(sql + ';'):
+        raise ValueError(f"SQL incompleto en la consulta {nombre}")
+    CONSULTAS[nombre] = Consulta(nombre, sql, forma)
+    return CONSULTAS[nombre]
+
+
+def obtener(nombre):
+    try:
+        return CONSULTAS[nombre]
+    except KeyError:
+        raise ValueError(f"Consulta no registrada: {nombre}") from None
+
+
+def _num_parametros(sql):
+    # Los literales entre comillas no cuentan
+    return re.sub(r"'[^']*'", "", sql).count('?')
+
+
+def validar(connection):
+    """Compila cada consulta registrada (EXPLAIN) sin ejecutarla.
+
+    Devuelve una lista de ``(nombre, error)`` con las que no compilan contra el
+    esquema actual, por ejemplo por una tabla o columna inexistente.
+    """
+    errores = []
+    for consulta in CONSULTAS.values():
+        try:
+            connection.execute('EXPLAIN ' + consulta.sql, (None,) * _num_parametros(consulta.sql)).fetchall()
+        except sqlite3.Error as e:
+            errores.append((consulta.nombre, str(e)))
+    return errores
+
+
+class EstadisticasConsultas:
+    """Número de ejecuciones y latencia acumulada por nombre de consulta"""
+
+    def __init__(self):
+        self._datos = {}
+        self._lock = threading.Lock()
+
+    def registrar(self, nombre, segundos):
+        with self._lock:
+            datos = self._datos.get(nombre)
+            if datos is None:
+                self._datos[nombre] = [1, segundos, segundos]
+            else:
+                datos[0] += 1
+                datos[1] += segundos
+                if segundos > datos[2]:
+                    datos[2] = segundos
+
+    def resumen(self):
+        """Lista de ``(nombre, veces, total_ms, medio_ms, maximo_ms)`` ordenada por tiempo total"""
+        with self._lock:
+            filas = [
+                (nombre, veces, total * 1000, total * 1000 / veces, maximo * 1000)
+                for nombre, (veces, total, maximo) in self._datos.items()
+            ]
+        return sorted(filas, key=lambda fila: fila[2], reverse=True)
+
+    def reporte(self):
+        """Tabla de texto con el resumen"""
+        lineas = [f"{'consulta':<36} {'veces':>8} {'total ms':>10} {'medio ms':>9} {'máx ms':>9}"]
+        for nombre, veces, total, medio, maximo in self.resumen():
+            lineas.append(f"{nombre:<36} {veces:>8} {total:>10.1f} {medio:>9.3f} {maximo:>9.3f}")
+        return "\n".join(lineas)
+
+    def reiniciar(self):
+        with self._lock:
+            self._datos.clear()
+
+
+# --- Esquema -----------------------------------------------------------------
+
+registrar('esquema.existe_tabla', """
+SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?
+""", ESCALAR)
+
+# --- Categorías --------------------------------------------------------------
+
+registrar('categorias.insertar', """
+INSERT INTO categorias (nombre, descripcion)
+VALUES (?, ?)
+""", ID)
+
+registrar('categorias.actualizar', """
+UPDATE categorias
+SET nombre = ?, descripcion = ?
+WHERE id = ?
+""", CAMBIOS)
+
+registrar('categorias.contar_productos', """
+SELECT COUNT(*) FROM productos WHERE categoria_id = ?
+""", ESCALAR)
+
+registrar('categorias.eliminar', """
+DELETE FROM categorias WHERE id = ?
+""", CAMBIOS)
+
+registrar('categorias.todas', """
+SELECT * FROM categorias ORDER BY nombre
+""")
+
+registrar('categorias.por_id', """
+SELECT * FROM categorias WHERE id = ?
+""", FILA)
+
+registrar('categorias.buscar_por_nombre', """
+SELECT * FROM categorias WHERE nombre LIKE ? ORDER BY nombre
+""")
+
+# Parámetros: patrón LIKE del nombre dos veces (NULL = todas)
+registrar('categorias.con_totales_resumen', """
+SELECT c.id, c.nombre, c.descripcion, c.fecha_creacion,
+       IFNULL(r.num_productos, 0) AS num_productos,
+       IFNULL(r.unidades, 0) AS unidades,
+       IFNULL(r.valor, 0) AS valor_inventario
+FROM categorias c
+LEFT JOIN categorias_resumen r ON r.categoria_id = c.id
+WHERE (? IS NULL OR c.nombre LIKE ?)
+ORDER BY c.nombre
+""")
+
+registrar('categorias.con_totales_agregado', """
+SELECT c.id, c.nombre, c.descripcion, c.fecha_creacion,
+       COUNT(p.id) AS num_productos,
+       IFNULL(SUM(p.cantidad), 0) AS unidades,
+       IFNULL(SUM(p.precio * p.cantidad), 0) AS valor_inventario
+FROM categorias c
+LEFT JOIN productos p ON p.categoria_id = c.id
+WHERE (? IS NULL OR c.nombre LIKE ?)
+GROUP BY c.id
+ORDER BY c.nombre
+""")
+
+# --- Productos ---------------------------------------------------------------
+
+registrar('productos.insertar', """
+INSERT INTO productos (codigo, nombre, descripcion, precio, cantidad, categoria_id)
+VALUES (?, ?, ?, ?, ?, ?)
+""", ID)
+
+registrar('productos.actualizar', """
+UPDATE productos
+SET codigo = ?, nombre = ?, descripcion = ?,
+    precio = ?, cantidad = ?, categoria_id = ?
+WHERE id = ?
+""", CAMBIOS)
+
+registrar('productos.fijar_cantidad', """
+UPDATE productos SET cantidad = ? WHERE id = ?
+""", CAMBIOS)
+
+registrar('productos.sumar_cantidad', """
+UPDATE productos SET cantidad = cantidad + ? WHERE id = ?
+""", CAMBIOS)
+
+registrar('productos.contar_ventas', """
+SELECT COUNT(*) FROM venta_items WHERE producto_id = ?
+""", ESCALAR)
+
+registrar('productos.eliminar', """
+DELETE FROM productos WHERE id = ?
+""", CAMBIOS)
+
+registrar('productos.todos', """
+SELECT p.*, c.nombre as categoria_nombre
+FROM productos p
+LEFT JOIN categorias c ON p.categoria_id = c.id
+ORDER BY p.nombre
+""")
+
+registrar('productos.por_categoria', """
+SELECT p.*, c.nombre as categoria_nombre
+FROM productos p
+LEFT JOIN categorias c ON p.categoria_id = c.id
+WHERE p.categoria_id = ?
+ORDER BY p.nombre
+""")
+
+registrar('productos.por_id', """
+SELECT p.*, c.nombre as categoria_nombre
+FROM productos p
+LEFT JOIN categorias c ON p.categoria_id = c.id
+WHERE p.id = ?
+""", FILA)
+
+registrar('productos.por_codigo', """
+SELECT p.*, c.nombre as categoria_nombre
+FROM productos p
+LEFT JOIN categorias c ON p.categoria_id = c.id
+WHERE p.codigo = ?
+""", FILA)
+
+registrar('productos.coincidencias_fts', """
+SELECT COUNT(*) FROM productos_fts WHERE productos_fts MATCH ?
+""", ESCALAR)
+
+# Parámetros: expresión MATCH, categoría dos veces (NULL = todas), límite (-1 = sin límite)
+registrar('productos.buscar_fts', """
+SELECT p.*, c.nombre as categoria_nombre
+FROM productos_fts f
+JOIN productos p ON p.id = f.rowid
+LEFT JOIN categorias c ON p.categoria_id = c.id
+WHERE productos_fts MATCH ? AND (? IS NULL OR p.categoria_id = ?)
+ORDER BY f.rank, p.nombre
+LIMIT ?
+""")
+
+# Igual que buscar_fts pero sin ordenar por relevancia (búsquedas muy amplias)
+registrar('productos.buscar_fts_sin_orden', """
+SELECT p.*, c.nombre as categoria_nombre
+FROM productos_fts f
+JOIN productos p ON p.id = f.rowid
+LEFT JOIN categorias c ON p.categoria_id = c.id
+WHERE productos_fts MATCH ? AND (? IS NULL OR p.categoria_id = ?)
+LIMIT ?
+""")
+
+# Parámetros: patrón LIKE dos veces, categoría dos veces, límite
+registrar('productos.buscar_like', """
+SELECT p.*, c.nombre as categoria_nombre
+FROM productos p
+LEFT JOIN categorias c ON p.categoria_id = c.id
+WHERE (p.nombre LIKE ? OR p.codigo LIKE ?) AND (? IS NULL OR p.categoria_id = ?)
+ORDER BY p.nombre
+LIMIT ?
+""")
+
+# Resumen del inventario (ver Producto.resumen_inventario). El primer parámetro
+# es el umbral de bajo stock; luego los mismos filtros que las búsquedas
+registrar('productos.resumen', """
+SELECT COUNT(*) AS productos,
+       IFNULL(SUM(p.cantidad < ?), 0) AS bajo_stock,
+       IFNULL(SUM(p.cantidad), 0) AS unidades,
+       IFNULL(SUM(p.precio * p.cantidad), 0) AS valor
+FROM productos p
+WHERE (? IS NULL OR p.categoria_id = ?)
+""", FILA)
+
+registrar('productos.resumen_fts', """
+SELECT COUNT(*) AS productos,
+       IFNULL(SUM(p.cantidad < ?), 0) AS bajo_stock,
+       IFNULL(SUM(p.cantidad), 0) AS unidades,
+       IFNULL(SUM(p.precio * p.cantidad), 0) AS valor
+FROM productos_fts f
+JOIN productos p ON p.id = f.rowid
+WHERE productos_fts MATCH ? AND (? IS NULL OR p.categoria_id = ?)
+""", FILA)
+
+registrar('productos.resumen_like', """
+SELECT COUNT(*) AS productos,
+       IFNULL(SUM(p.cantidad < ?), 0) AS bajo_stock,
+       IFNULL(SUM(p.cantidad), 0) AS unidades,
+       IFNULL(SUM(p.precio * p.cantidad), 0) AS valor
+FROM productos p
+WHERE (p.nombre LIKE ? OR p.codigo LIKE ?) AND (? IS NULL OR p.categoria_id = ?)
+""", FILA)
+
+# Movimientos (ver src/models/movimiento.py). El saldo es el stock que deja el
+# movimiento: se registran después de cambiar la cantidad del producto.
+# Parámetros: producto, tipo, cantidad, notas, fecha y otra vez el producto
+registrar('movimientos.insertar', """
+INSERT INTO movimientos (producto_id, tipo, cantidad, notas, fecha, saldo)
+VALUES (?, ?, ?, ?, ?, (SELECT cantidad FROM productos WHERE id = ?))
+""", ID)
+
+# Registra el cambio a una cantidad nueva antes de fijarla (nada si no cambia).
+# Parámetros: cantidad nueva dos veces, notas, fecha, cantidad nueva, producto,
+# cantidad nueva
+registrar('movimientos.registrar_ajuste', """
+INSERT INTO movimientos (producto_id, tipo, cantidad, notas, fecha, saldo)
+SELECT id, CASE WHEN ? > cantidad THEN 'entrada' ELSE 'salida' END, abs(? - cantidad), ?, ?, ?
+FROM productos
+WHERE id = ? AND cantidad <> ?
+""", CAMBIOS)
+
+# Stock de un producto antes de un instante (exclusivo): el saldo de su último
+# movimiento anterior; si no hay, el stock previo a su primer movimiento
+# posterior; si no tiene movimientos, su cantidad actual.
+# Parámetros: instante dos veces y el producto
+registrar('movimientos.stock_en_fecha', """
+SELECT COALESCE(
+    (SELECT m.saldo FROM movimientos m
+     WHERE m.producto_id = p.id AND m.fecha < ?
+     ORDER BY m.fecha DESC, m.id DESC LIMIT 1),
+    (SELECT m.saldo - CASE WHEN m.tipo = 'salida' THEN -m.cantidad ELSE m.cantidad END
+     FROM movimientos m
+     WHERE m.producto_id = p.id AND m.fecha >= ?
+     ORDER BY m.fecha, m.id LIMIT 1),
+    p.cantidad
+) AS stock
+FROM productos p
+WHERE p.id = ?
+""", ESCALAR)
+
+# Lo mismo para todo el catálogo (una búsqueda en el índice por producto)
+registrar('movimientos.stock_en_fecha_todos', """
+SELECT p.id, p.codigo, p.nombre, p.precio, COALESCE(
+    (SELECT m.saldo FROM movimientos m
+     WHERE m.producto_id = p.id AND m.fecha < ?
+     ORDER BY m.fecha DESC, m.id DESC LIMIT 1),
+    (SELECT m.saldo - CASE WHEN m.tipo = 'salida' THEN -m.cantidad ELSE m.cantidad END
+     FROM movimientos m
+     WHERE m.producto_id = p.id AND m.fecha >= ?
+     ORDER BY m.fecha, m.id LIMIT 1),
+    p.cantidad
+) AS stock
+FROM productos p
+ORDER BY p.id
+""")
+
+# Parámetros: producto, desde (inclusive), hasta (exclusivo)
+registrar('movimientos.de_producto', """
+SELECT * FROM movimientos
+WHERE producto_id = ? AND fecha >= ? AND fecha < ?
+ORDER BY fecha, id
+""")
+
+registrar('movimientos.eliminar_de_producto', """
+DELETE FROM movimientos WHERE producto_id = ?
+""", CAMBIOS)
+
+# --- Ventas ------------------------------------------------------------------
+
+registrar('ventas.insertar', """
+INSERT INTO ventas (codigo_venta, fecha_venta, total, estado, notas)
+VALUES (?, ?, ?, ?, ?)
+""", ID)
+
+registrar('ventas.actualizar', """
+UPDATE ventas
+SET total = ?, estado = ?, notas = ?
+WHERE id = ?
+""", CAMBIOS)
+
+registrar('ventas.cancelar', """
+UPDATE ventas SET estado = 'cancelada', notas = ? WHERE id = ?
+""", CAMBIOS)
+
+registrar('ventas.por_id', """
+SELECT * FROM ventas WHERE id = ?
+""", FILA)
+
+# Guarda en los ítems recién insertados la categoría actual de cada producto
+registrar('venta_items.fijar_categorias', """
+UPDATE venta_items
+SET categoria_id = IFNULL((SELECT p.categoria_id FROM productos p WHERE p.id = venta_items.producto_id), 0)
+WHERE venta_id = ?
+""", CAMBIOS)
+
+registrar('venta_items.de_venta', """
+SELECT * FROM venta_items WHERE venta_id = ? ORDER BY id
+""")
+
+registrar('venta_items.eliminar_de_venta', """
+DELETE FROM venta_items WHERE venta_id = ?
+""", CAMBIOS)
+
+# --- Reportes (acumulados diarios, ver src/models/reporte.py) ---------------
+
+# Suman (signo 1) o restan (signo -1) una venta completada a los acumulados de
+# su día. Parámetros: signo tres veces y el id de la venta
+registrar('reportes.sumar_venta_dia', """
+INSERT INTO ventas_diarias (fecha, ventas, unidades, ingresos)
+SELECT date(v.fecha_venta), ?,
+       ? * IFNULL((SELECT SUM(vi.cantidad) FROM venta_items vi WHERE vi.venta_id = v.id), 0),
+       ? * v.total
+FROM ventas v
+WHERE v.id = ? AND v.estado = 'completada'
+ON CONFLICT(fecha) DO UPDATE SET
+    ventas = ventas + excluded.ventas,
+    unidades = unidades + excluded.unidades,
+    ingresos = ingresos + excluded.ingresos
+""", CAMBIOS)
+
+registrar('reportes.sumar_venta_productos', """
+INSERT INTO ventas_diarias_producto (fecha, producto_id, ventas, unidades, ingresos)
+SELECT date(v.fecha_venta), vi.producto_id, ?, ? * SUM(vi.cantidad), ? * SUM(vi.subtotal)
+FROM ventas v
+JOIN venta_items vi ON vi.venta_id = v.id
+WHERE v.id = ? AND v.estado = 'completada'
+GROUP BY vi.producto_id
+ON CONFLICT(fecha, producto_id) DO UPDATE SET
+    ventas = ventas + excluded.ventas,
+    unidades = unidades + excluded.unidades,
+    ingresos = ingresos + excluded.ingresos
+""", CAMBIOS)
+
+registrar('reportes.sumar_venta_categorias', """
+INSERT INTO ventas_diarias_categoria (fecha, categoria_id, ventas, unidades, ingresos)
+SELECT date(v.fecha_venta), COALESCE(vi.categoria_id, p.categoria_id, 0), ?, ? * SUM(vi.cantidad), ? * SUM(vi.subtotal)
+FROM ventas v
+JOIN venta_items vi ON vi.venta_id = v.id
+LEFT JOIN productos p ON p.id = vi.producto_id
+WHERE v.id = ? AND v.estado = 'completada'
+GROUP BY COALESCE(vi.categoria_id, p.categoria_id, 0)
+ON CONFLICT(fecha, categoria_id) DO UPDATE SET
+    ventas = ventas + excluded.ventas,
+    unidades = unidades + excluded.unidades,
+    ingresos = ingresos + excluded.ingresos
+""", CAMBIOS)
+
+registrar('reportes.sumar_venta_productos_mes', """
+INSERT INTO ventas_mensuales_producto (mes, producto_id, ventas, unidades, ingresos)
+SELECT substr(date(v.fecha_venta), 1, 7), vi.producto_id, ?, ? * SUM(vi.cantidad), ? * SUM(vi.subtotal)
+FROM ventas v
+JOIN venta_items vi ON vi.venta_id = v.id
+WHERE v.id = ? AND v.estado = 'completada'
+GROUP BY vi.producto_id
+ON CONFLICT(mes, producto_id) DO UPDATE SET
+    ventas = ventas + excluded.ventas,
+    unidades = unidades + excluded.unidades,
+    ingresos = ingresos + excluded.ingresos
+""", CAMBIOS)
+
+# Totales por periodo. Parámetros: fecha desde y hasta (YYYY-MM-DD, inclusive)
+registrar('reportes.por_dia', """
+SELECT fecha AS periodo, ventas, unidades, ingresos
+FROM ventas_diarias
+WHERE fecha BETWEEN ? AND ? AND ventas > 0
+ORDER BY fecha
+""")
+
+registrar('reportes.por_mes', """
+SELECT substr(fecha, 1, 7) AS periodo, SUM(ventas) AS ventas,
+       SUM(unidades) AS unidades, SUM(ingresos) AS ingresos
+FROM ventas_diarias
+WHERE fecha BETWEEN ? AND ?
+GROUP BY periodo
+HAVING SUM(ventas) > 0
+ORDER BY periodo
+""")
+
+registrar('reportes.por_anio', """
+SELECT substr(fecha, 1, 4) AS periodo, SUM(ventas) AS ventas,
+       SUM(unidades) AS unidades, SUM(ingresos) AS ingresos
+FROM ventas_diarias
+WHERE fecha BETWEEN ? AND ?
+GROUP BY periodo
+HAVING SUM(ventas) > 0
+ORDER BY periodo
+""")
+
+registrar('reportes.totales', """
+SELECT IFNULL(SUM(ventas), 0) AS ventas, IFNULL(SUM(unidades), 0) AS unidades,
+       IFNULL(SUM(ingresos), 0) AS ingresos
+FROM ventas_diarias
+WHERE fecha BETWEEN ? AND ?
+""", FILA)
+
+# Parámetros: fecha desde, fecha hasta, límite
+registrar('reportes.productos', """
+SELECT r.producto_id, IFNULL(p.codigo, '') AS codigo,
+       IFNULL(p.nombre, 'Producto eliminado') AS nombre,
+       SUM(r.ventas) AS ventas, SUM(r.unidades) AS unidades, SUM(r.ingresos) AS ingresos
+FROM ventas_diarias_producto r
+LEFT JOIN productos p ON p.id = r.producto_id
+WHERE r.fecha BETWEEN ? AND ?
+GROUP BY r.producto_id
+HAVING SUM(r.unidades) > 0
+ORDER BY ingresos DESC
+LIMIT ?
+""")
+
+registrar('reportes.categorias', """
+SELECT r.categoria_id, IFNULL(c.nombre, 'Sin categoría') AS nombre,
+       SUM(r.ventas) AS ventas, SUM(r.unidades) AS unidades, SUM(r.ingresos) AS ingresos
+FROM ventas_diarias_categoria r
+LEFT JOIN categorias c ON c.id = r.categoria_id
+WHERE r.fecha BETWEEN ? AND ?
+GROUP BY r.categoria_id
+HAVING SUM(r.unidades) > 0
+ORDER BY ingresos DESC
+""")
+
+# --- Análisis de ventas por producto (ver src/models/analisis.py) ------------
+
+# Totales por producto en un rango, con los puestos y el acumulado de ingresos
+# calculados con funciones de ventana. El rango se arma con los meses completos
+# de ventas_mensuales_producto y los días sueltos de los extremos en
+# ventas_diarias_producto. Parámetros: mes desde/hasta, días desde/hasta del
+# primer tramo y días desde/hasta del último
+registrar('analisis.productos', """
+WITH periodo AS (
+    SELECT producto_id, ventas, unidades, ingresos
+    FROM ventas_mensuales_producto WHERE mes BETWEEN ? AND ?
+    UNION ALL
+    SELECT producto_id, ventas, unidades, ingresos
+    FROM ventas_diarias_producto WHERE fecha BETWEEN ? AND ?
+    UNION ALL
+    SELECT producto_id, ventas, unidades, ingresos
+    FROM ventas_diarias_producto WHERE fecha BETWEEN ? AND ?
+), por_producto AS (
+    SELECT producto_id, SUM(ventas) AS ventas, SUM(unidades) AS unidades, SUM(ingresos) AS ingresos
+    FROM periodo
+    GROUP BY producto_id
+    HAVING SUM(unidades) > 0
+)
+SELECT r.producto_id, IFNULL(p.codigo, '') AS codigo,
+       IFNULL(p.nombre, 'Producto eliminado') AS nombre,
+       r.ventas, r.unidades, r.ingresos,
+       RANK() OVER (ORDER BY r.unidades DESC) AS puesto_unidades,
+       RANK() OVER (ORDER BY r.ingresos DESC) AS puesto_ingresos,
+       SUM(r.ingresos) OVER (ORDER BY r.ingresos DESC, r.producto_id
+                             ROWS UNBOUNDED PRECEDING) AS ingresos_acumulados,
+       SUM(r.ingresos) OVER () AS ingresos_totales
+FROM por_producto r
+LEFT JOIN productos p ON p.id = r.producto_id
+ORDER BY r.ingresos DESC, r.producto_id
+""")
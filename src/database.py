@@ -1,36 +1,613 @@
+import os
 import sqlite3
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
 
+from src import consultas
+
+
+# Índice FTS5 de productos (contenido externo: guarda solo el índice, no copia las filas).
+# Con trigramas una frase coincide en cualquier parte del texto, como LIKE '%...%':
+# "anj" encuentra "Naranja" y los últimos dígitos bastan para encontrar un código.
+PRODUCTOS_FTS_DDL = """
+CREATE VIRTUAL TABLE IF NOT EXISTS productos_fts USING fts5(
+    codigo, nombre,
+    content='productos', content_rowid='id',
+    tokenize='trigram'
+);
+
+CREATE TRIGGER IF NOT EXISTS productos_fts_ai AFTER INSERT ON productos BEGIN
+    INSERT INTO productos_fts(rowid, codigo, nombre) VALUES (new.id, new.codigo, new.nombre);
+END;
+
+CREATE TRIGGER IF NOT EXISTS productos_fts_ad AFTER DELETE ON productos BEGIN
+    INSERT INTO productos_fts(productos_fts, rowid, codigo, nombre)
+    VALUES ('delete', old.id, old.codigo, old.nombre);
+END;
+
+CREATE TRIGGER IF NOT EXISTS productos_fts_au AFTER UPDATE OF codigo, nombre ON productos BEGIN
+    INSERT INTO productos_fts(productos_fts, rowid, codigo, nombre)
+    VALUES ('delete', old.id, old.codigo, old.nombre);
+    INSERT INTO productos_fts(rowid, codigo, nombre) VALUES (new.id, new.codigo, new.nombre);
+END;
+"""
+
+# Quita el índice FTS5 y sus triggers (índice anterior o SQLite sin trigramas)
+PRODUCTOS_FTS_BORRAR = """
+DROP TRIGGER IF EXISTS productos_fts_ai;
+DROP TRIGGER IF EXISTS productos_fts_ad;
+DROP TRIGGER IF EXISTS productos_fts_au;
+DROP TABLE IF EXISTS productos_fts;
+"""
+
+# Totales por categoría mantenidos por triggers (productos sin categoría no cuentan)
+CATEGORIAS_RESUMEN_DDL = """
+CREATE TABLE IF NOT EXISTS categorias_resumen (
+    categoria_id INTEGER PRIMARY KEY,
+    num_productos INTEGER NOT NULL DEFAULT 0,
+    unidades INTEGER NOT NULL DEFAULT 0,
+    valor REAL NOT NULL DEFAULT 0
+);
+
+CREATE TRIGGER IF NOT EXISTS categorias_resumen_ai AFTER INSERT ON productos
+WHEN new.categoria_id IS NOT NULL BEGIN
+    INSERT INTO categorias_resumen (categoria_id, num_productos, unidades, valor)
+    SELECT new.categoria_id, 1, new.cantidad, new.precio * new.cantidad WHERE 1
+    ON CONFLICT(categoria_id) DO UPDATE SET
+        num_productos = num_productos + 1,
+        unidades = unidades + excluded.unidades,
+        valor = valor + excluded.valor;
+END;
+
+CREATE TRIGGER IF NOT EXISTS categorias_resumen_ad AFTER DELETE ON productos
+WHEN old.categoria_id IS NOT NULL BEGIN
+    UPDATE categorias_resumen
+    SET num_productos = num_productos - 1,
+        unidades = unidades - old.cantidad,
+        valor = valor - old.precio * old.cantidad
+    WHERE categoria_id = old.categoria_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS categorias_resumen_au AFTER UPDATE OF precio, cantidad, categoria_id ON productos BEGIN
+    UPDATE categorias_resumen
+    SET num_productos = num_productos - 1,
+        unidades = unidades - old.cantidad,
+        valor = valor - old.precio * old.cantidad
+    WHERE categoria_id = old.categoria_id;
+    INSERT INTO categorias_resumen (categoria_id, num_productos, unidades, valor)
+    SELECT new.categoria_id, 1, new.cantidad, new.precio * new.cantidad WHERE new.categoria_id IS NOT NULL
+    ON CONFLICT(categoria_id) DO UPDATE SET
+        num_productos = num_productos + 1,
+        unidades = unidades + excluded.unidades,
+        valor = valor + excluded.valor;
+END;
+"""
+
+# Llena categorias_resumen desde productos (al crearla o para corregir deriva)
+CATEGORIAS_RESUMEN_LLENAR = """
+INSERT INTO categorias_resumen (categoria_id, num_productos, unidades, valor)
+SELECT categoria_id, COUNT(*), SUM(cantidad), SUM(precio * cantidad)
+FROM productos
+WHERE categoria_id IS NOT NULL
+GROUP BY categoria_id
+"""
+
+# Acumulados diarios de ventas completadas: por día, por producto y por categoría.
+# Los mantiene Venta (src/models/reporte.py) al guardar y cancelar; los reportes
+# mensuales y anuales leen estas filas en lugar de recorrer venta_items.
+VENTAS_DIARIAS_DDL = """
+CREATE TABLE IF NOT EXISTS ventas_diarias (
+    fecha TEXT PRIMARY KEY,              -- YYYY-MM-DD
+    ventas INTEGER NOT NULL DEFAULT 0,
+    unidades INTEGER NOT NULL DEFAULT 0,
+    ingresos REAL NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS ventas_diarias_producto (
+    fecha TEXT NOT NULL,
+    producto_id INTEGER NOT NULL,
+    ventas INTEGER NOT NULL DEFAULT 0,   -- ventas en las que aparece el producto
+    unidades INTEGER NOT NULL DEFAULT 0,
+    ingresos REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (fecha, producto_id)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS ventas_diarias_categoria (
+    fecha TEXT NOT NULL,
+    categoria_id INTEGER NOT NULL,       -- 0 = sin categoría
+    ventas INTEGER NOT NULL DEFAULT 0,
+    unidades INTEGER NOT NULL DEFAULT 0,
+    ingresos REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (fecha, categoria_id)
+) WITHOUT ROWID;
+
+-- Los mismos totales por producto agrupados por mes (YYYY-MM), para los rangos largos
+CREATE TABLE IF NOT EXISTS ventas_mensuales_producto (
+    mes TEXT NOT NULL,
+    producto_id INTEGER NOT NULL,
+    ventas INTEGER NOT NULL DEFAULT 0,
+    unidades INTEGER NOT NULL DEFAULT 0,
+    ingresos REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (mes, producto_id)
+) WITHOUT ROWID;
+"""
+
+# Llenan cada tabla de acumulados desde las ventas existentes (tablas vacías),
+# en este orden: los totales mensuales se calculan a partir de los diarios
+VENTAS_DIARIAS_LLENAR = {
+    'ventas_diarias': """
+    INSERT INTO ventas_diarias (fecha, ventas, unidades, ingresos)
+    SELECT date(v.fecha_venta), COUNT(*),
+           IFNULL(SUM((SELECT SUM(vi.cantidad) FROM venta_items vi WHERE vi.venta_id = v.id)), 0),
+           SUM(v.total)
+    FROM ventas v
+    WHERE v.estado = 'completada'
+    GROUP BY date(v.fecha_venta)
+    """,
+    'ventas_diarias_producto': """
+    INSERT INTO ventas_diarias_producto (fecha, producto_id, ventas, unidades, ingresos)
+    SELECT date(v.fecha_venta), vi.producto_id, COUNT(DISTINCT v.id), SUM(vi.cantidad), SUM(vi.subtotal)
+    FROM ventas v
+    JOIN venta_items vi ON vi.venta_id = v.id
+    WHERE v.estado = 'completada'
+    GROUP BY date(v.fecha_venta), vi.producto_id
+    """,
+    'ventas_diarias_categoria': """
+    INSERT INTO ventas_diarias_categoria (fecha, categoria_id, ventas, unidades, ingresos)
+    SELECT date(v.fecha_venta), COALESCE(vi.categoria_id, p.categoria_id, 0),
+           COUNT(DISTINCT v.id), SUM(vi.cantidad), SUM(vi.subtotal)
+    FROM ventas v
+    JOIN venta_items vi ON vi.venta_id = v.id
+    LEFT JOIN productos p ON p.id = vi.producto_id
+    WHERE v.estado = 'completada'
+    GROUP BY date(v.fecha_venta), COALESCE(vi.categoria_id, p.categoria_id, 0)
+    """,
+    'ventas_mensuales_producto': """
+    INSERT INTO ventas_mensuales_producto (mes, producto_id, ventas, unidades, ingresos)
+    SELECT substr(fecha, 1, 7), producto_id, SUM(ventas), SUM(unidades), SUM(ingresos)
+    FROM ventas_diarias_producto
+    GROUP BY substr(fecha, 1, 7), producto_id
+    """,
+}
+
+# Categoría de los ítems que aún no la tienen (ventas anteriores a la columna o
+# cargadas sin Venta): la actual de su producto, 0 si no tiene
+VENTA_ITEMS_CATEGORIA_LLENAR = """
+UPDATE venta_items
+SET categoria_id = IFNULL((SELECT p.categoria_id FROM productos p WHERE p.id = venta_items.producto_id), 0)
+WHERE categoria_id IS NULL
+"""
+
+# Los movimientos anteriores al libro tomaban la fecha de CURRENT_TIMESTAMP (UTC);
+# Movimiento los fecha en hora local. Se pasan a hora local antes de calcular
+# sus saldos para que el orden y las consultas a una fecha usen un solo reloj.
+MOVIMIENTOS_FECHA_LOCAL = """
+UPDATE movimientos SET fecha = datetime(fecha, 'localtime')
+WHERE saldo IS NULL AND datetime(fecha, 'localtime') IS NOT NULL
+"""
+
+# Completa el saldo de los movimientos anteriores al libro de movimientos: se
+# reconstruye hacia atrás desde el stock actual restando los movimientos
+# posteriores de cada producto
+MOVIMIENTOS_SALDO_LLENAR = """
+UPDATE movimientos SET saldo = s.saldo
+FROM (
+    SELECT m.id,
+           p.cantidad - IFNULL(SUM(CASE WHEN m.tipo = 'salida' THEN -m.cantidad ELSE m.cantidad END) OVER (
+               PARTITION BY m.producto_id ORDER BY m.fecha DESC, m.id DESC
+               ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+           ), 0) AS saldo
+    FROM movimientos m
+    JOIN productos p ON p.id = m.producto_id
+) AS s
+WHERE s.id = movimientos.id AND movimientos.saldo IS NULL
+"""
+
+# Lleva fecha_venta al formato 'YYYY-MM-DD HH:MM:SS' con que la guarda Venta:
+# antes se guardaban datetime con microsegundos y date sin hora, que no se
+# pueden comparar como texto con los límites de un rango
+VENTAS_FECHAS_NORMALIZAR = """
+UPDATE ventas SET fecha_venta = strftime('%Y-%m-%d %H:%M:%S', fecha_venta)
+WHERE strftime('%Y-%m-%d %H:%M:%S', fecha_venta) IS NOT fecha_venta
+  AND strftime('%Y-%m-%d %H:%M:%S', fecha_venta) IS NOT NULL
+"""
+
+# Índices secundarios de productos, ventas e ítems (ver _crear_tablas).
+# idx_venta_items_producto_id es el de la migración 003; el esquema 5 creaba
+# por error un duplicado (idx_venta_items_producto) que aquí se elimina.
+INDICES_DDL = """
+CREATE INDEX IF NOT EXISTS idx_productos_nombre ON productos(nombre);
+CREATE INDEX IF NOT EXISTS idx_productos_categoria ON productos(categoria_id, nombre);
+CREATE INDEX IF NOT EXISTS idx_ventas_estado_fecha ON ventas(estado, fecha_venta);
+CREATE INDEX IF NOT EXISTS idx_venta_items_producto_id ON venta_items(producto_id);
+DROP INDEX IF EXISTS idx_venta_items_producto;
+"""
+
+
+# Perfiles de rendimiento: PRAGMAs que se aplican a cada conexión nueva, en orden.
+# busy_timeout va primero para que el cambio a WAL espere a otras conexiones.
+PERFILES = {
+    # Valores de SQLite sin tocar (no cambia el modo de journal ya guardado en el archivo)
+    'compatible': {
+        'busy_timeout': 5000,
+    },
+    # WAL sin relajar la durabilidad: cada COMMIT espera al fsync
+    'seguro': {
+        'busy_timeout': 5000,
+        'journal_mode': 'WAL',
+        'synchronous': 'FULL',
+        'cache_size': -8000,       # KiB
+        'temp_store': 'MEMORY',
+    },
+    # WAL con fsync solo en los checkpoints; un corte de luz puede perder las
+    # últimas transacciones pero no corrompe la base de datos
+    'equilibrado': {
+        'busy_timeout': 5000,
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -16000,      # KiB
+        'temp_store': 'MEMORY',
+        'mmap_size': 67108864,     # 64 MiB
+    },
+    # Sin fsync: solo para cargas masivas o pruebas que se pueden repetir
+    'rapido': {
+        'busy_timeout': 5000,
+        'journal_mode': 'WAL',
+        'synchronous': 'OFF',
+        'cache_size': -65536,      # KiB
+        'temp_store': 'MEMORY',
+        'mmap_size': 268435456,    # 256 MiB
+    },
+}
+
+PERFIL_POR_DEFECTO = 'equilibrado'
+
+# Sentencias preparadas que guarda cada conexión (el valor por defecto de sqlite3 es 128)
+SENTENCIAS_EN_CACHE = 512
+
+def _ejecutar_script(cursor, script):
+    """Ejecuta las sentencias de ``script`` una por una.
+
+    A diferencia de ``executescript`` no confirma la transacción en curso, así
+    que el DDL se crea y se llena dentro de la misma transacción.
+    """
+    sentencia = ''
+    for linea in script.splitlines(keepends=True):
+        sentencia += linea
+        if sqlite3.complete_statement(sentencia):
+            cursor.execute(sentencia)
+            sentencia = ''
+    if sentencia.strip():
+        cursor.execute(sentencia)
+
+
+# Versión del esquema que crea _crear_tablas; se guarda en PRAGMA user_version.
+# Hay que incrementarla cada vez que cambie el DDL de _crear_tablas.
+ESQUEMA_VERSION = 9
+
+
+class ConnectionPool:
+    """Pool de conexiones SQLite de larga duración.
+
+    Cada hilo reutiliza la conexión que tiene asignada mientras la usa (las
+    extracciones anidadas son reentrantes) y al liberarla vuelve a la pila de
+    conexiones libres, de modo que una aplicación de un solo hilo trabaja
+    siempre con la misma conexión abierta.
+    """
+
+    def __init__(self, connection_factory, size=5, timeout=10.0, health_check_interval=30.0):
+        self._factory = connection_factory
+        self.size = max(1, int(size))
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self._libres = []  # [(conexion, instante_liberacion)]
+        self._total = 0
+        self._cerrado = False
+        self._condicion = threading.Condition()
+        self._local = threading.local()
+
+    def _es_saludable(self, conexion):
+        """Comprueba que la conexión sigue siendo utilizable"""
+        try:
+            conexion.execute('SELECT 1').fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def _descartar(self, conexion):
+        try:
+            conexion.close()
+        except sqlite3.Error:
+            pass
+        with self._condicion:
+            self._total -= 1
+            self._condicion.notify()
+
+    def _adquirir(self):
+        """Toma una conexión libre o crea una nueva si el pool no está lleno"""
+        limite = time.monotonic() + self.timeout
+        while True:
+            with self._condicion:
+                if self._cerrado:
+                    raise sqlite3.ProgrammingError("El pool de conexiones está cerrado")
+                if self._libres:
+                    conexion, liberada = self._libres.pop()
+                elif self._total < self.size:
+                    self._total += 1
+                    conexion, liberada = None, None
+                else:
+                    restante = limite - time.monotonic()
+                    if restante <= 0:
+                        raise sqlite3.OperationalError(
+                            f"No hay conexiones disponibles en el pool (tamaño {self.size})"
+                        )
+                    self._condicion.wait(restante)
+                    continue
+
+            if conexion is None:
+                try:
+                    return self._factory()
+                except Exception:
+                    with self._condicion:
+                        self._total -= 1
+                        self._condicion.notify()
+                    raise
+
+            # Verificar solo las conexiones que llevan tiempo inactivas
+            if time.monotonic() - liberada < self.health_check_interval or self._es_saludable(conexion):
+                return conexion
+            self._descartar(conexion)
+
+    def _liberar(self, conexion):
+        """Devuelve la conexión a la pila de libres"""
+        try:
+            if conexion.in_transaction:
+                conexion.rollback()
+        except sqlite3.Error:
+            self._descartar(conexion)
+            return
+        with self._condicion:
+            if self._cerrado:
+                self._total -= 1
+                conexion.close()
+            else:
+                self._libres.append((conexion, time.monotonic()))
+            self._condicion.notify()
+
+    @contextmanager
+    def checkout(self):
+        """Entrega una conexión del pool durante el bloque ``with``"""
+        actual = getattr(self._local, 'conexion', None)
+        if actual is not None:
+            self._local.profundidad += 1
+            try:
+                yield actual
+            finally:
+                self._local.profundidad -= 1
+            return
+
+        conexion = self._adquirir()
+        self._local.conexion = conexion
+        self._local.profundidad = 1
+        try:
+            yield conexion
+        finally:
+            self._local.conexion = None
+            self._local.profundidad = 0
+            self._liberar(conexion)
+
+    def close(self):
+        """Cierra todas las conexiones libres; las que estén en uso se cierran al liberarse"""
+        with self._condicion:
+            self._cerrado = True
+            libres, self._libres = self._libres, []
+            self._total -= len(libres)
+            self._condicion.notify_all()
+        for conexion, _ in libres:
+            try:
+                conexion.close()
+            except sqlite3.Error:
+                pass
+
+    def reset(self):
+        """Cierra las conexiones libres y vuelve a aceptar extracciones"""
+        self.close()
+        with self._condicion:
+            self._cerrado = False
+
+
 class Database:
-    def __init__(self, db_path='inventario.db'):
-        """Inicializa la conexión a la base de datos"""
+    def __init__(self, db_path='inventario.db', pool_size=5, pool_timeout=10.0, perfil=None):
+        """Inicializa la conexión a la base de datos.
+
+        ``perfil`` es uno de PERFILES; por defecto se toma de la variable de
+        entorno INVENTARIO_DB_PERFIL o se usa PERFIL_POR_DEFECTO.
+        """
+        perfil = perfil or os.environ.get('INVENTARIO_DB_PERFIL') or PERFIL_POR_DEFECTO
+        if perfil not in PERFILES:
+            raise ValueError(
+                f"Perfil de base de datos desconocido: {perfil!r} "
+                f"(disponibles: {', '.join(PERFILES)})"
+            )
+        self.perfil = perfil
         self.db_path = db_path
-        self.connection = None
-        self.cursor = None
-        self.initialize_database()
+        self.estadisticas = consultas.EstadisticasConsultas()
+        self.pool = ConnectionPool(self.connect, size=pool_size, timeout=pool_timeout)
+        self._local = threading.local()
+        # El esquema no se toca al crear la instancia: ver preparar_esquema
+        self._esquema_listo = False
+        self._esquema_lock = threading.Lock()
+        # Ver version_datos
+        self._version_datos = 0
+        self._versiones_vistas = {}
+        self._version_lock = threading.Lock()
     
     def connect(self):
-        """Establece la conexión con la base de datos"""
-        self.connection = sqlite3.connect(self.db_path)
-        self.connection.row_factory = sqlite3.Row
-        self.cursor = self.connection.cursor()
+        """Crea una nueva conexión configurada con la base de datos"""
+        # Modo autocommit: las transacciones se abren explícitamente con transaction()
+        connection = sqlite3.connect(
+            self.db_path, check_same_thread=False, isolation_level=None,
+            cached_statements=SENTENCIAS_EN_CACHE
+        )
+        connection.row_factory = sqlite3.Row
         # Asegurar que las claves foráneas estén activas
         try:
-            self.cursor.execute('PRAGMA foreign_keys = ON;')
+            connection.execute('PRAGMA foreign_keys = ON;')
         except Exception:
             pass
+        # PRAGMAs del perfil de rendimiento (valores fijos del código, no del usuario)
+        for pragma, valor in PERFILES[self.perfil].items():
+            try:
+                connection.execute(f'PRAGMA {pragma} = {valor}')
+            except sqlite3.Error as e:
+                print(f"No se pudo aplicar PRAGMA {pragma}: {e}")
+        return connection
+
+    def connection(self):
+        """Context manager que presta una conexión del pool"""
+        return self.pool.checkout()
     
+    def in_transaction(self):
+        """Indica si el hilo actual está dentro de un bloque transaction()"""
+        return getattr(self._local, 'transaccion', 0) > 0
+
+    @contextmanager
+    def transaction(self):
+        """Unidad de trabajo: confirma al salir del bloque y revierte si hay un error.
+
+        Los bloques anidados usan SAVEPOINT, de modo que un error interno solo
+        revierte su propio trabajo. Todas las consultas del bloque, incluidas
+        las de execute_query, comparten la conexión y se confirman con un único
+        COMMIT.
+        """
+        with self.connection() as connection:
+            profundidad = getattr(self._local, 'transaccion', 0)
+            savepoint = f"sp_{profundidad}"
+            if profundidad == 0:
+                connection.execute('BEGIN IMMEDIATE')
+            else:
+                connection.execute(f'SAVEPOINT {savepoint}')
+            if profundidad == 0:
+                self._local.al_confirmar = []
+            pendientes = self._local.al_confirmar
+            registrados = len(pendientes)
+            self._local.transaccion = profundidad + 1
+            try:
+                yield connection
+            except BaseException:
+                # Lo registrado dentro del bloque revertido ya no debe ejecutarse
+                del pendientes[registrados:]
+                if profundidad == 0:
+                    connection.execute('ROLLBACK')
+                else:
+                    connection.execute(f'ROLLBACK TO {savepoint}')
+                    connection.execute(f'RELEASE {savepoint}')
+                raise
+            else:
+                if profundidad == 0:
+                    try:
+                        connection.execute('COMMIT')
+                    except sqlite3.Error:
+                        if connection.in_transaction:
+                            connection.execute('ROLLBACK')
+                        raise
+                else:
+                    connection.execute(f'RELEASE {savepoint}')
+            finally:
+                self._local.transaccion = profundidad
+                if profundidad == 0:
+                    self._local.al_confirmar = []
+
+            if profundidad == 0:
+                for callback in pendientes:
+                    callback()
+
+    def al_confirmar(self, callback):
+        """Ejecuta ``callback`` cuando los cambios del hilo actual sean definitivos.
+
+        Dentro de transaction() se difiere hasta el COMMIT exterior (y se
+        descarta si el bloque que lo registró se revierte); fuera de una
+        transacción cada escritura ya está confirmada y se ejecuta de inmediato.
+        """
+        if self.in_transaction():
+            self._local.al_confirmar.append(callback)
+        else:
+            callback()
+
+    def version_datos(self):
+        """Número que cambia cuando cambian los datos de la base de datos.
+
+        Sirve como clave de caché: mientras devuelva el mismo valor, una
+        consulta devuelve el mismo resultado. Combina ``PRAGMA data_version``
+        (cambia con lo que confirman otras conexiones, incluidas las de otros
+        procesos) con ``total_changes`` (lo que escribe la propia conexión).
+        Cada conexión compara con lo que vio la última vez; si algo cambió, el
+        número aumenta. Puede aumentar sin que haya cambios, nunca al revés.
+        """
+        with self.connection() as connection:
+            estado = (
+                connection.execute('PRAGMA data_version').fetchone()[0],
+                connection.total_changes,
+            )
+            with self._version_lock:
+                # Se guarda la conexión para que su id no se reutilice
+                visto = self._versiones_vistas.get(id(connection))
+                if visto is None or visto[0] is not connection or visto[1] != estado:
+                    self._versiones_vistas[id(connection)] = (connection, estado)
+                    self._version_datos += 1
+                return self._version_datos
+
     def close(self):
-        """Cierra la conexión con la base de datos"""
-        if self.connection:
-            self.connection.close()
+        """Cierra las conexiones abiertas del pool"""
+        self.pool.reset()
     
+    def version_esquema(self):
+        """Versión del esquema guardada en el archivo (PRAGMA user_version)"""
+        with self.connection() as connection:
+            return connection.execute('PRAGMA user_version').fetchone()[0]
+
+    def preparar_esquema(self):
+        """Crea o actualiza el esquema si el archivo no está en ESQUEMA_VERSION.
+
+        Se llama una vez al arrancar la aplicación (y en las herramientas que
+        crean bases de datos). Si el esquema ya está al día solo cuesta leer
+        ``PRAGMA user_version``; las llamadas siguientes en el mismo proceso no
+        consultan nada. Devuelve True si tuvo que ejecutar el DDL.
+        """
+        if self._esquema_listo:
+            return False
+        with self._esquema_lock:
+            if self._esquema_listo:
+                return False
+            actualizado = False
+            if self.version_esquema() < ESQUEMA_VERSION:
+                self.initialize_database()
+                actualizado = True
+            self._esquema_listo = True
+            return actualizado
+
     def initialize_database(self):
-        """Inicializa la base de datos con las tablas necesarias"""
-        self.connect()
+        """Crea las tablas necesarias y marca el archivo con ESQUEMA_VERSION.
+
+        Todo el DDL, el llenado de las tablas derivadas y la versión se
+        confirman juntos: si algo falla el archivo queda como estaba y el
+        próximo arranque vuelve a intentarlo desde el principio.
+        """
+        with self.transaction() as connection:
+            self._crear_tablas(connection)
+            connection.execute(f'PRAGMA user_version = {ESQUEMA_VERSION}')
+        with self.connection() as connection:
+            for nombre, error in consultas.validar(connection):
+                print(f"Consulta inválida {nombre}: {error}")
+
+    def _crear_tablas(self, connection):
+        """Crea las tablas e índices si no existen"""
+        cursor = connection.cursor()
         
         # Crear tabla de categorías
-        self.cursor.execute('''
+        cursor.execute('''
         CREATE TABLE IF NOT EXISTS categorias (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             nombre TEXT NOT NULL UNIQUE,
@@ -40,7 +617,7 @@ class Database:
         ''')
         
         # Crear tabla de productos
-        self.cursor.execute('''
+        cursor.execute('''
         CREATE TABLE IF NOT EXISTS productos (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             codigo TEXT NOT NULL UNIQUE,
@@ -54,8 +631,14 @@ class Database:
         )
         ''')
         
+        # Índice de búsqueda de texto completo sobre productos
+        self._crear_indice_busqueda(cursor)
+        
+        # Totales por categoría mantenidos por triggers
+        self._crear_resumen_categorias(cursor)
+        
         # Crear tabla de movimientos de inventario
-        self.cursor.execute('''
+        cursor.execute('''
         CREATE TABLE IF NOT EXISTS movimientos (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             producto_id INTEGER NOT NULL,
@@ -63,12 +646,16 @@ class Database:
             cantidad INTEGER NOT NULL,
             fecha TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             notas TEXT,
+            saldo INTEGER,  -- stock del producto después del movimiento
             FOREIGN KEY (producto_id) REFERENCES productos(id)
         )
         ''')
+        
+        # Saldos e índice del libro de movimientos (stock a una fecha)
+        self._crear_libro_movimientos(cursor)
 
         # Crear tabla de ventas
-        self.cursor.execute('''
+        cursor.execute('''
         CREATE TABLE IF NOT EXISTS ventas (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             codigo_venta TEXT NOT NULL UNIQUE,
@@ -82,7 +669,7 @@ class Database:
         ''')
 
         # Crear tabla de ítems de venta
-        self.cursor.execute('''
+        cursor.execute('''
         CREATE TABLE IF NOT EXISTS venta_items (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             venta_id INTEGER NOT NULL,
@@ -91,34 +678,249 @@ class Database:
             precio_unitario REAL NOT NULL,
             subtotal REAL NOT NULL,
             created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            categoria_id INTEGER,  -- categoría del producto al vender (0 = sin categoría)
             FOREIGN KEY (venta_id) REFERENCES ventas(id) ON DELETE CASCADE,
             FOREIGN KEY (producto_id) REFERENCES productos(id)
         )
         ''')
 
+        # Categoría de cada ítem al momento de la venta (acumulados por categoría)
+        self._crear_categoria_items(cursor)
+
+        # Fechas de venta comparables como texto (ver VENTAS_FECHAS_NORMALIZAR)
+        cursor.execute(VENTAS_FECHAS_NORMALIZAR)
+
         # Índices útiles
-        self.cursor.execute('''
+        cursor.execute('''
         CREATE INDEX IF NOT EXISTS idx_ventas_fecha ON ventas(fecha_venta);
         ''')
-        
-        self.connection.commit()
-        self.close()
+
+        # Los acumulados diarios leen los ítems de cada venta al guardarla
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_venta_items_venta_id ON venta_items(venta_id);
+        ''')
+
+        # Índices que justifica src/tools/auditar_consultas.py: listados por
+        # nombre, filtros por categoría y por estado de venta, y las claves
+        # foráneas que SQLite revisa al borrar productos o categorías.
+        # Las consultas por producto de movimientos usan idx_movimientos_producto_fecha.
+        _ejecutar_script(cursor, INDICES_DDL)
+
+        # Acumulados diarios de ventas para los reportes
+        self._crear_ventas_diarias(cursor)
+    
+    def _crear_indice_busqueda(self, cursor):
+        """Crea el índice FTS5 de productos y los triggers que lo sincronizan.
+
+        Si la tabla virtual no existía, o se creó con el tokenizador anterior
+        (palabras y prefijos), se crea de nuevo y se reconstruye a partir de
+        ``productos``, de modo que las bases de datos existentes quedan
+        indexadas. Si SQLite no trae FTS5 con trigramas (3.34 o posterior) se
+        quita el índice y las búsquedas usan LIKE.
+        """
+        fila = cursor.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'productos_fts'"
+        ).fetchone()
+        existe = fila is not None and 'trigram' in fila[0]
+        try:
+            # En un SAVEPOINT para no dejar triggers a medias si falta FTS5
+            with self.transaction():
+                if not existe:
+                    _ejecutar_script(cursor, PRODUCTOS_FTS_BORRAR)
+                _ejecutar_script(cursor, PRODUCTOS_FTS_DDL)
+        except sqlite3.OperationalError as e:
+            print(f"Búsqueda de texto completo no disponible: {e}")
+            _ejecutar_script(cursor, PRODUCTOS_FTS_BORRAR)
+            return
+        if not existe:
+            cursor.execute("INSERT INTO productos_fts(productos_fts) VALUES ('rebuild')")
+    
+    def _crear_libro_movimientos(self, cursor):
+        """Agrega el saldo a los movimientos y el índice por producto y fecha.
+
+        Cada movimiento guarda el stock que dejó, así que el stock de un
+        producto a una fecha es el saldo de su último movimiento hasta ese
+        momento (ver src/models/movimiento.py).
+        """
+        columnas = {fila[1] for fila in cursor.execute("PRAGMA table_info(movimientos)")}
+        if 'saldo' not in columnas:
+            cursor.execute("ALTER TABLE movimientos ADD COLUMN saldo INTEGER")
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_movimientos_producto_fecha ON movimientos(producto_id, fecha)"
+        )
+        if cursor.execute("SELECT 1 FROM movimientos WHERE saldo IS NULL LIMIT 1").fetchone():
+            cursor.execute(MOVIMIENTOS_FECHA_LOCAL)
+            cursor.execute(MOVIMIENTOS_SALDO_LLENAR)
+    
+    def _crear_categoria_items(self, cursor):
+        """Agrega a venta_items la categoría que tenía el producto al venderse.
+
+        Los acumulados por categoría suman y restan cada venta con esa
+        categoría, aunque el producto cambie de categoría entre medio. Los
+        ítems anteriores toman la categoría actual de su producto.
+        """
+        columnas = {fila[1] for fila in cursor.execute("PRAGMA table_info(venta_items)")}
+        if 'categoria_id' not in columnas:
+            cursor.execute("ALTER TABLE venta_items ADD COLUMN categoria_id INTEGER")
+        cursor.execute(VENTA_ITEMS_CATEGORIA_LLENAR)
+    
+    def _crear_ventas_diarias(self, cursor):
+        """Crea las tablas de acumulados de ventas.
+
+        Las que no existían se llenan a partir de las ventas ya registradas.
+        """
+        existentes = {
+            fila[0] for fila in cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        }
+        _ejecutar_script(cursor, VENTAS_DIARIAS_DDL)
+        for tabla, sentencia in VENTAS_DIARIAS_LLENAR.items():
+            if tabla not in existentes:
+                cursor.execute(sentencia)
+    
+    def _crear_resumen_categorias(self, cursor):
+        """Crea la tabla categorias_resumen y sus triggers.
+
+        Si la tabla no existía se llena a partir de los productos actuales.
+        """
+        existe = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'categorias_resumen'"
+        ).fetchone()
+        _ejecutar_script(cursor, CATEGORIAS_RESUMEN_DDL)
+        if not existe:
+            cursor.execute(CATEGORIAS_RESUMEN_LLENAR)
     
     def execute_query(self, query, params=()):
-        """Ejecuta una consulta y devuelve los resultados"""
-        self.connect()
+        """Ejecuta una consulta y devuelve los resultados.
+
+        Fuera de una transacción cada escritura se confirma de inmediato; dentro
+        de transaction() los errores se propagan para que el bloque se revierta.
+        """
+        with self.connection() as connection:
+            try:
+                cursor = connection.execute(query, params)
+                # Las sentencias que devuelven columnas tienen description
+                if cursor.description is not None:
+                    return cursor.fetchall()
+                else:
+                    return cursor.lastrowid
+            except sqlite3.Error as e:
+                if self.in_transaction():
+                    raise
+                print(f"Error en la consulta: {e}")
+                return None
+
+    def consultar(self, nombre, params=()):
+        """Ejecuta una consulta del registro (src/consultas.py) por su nombre.
+
+        El resultado depende de la forma declarada al registrarla: filas, una
+        fila, un escalar, el id insertado o las filas afectadas. Los errores se
+        tratan igual que en execute_query y cada ejecución se suma a
+        ``self.estadisticas``.
+        """
+        consulta = consultas.obtener(nombre)
+        inicio = time.perf_counter()
+        with self.connection() as connection:
+            try:
+                cursor = connection.execute(consulta.sql, params)
+                return consultas.LECTORES[consulta.forma](cursor)
+            except sqlite3.Error as e:
+                if self.in_transaction():
+                    raise
+                print(f"Error en la consulta {nombre}: {e}")
+                return None
+            finally:
+                self.estadisticas.registrar(nombre, time.perf_counter() - inicio)
+
+    def consultar_tuplas(self, nombre, params=()):
+        """Como consultar para una consulta de forma FILAS, pero con tuplas simples.
+
+        Devuelve ``(columnas, filas)``: los nombres de columna del cursor y las
+        filas como tuplas (sin ``sqlite3.Row``), para quien las procesa en
+        bloque o las convierte con un mapeador de posiciones.
+        """
+        consulta = consultas.obtener(nombre)
+        if consulta.forma != consultas.FILAS:
+            raise ValueError(f"La consulta {nombre} no devuelve filas")
+        inicio = time.perf_counter()
+        with self.connection() as connection:
+            try:
+                cursor = connection.cursor()
+                cursor.row_factory = None
+                cursor.execute(consulta.sql, params)
+                filas = cursor.fetchall()
+                return tuple(d[0] for d in cursor.description), filas
+            except sqlite3.Error as e:
+                if self.in_transaction():
+                    raise
+                print(f"Error en la consulta {nombre}: {e}")
+                return None
+            finally:
+                self.estadisticas.registrar(nombre, time.perf_counter() - inicio)
+
+    def consultar_muchos(self, nombre, seq_of_params):
+        """Ejecuta una escritura del registro para cada juego de parámetros"""
+        consulta = consultas.obtener(nombre)
+        inicio = time.perf_counter()
         try:
-            self.cursor.execute(query, params)
-            if query.strip().upper().startswith(('SELECT', 'PRAGMA')):
-                return self.cursor.fetchall()
-            else:
-                self.connection.commit()
-                return self.cursor.lastrowid
+            return self.execute_many(consulta.sql, seq_of_params)
+        finally:
+            self.estadisticas.registrar(nombre, time.perf_counter() - inicio)
+
+    def execute_many(self, query, seq_of_params):
+        """Ejecuta la misma sentencia para cada juego de parámetros en una sola llamada.
+
+        Devuelve el número de filas afectadas. Igual que execute_query, fuera de
+        una transacción confirma de inmediato y dentro de ella propaga los errores.
+        """
+        try:
+            with self.transaction() as connection:
+                return connection.executemany(query, seq_of_params).rowcount
         except sqlite3.Error as e:
+            if self.in_transaction():
+                raise
             print(f"Error en la consulta: {e}")
             return None
-        finally:
-            self.close()
 
-# Instancia global de la base de datos
-db = Database()
+    def max_variables(self):
+        """Número máximo de parámetros ``?`` admitidos por sentencia"""
+        with self.connection() as connection:
+            try:
+                return connection.getlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER)
+            except AttributeError:
+                # Python < 3.11: límite histórico de SQLite
+                return 999
+
+    def insert_many(self, table, columns, rows):
+        """Inserta muchas filas usando sentencias INSERT con varias tuplas VALUES.
+
+        Las filas se agrupan en lotes que respetan el límite de parámetros de
+        SQLite, así que el número de sentencias no crece con cada fila sino con
+        cada lote. ``table`` y ``columns`` se interpolan en el SQL: deben ser
+        nombres fijos del código, nunca datos del usuario.
+        """
+        rows = [tuple(row) for row in rows]
+        if not rows:
+            return 0
+        ancho = len(columns)
+        por_lote = max(1, self.max_variables() // ancho)
+        tupla = '(' + ', '.join('?' * ancho) + ')'
+        prefijo = f"INSERT INTO {table} ({', '.join(columns)}) VALUES "
+
+        insertadas = 0
+        try:
+            with self.transaction() as connection:
+                for inicio in range(0, len(rows), por_lote):
+                    lote = rows[inicio:inicio + por_lote]
+                    params = [valor for row in lote for valor in row]
+                    connection.execute(prefijo + ', '.join([tupla] * len(lote)), params)
+                    insertadas += len(lote)
+        except sqlite3.Error as e:
+            if self.in_transaction():
+                raise
+            print(f"Error en la consulta: {e}")
+            return None
+        return insertadas
+
+# Instancia global de la base de datos (INVENTARIO_DB permite apuntar a otro archivo).
+# Crearla no abre el archivo; el esquema se prepara con db.preparar_esquema()
+db = Database(os.environ.get('INVENTARIO_DB', 'inventario.db'))
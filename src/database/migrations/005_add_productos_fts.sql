@@ -0,0 +1,28 @@
+-- Índice de búsqueda de texto completo (FTS5) para productos
+-- Tabla de contenido externo: el índice apunta a productos(id) sin duplicar las filas
+
+CREATE VIRTUAL TABLE IF NOT EXISTS productos_fts USING fts5(
+    codigo, nombre,
+    content='productos', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2',
+    prefix='1 2 3'
+);
+
+-- Mantener el índice sincronizado con productos
+CREATE TRIGGER IF NOT EXISTS productos_fts_ai AFTER INSERT ON productos BEGIN
+    INSERT INTO productos_fts(rowid, codigo, nombre) VALUES (new.id, new.codigo, new.nombre);
+END;
+
+CREATE TRIGGER IF NOT EXISTS productos_fts_ad AFTER DELETE ON productos BEGIN
+    INSERT INTO productos_fts(productos_fts, rowid, codigo, nombre)
+    VALUES ('delete', old.id, old.codigo, old.nombre);
+END;
+
+CREATE TRIGGER IF NOT EXISTS productos_fts_au AFTER UPDATE OF codigo, nombre ON productos BEGIN
+    INSERT INTO productos_fts(productos_fts, rowid, codigo, nombre)
+    VALUES ('delete', old.id, old.codigo, old.nombre);
+    INSERT INTO productos_fts(rowid, codigo, nombre) VALUES (new.id, new.codigo, new.nombre);
+END;
+
+-- Construir el índice con los productos existentes
+INSERT INTO productos_fts(productos_fts) VALUES ('rebuild');
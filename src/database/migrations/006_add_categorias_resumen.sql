@@ -0,0 +1,51 @@
+-- Totales por categoría (productos, unidades y valor del inventario)
+-- Los mantienen los triggers sobre productos; los productos sin categoría no cuentan
+
+CREATE TABLE IF NOT EXISTS categorias_resumen (
+    categoria_id INTEGER PRIMARY KEY,
+    num_productos INTEGER NOT NULL DEFAULT 0,
+    unidades INTEGER NOT NULL DEFAULT 0,
+    valor REAL NOT NULL DEFAULT 0
+);
+
+CREATE TRIGGER IF NOT EXISTS categorias_resumen_ai AFTER INSERT ON productos
+WHEN new.categoria_id IS NOT NULL BEGIN
+    INSERT INTO categorias_resumen (categoria_id, num_productos, unidades, valor)
+    SELECT new.categoria_id, 1, new.cantidad, new.precio * new.cantidad WHERE 1
+    ON CONFLICT(categoria_id) DO UPDATE SET
+        num_productos = num_productos + 1,
+        unidades = unidades + excluded.unidades,
+        valor = valor + excluded.valor;
+END;
+
+CREATE TRIGGER IF NOT EXISTS categorias_resumen_ad AFTER DELETE ON productos
+WHEN old.categoria_id IS NOT NULL BEGIN
+    UPDATE categorias_resumen
+    SET num_productos = num_productos - 1,
+        unidades = unidades - old.cantidad,
+        valor = valor - old.precio * old.cantidad
+    WHERE categoria_id = old.categoria_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS categorias_resumen_au AFTER UPDATE OF precio, cantidad, categoria_id ON productos BEGIN
+    UPDATE categorias_resumen
+    SET num_productos = num_productos - 1,
+        unidades = unidades - old.cantidad,
+        valor = valor - old.precio * old.cantidad
+    WHERE categoria_id = old.categoria_id;
+    INSERT INTO categorias_resumen (categoria_id, num_productos, unidades, valor)
+    SELECT new.categoria_id, 1, new.cantidad, new.precio * new.cantidad WHERE new.categoria_id IS NOT NULL
+    ON CONFLICT(categoria_id) DO UPDATE SET
+        num_productos = num_productos + 1,
+        unidades = unidades + excluded.unidades,
+        valor = valor + excluded.valor;
+END;
+
+-- Llenar con los productos existentes
+DELETE FROM categorias_resumen;
+
+INSERT INTO categorias_resumen (categoria_id, num_productos, unidades, valor)
+SELECT categoria_id, COUNT(*), SUM(cantidad), SUM(precio * cantidad)
+FROM productos
+WHERE categoria_id IS NOT NULL
+GROUP BY categoria_id;
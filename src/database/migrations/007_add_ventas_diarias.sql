@@ -0,0 +1,57 @@
+-- Acumulados diarios de ventas completadas (por día, por producto y por categoría)
+-- Los mantienen Venta.guardar y Venta.cancelar_venta; los leen los reportes
+
+CREATE TABLE IF NOT EXISTS ventas_diarias (
+    fecha TEXT PRIMARY KEY,
+    ventas INTEGER NOT NULL DEFAULT 0,
+    unidades INTEGER NOT NULL DEFAULT 0,
+    ingresos REAL NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS ventas_diarias_producto (
+    fecha TEXT NOT NULL,
+    producto_id INTEGER NOT NULL,
+    ventas INTEGER NOT NULL DEFAULT 0,
+    unidades INTEGER NOT NULL DEFAULT 0,
+    ingresos REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (fecha, producto_id)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS ventas_diarias_categoria (
+    fecha TEXT NOT NULL,
+    categoria_id INTEGER NOT NULL,
+    ventas INTEGER NOT NULL DEFAULT 0,
+    unidades INTEGER NOT NULL DEFAULT 0,
+    ingresos REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (fecha, categoria_id)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_venta_items_venta_id ON venta_items(venta_id);
+
+-- Llenar con las ventas existentes
+DELETE FROM ventas_diarias;
+DELETE FROM ventas_diarias_producto;
+DELETE FROM ventas_diarias_categoria;
+
+INSERT INTO ventas_diarias (fecha, ventas, unidades, ingresos)
+SELECT date(v.fecha_venta), COUNT(*),
+       IFNULL(SUM((SELECT SUM(vi.cantidad) FROM venta_items vi WHERE vi.venta_id = v.id)), 0),
+       SUM(v.total)
+FROM ventas v
+WHERE v.estado = 'completada'
+GROUP BY date(v.fecha_venta);
+
+INSERT INTO ventas_diarias_producto (fecha, producto_id, ventas, unidades, ingresos)
+SELECT date(v.fecha_venta), vi.producto_id, COUNT(DISTINCT v.id), SUM(vi.cantidad), SUM(vi.subtotal)
+FROM ventas v
+JOIN venta_items vi ON vi.venta_id = v.id
+WHERE v.estado = 'completada'
+GROUP BY date(v.fecha_venta), vi.producto_id;
+
+INSERT INTO ventas_diarias_categoria (fecha, categoria_id, ventas, unidades, ingresos)
+SELECT date(v.fecha_venta), IFNULL(p.categoria_id, 0), COUNT(DISTINCT v.id), SUM(vi.cantidad), SUM(vi.subtotal)
+FROM ventas v
+JOIN venta_items vi ON vi.venta_id = v.id
+LEFT JOIN productos p ON p.id = vi.producto_id
+WHERE v.estado = 'completada'
+GROUP BY date(v.fecha_venta), IFNULL(p.categoria_id, 0);
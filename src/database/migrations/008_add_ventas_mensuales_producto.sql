@@ -0,0 +1,19 @@
+-- Totales de ventas por producto agrupados por mes (YYYY-MM)
+-- Los mantiene Venta igual que ventas_diarias_producto; los usa el análisis de productos
+
+CREATE TABLE IF NOT EXISTS ventas_mensuales_producto (
+    mes TEXT NOT NULL,
+    producto_id INTEGER NOT NULL,
+    ventas INTEGER NOT NULL DEFAULT 0,
+    unidades INTEGER NOT NULL DEFAULT 0,
+    ingresos REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (mes, producto_id)
+) WITHOUT ROWID;
+
+-- Llenar a partir de los acumulados diarios
+DELETE FROM ventas_mensuales_producto;
+
+INSERT INTO ventas_mensuales_producto (mes, producto_id, ventas, unidades, ingresos)
+SELECT substr(fecha, 1, 7), producto_id, SUM(ventas), SUM(unidades), SUM(ingresos)
+FROM ventas_diarias_producto
+GROUP BY substr(fecha, 1, 7), producto_id;
@@ -0,0 +1,24 @@
+-- Libro de movimientos: saldo de cada movimiento e índice por producto y fecha
+-- El stock de un producto a una fecha es el saldo de su último movimiento hasta entonces
+
+ALTER TABLE movimientos ADD COLUMN saldo INTEGER;
+
+CREATE INDEX IF NOT EXISTS idx_movimientos_producto_fecha ON movimientos(producto_id, fecha);
+
+-- Los movimientos existentes se fecharon con CURRENT_TIMESTAMP (UTC); Movimiento
+-- usa hora local. Se convierten antes de calcular los saldos.
+UPDATE movimientos SET fecha = datetime(fecha, 'localtime')
+WHERE saldo IS NULL AND datetime(fecha, 'localtime') IS NOT NULL;
+
+-- Saldos de los movimientos existentes, hacia atrás desde el stock actual
+UPDATE movimientos SET saldo = s.saldo
+FROM (
+    SELECT m.id,
+           p.cantidad - IFNULL(SUM(CASE WHEN m.tipo = 'salida' THEN -m.cantidad ELSE m.cantidad END) OVER (
+               PARTITION BY m.producto_id ORDER BY m.fecha DESC, m.id DESC
+               ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+           ), 0) AS saldo
+    FROM movimientos m
+    JOIN productos p ON p.id = m.producto_id
+) AS s
+WHERE s.id = movimientos.id AND movimientos.saldo IS NULL;
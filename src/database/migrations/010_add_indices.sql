@@ -0,0 +1,14 @@
+-- Índices secundarios señalados por src/tools/auditar_consultas.py
+-- productos.todos y productos.por_categoria ordenan por nombre; borrar una
+-- categoría o un producto revisa productos.categoria_id y venta_items.producto_id;
+-- los listados de ventas filtran por estado y rango de fechas.
+-- movimientos(producto_id) ya lo cubre idx_movimientos_producto_fecha (009).
+
+CREATE INDEX IF NOT EXISTS idx_productos_nombre ON productos(nombre);
+
+CREATE INDEX IF NOT EXISTS idx_productos_categoria ON productos(categoria_id, nombre);
+
+CREATE INDEX IF NOT EXISTS idx_ventas_estado_fecha ON ventas(estado, fecha_venta);
+
+-- Mismo nombre que en 003: en bases creadas por migraciones ya existe
+CREATE INDEX IF NOT EXISTS idx_venta_items_producto_id ON venta_items(producto_id);
@@ -0,0 +1,9 @@
+-- Fechas de venta en un solo formato: 'YYYY-MM-DD HH:MM:SS'
+-- Venta guardaba datetime con microsegundos ('... 10:15:02.123456') y el
+-- diálogo date sin hora ('2024-05-01'). Con un formato único los listados
+-- filtran con fecha_venta >= ? AND fecha_venta < ? y usan el índice.
+-- date(fecha_venta) no cambia, así que los acumulados diarios siguen valiendo.
+
+UPDATE ventas SET fecha_venta = strftime('%Y-%m-%d %H:%M:%S', fecha_venta)
+WHERE strftime('%Y-%m-%d %H:%M:%S', fecha_venta) IS NOT fecha_venta
+  AND strftime('%Y-%m-%d %H:%M:%S', fecha_venta) IS NOT NULL;
@@ -0,0 +1,9 @@
+-- Categoría del producto en cada ítem de venta, fijada al vender
+-- Los acumulados por categoría suman y restan cada venta con esta categoría,
+-- aunque el producto cambie de categoría después (0 = sin categoría)
+
+ALTER TABLE venta_items ADD COLUMN categoria_id INTEGER;
+
+UPDATE venta_items
+SET categoria_id = IFNULL((SELECT p.categoria_id FROM productos p WHERE p.id = venta_items.producto_id), 0)
+WHERE categoria_id IS NULL;
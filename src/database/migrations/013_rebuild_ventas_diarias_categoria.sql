@@ -0,0 +1,15 @@
+-- Reconstruye los acumulados por categoría con la categoría guardada en cada ítem
+-- 007 los llenó con la categoría actual del producto; si el producto cambió de
+-- categoría después de vender, cancelar o editar la venta restaba en otra.
+-- Igual que VENTAS_DIARIAS_LLENAR['ventas_diarias_categoria'] en src/database.py.
+
+DELETE FROM ventas_diarias_categoria;
+
+INSERT INTO ventas_diarias_categoria (fecha, categoria_id, ventas, unidades, ingresos)
+SELECT date(v.fecha_venta), COALESCE(vi.categoria_id, p.categoria_id, 0),
+       COUNT(DISTINCT v.id), SUM(vi.cantidad), SUM(vi.subtotal)
+FROM ventas v
+JOIN venta_items vi ON vi.venta_id = v.id
+LEFT JOIN productos p ON p.id = vi.producto_id
+WHERE v.estado = 'completada'
+GROUP BY date(v.fecha_venta), COALESCE(vi.categoria_id, p.categoria_id, 0);
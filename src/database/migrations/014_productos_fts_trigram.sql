@@ -0,0 +1,33 @@
+-- Índice de búsqueda de productos con trigramas (requiere SQLite 3.34 o posterior)
+-- El tokenizador anterior solo encontraba prefijos de palabra: "anj" no encontraba
+-- "Naranja" ni los últimos dígitos un código de barras. Igual que PRODUCTOS_FTS_DDL
+-- en src/database.py.
+
+DROP TRIGGER IF EXISTS productos_fts_ai;
+DROP TRIGGER IF EXISTS productos_fts_ad;
+DROP TRIGGER IF EXISTS productos_fts_au;
+DROP TABLE IF EXISTS productos_fts;
+
+CREATE VIRTUAL TABLE productos_fts USING fts5(
+    codigo, nombre,
+    content='productos', content_rowid='id',
+    tokenize='trigram'
+);
+
+CREATE TRIGGER productos_fts_ai AFTER INSERT ON productos BEGIN
+    INSERT INTO productos_fts(rowid, codigo, nombre) VALUES (new.id, new.codigo, new.nombre);
+END;
+
+CREATE TRIGGER productos_fts_ad AFTER DELETE ON productos BEGIN
+    INSERT INTO productos_fts(productos_fts, rowid, codigo, nombre)
+    VALUES ('delete', old.id, old.codigo, old.nombre);
+END;
+
+CREATE TRIGGER productos_fts_au AFTER UPDATE OF codigo, nombre ON productos BEGIN
+    INSERT INTO productos_fts(productos_fts, rowid, codigo, nombre)
+    VALUES ('delete', old.id, old.codigo, old.nombre);
+    INSERT INTO productos_fts(rowid, codigo, nombre) VALUES (new.id, new.codigo, new.nombre);
+END;
+
+-- Construir el índice con los productos existentes
+INSERT INTO productos_fts(productos_fts) VALUES ('rebuild');
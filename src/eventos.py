@@ -0,0 +1,84 @@
+import threading
+import weakref
+from collections import namedtuple
+
+from src.database import db
+
+# Entidades
+PRODUCTO = 'producto'
+CATEGORIA = 'categoria'
+VENTA = 'venta'
+
+# Operaciones
+CREADO = 'creado'
+ACTUALIZADO = 'actualizado'
+ELIMINADO = 'eliminado'
+
+# Un cambio confirmado en la base de datos: qué entidad, qué operación y qué ids
+Cambio = namedtuple('Cambio', 'entidad operacion ids')
+
+
+class BusEventos:
+    """Distribuye los cambios que publican los modelos a quien se suscriba.
+
+    Los modelos llaman a ``publicar`` al escribir; el cambio se entrega cuando
+    la transacción se confirma (y se descarta si se revierte), en el hilo que
+    hizo la escritura. Los métodos suscritos se guardan como referencias
+    débiles, así que una vista destruida deja de recibir cambios sin tener
+    que desuscribirse.
+    """
+
+    def __init__(self):
+        self._suscriptores = {}
+        self._lock = threading.Lock()
+
+    def suscribir(self, entidad, callback):
+        """Llama a ``callback(cambio)`` por cada cambio confirmado de ``entidad``"""
+        if hasattr(callback, '__self__'):
+            referencia = weakref.WeakMethod(callback)
+        else:
+            # Funciones sueltas: referencia fuerte (no hay objeto que destruir)
+            def referencia():
+                return callback
+        with self._lock:
+            self._suscriptores.setdefault(entidad, []).append(referencia)
+
+    def desuscribir(self, entidad, callback):
+        with self._lock:
+            self._suscriptores[entidad] = [
+                referencia for referencia in self._suscriptores.get(entidad, [])
+                if referencia() not in (None, callback)
+            ]
+
+    def publicar(self, entidad, operacion, ids):
+        """Anuncia un cambio; se entrega al confirmar la escritura en curso"""
+        cambio = Cambio(entidad, operacion, tuple(ids))
+        if cambio.ids:
+            db.al_confirmar(lambda: self.entregar(cambio))
+
+    def entregar(self, cambio):
+        with self._lock:
+            referencias = list(self._suscriptores.get(cambio.entidad, []))
+        muertas = False
+        for referencia in referencias:
+            callback = referencia()
+            if callback is None:
+                muertas = True
+                continue
+            try:
+                callback(cambio)
+            except Exception as e:
+                print(f"Error al notificar {cambio.entidad}/{cambio.operacion}: {e}")
+        if muertas:
+            with self._lock:
+                self._suscriptores[cambio.entidad] = [
+                    referencia for referencia in self._suscriptores.get(cambio.entidad, [])
+                    if referencia() is not None
+                ]
+
+
+bus = BusEventos()
+
+
+def publicar(entidad, operacion, ids):
+    bus.publicar(entidad, operacion, ids)
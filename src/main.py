@@ -1,3 +1,4 @@
+import os
 import sys
 from PyQt6.QtWidgets import QApplication
 from PyQt6.QtCore import Qt, QSize
@@ -5,6 +6,7 @@ from PyQt6.QtGui import QFont, QIcon
 
 # Importar después de configurar el entorno
 from src.main_window import MainWindow
+from src.database import db
 
 def main():
     # Configurar la aplicación
@@ -141,12 +143,20 @@ def main():
     font.setPointSize(10)
     app.setFont(font)
     
+    # Crear o actualizar el esquema (si está al día solo lee PRAGMA user_version)
+    db.preparar_esquema()
+    
     # Crear y mostrar la ventana principal
     window = MainWindow()
     window.show()
     
     # Ejecutar la aplicación
-    sys.exit(app.exec())
+    codigo = app.exec()
+    
+    # INVENTARIO_DB_ESTADISTICAS=1 muestra al salir el tiempo gastado por consulta
+    if os.environ.get('INVENTARIO_DB_ESTADISTICAS'):
+        print(db.estadisticas.reporte())
+    sys.exit(codigo)
 
 if __name__ == "__main__":
     main()
@@ -1,14 +1,14 @@
 import sys
 from PyQt6.QtWidgets import (
-    QMainWindow, QWidget, QHBoxLayout, QStackedWidget, QStatusBar, QLabel
+    QMainWindow, QWidget, QHBoxLayout, QVBoxLayout, QStackedWidget, QStatusBar, QLabel
 )
-from PyQt6.QtCore import Qt, QSize
+from PyQt6.QtCore import Qt, QSize, QTimer
 from PyQt6.QtGui import QIcon
 
 from src.views.components.sidebar import Sidebar
-from src.views.productos.productos_view import ProductosView
-from src.views.categorias.categorias_view import CategoriasView
-from src.views.ventas.ventas_view import VentasView
+from src.models.producto import Producto
+from src.views.components.cambios import ReceptorCambios
+from src import eventos
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -60,35 +60,68 @@ class MainWindow(QMainWindow):
         self.setup_styles()
     
     def setup_views(self):
-        """Configura las vistas de la aplicación"""
+        """Configura las vistas de la aplicación.
+
+        Productos, categorías y ventas consultan la base de datos al crearse,
+        así que se construyen la primera vez que se navega a ellas (ver
+        ``vista``); hasta entonces ocupan su índice con un widget vacío.
+        """
         # Vista de inicio
         self.inicio_widget = QWidget()
         self.setup_inicio_view()
         
-        # Vista de productos
-        self.productos_view = ProductosView()
-        
-        # Vista de categorías
-        self.categorias_view = CategoriasView()
-        
-        # Vista de ventas
-        self.ventas_view = VentasView()
-        
-        
         # Vista de configuración
         self.config_widget = QWidget()
         self.setup_config_view()
         
+        # Vistas diferidas: índice en el stacked widget → función que la crea
+        self._fabricas_vistas = {
+            1: self.crear_productos_view,
+            2: self.crear_categorias_view,
+            3: self.crear_ventas_view,
+        }
+        
         # Agregar vistas al stacked widget
         self.stacked_widget.addWidget(self.inicio_widget)
-        self.stacked_widget.addWidget(self.productos_view)
-        self.stacked_widget.addWidget(self.categorias_view)
-        self.stacked_widget.addWidget(self.ventas_view)
+        for _ in self._fabricas_vistas:
+            self.stacked_widget.addWidget(QWidget())
         self.stacked_widget.addWidget(self.config_widget)
     
+    def vista(self, indice):
+        """Devuelve la vista del índice, creándola si aún no existe"""
+        fabrica = self._fabricas_vistas.pop(indice, None)
+        if fabrica is not None:
+            reservado = self.stacked_widget.widget(indice)
+            self.stacked_widget.insertWidget(indice, fabrica())
+            self.stacked_widget.removeWidget(reservado)
+            reservado.deleteLater()
+        return self.stacked_widget.widget(indice)
+    
+    def crear_productos_view(self):
+        from src.views.productos.productos_view import ProductosView
+        
+        self.productos_view = ProductosView()
+        self.productos_view.agregar_producto.connect(self.mostrar_dialogo_producto)
+        self.productos_view.editar_producto.connect(self.mostrar_dialogo_editar_producto)
+        return self.productos_view
+    
+    def crear_categorias_view(self):
+        from src.views.categorias.categorias_view import CategoriasView
+        
+        self.categorias_view = CategoriasView()
+        self.categorias_view.agregar_categoria.connect(self.mostrar_dialogo_categoria)
+        self.categorias_view.editar_categoria.connect(self.mostrar_dialogo_editar_categoria)
+        return self.categorias_view
+    
+    def crear_ventas_view(self):
+        from src.views.ventas.ventas_view import VentasView
+        
+        self.ventas_view = VentasView()
+        return self.ventas_view
+    
     def setup_inicio_view(self):
         """Configura la vista de inicio"""
-        layout = QHBoxLayout(self.inicio_widget)
+        layout = QVBoxLayout(self.inicio_widget)
         layout.setContentsMargins(16, 16, 16, 16)
         
         # Contenido de ejemplo para la vista de inicio
@@ -99,7 +132,27 @@ class MainWindow(QMainWindow):
         welcome_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         welcome_label.setWordWrap(True)
         
-        layout.addWidget(welcome_label, 1)
+        # Resumen del inventario
+        self.lbl_resumen_inventario = QLabel()
+        self.lbl_resumen_inventario.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        
+        layout.addStretch()
+        layout.addWidget(welcome_label)
+        layout.addWidget(self.lbl_resumen_inventario)
+        layout.addStretch()
+        
+        # El resumen recorre los productos: se calcula después de mostrar la ventana
+        QTimer.singleShot(0, self.actualizar_inicio)
+    
+    def actualizar_inicio(self):
+        """Actualiza el resumen del inventario de la vista de inicio"""
+        resumen = Producto.resumen_inventario()
+        self.lbl_resumen_inventario.setText(
+            f"<p>Productos: <b>{resumen.productos}</b> &nbsp;·&nbsp; "
+            f"Unidades: <b>{resumen.unidades}</b> &nbsp;·&nbsp; "
+            f"Con bajo stock: <b>{resumen.bajo_stock}</b> &nbsp;·&nbsp; "
+            f"Valor del inventario: <b>${resumen.valor:,.2f}</b></p>"
+        )
     
     def setup_config_view(self):
         """Configura la vista de configuración (placeholder)"""
@@ -115,17 +168,11 @@ class MainWindow(QMainWindow):
         # Navegación
         self.sidebar.view_changed.connect(self.cambiar_vista)
         
-        # Señales de productos
-        self.productos_view.agregar_producto.connect(self.mostrar_dialogo_producto)
-        self.productos_view.editar_producto.connect(self.mostrar_dialogo_editar_producto)
-        
-        # Señales de categorías
-        self.categorias_view.agregar_categoria.connect(self.mostrar_dialogo_categoria)
-        self.categorias_view.editar_categoria.connect(self.mostrar_dialogo_editar_categoria)
-
-        # Señales de ventas: refrescar vistas tras realizar una venta
-        if hasattr(self, 'ventas_view'):
-            self.ventas_view.venta_realizada.connect(self.actualizar_vistas)
+        # Las señales de cada vista se conectan al crearla (crear_*_view).
+        # Cada vista se actualiza sola con los cambios publicados por los modelos;
+        # aquí solo falta el resumen de la vista de inicio
+        self.cambios = ReceptorCambios(eventos.PRODUCTO, parent=self)
+        self.cambios.cambio.connect(self.al_cambiar_productos)
     
     def cambiar_vista(self, nombre_vista):
         """Cambia la vista actual según la selección del menú"""
@@ -139,7 +186,10 @@ class MainWindow(QMainWindow):
         }
         
         if nombre_vista in vistas:
-            self.stacked_widget.setCurrentIndex(vistas[nombre_vista])
+            indice = vistas[nombre_vista]
+            if indice == 0:
+                self.actualizar_inicio()
+            self.stacked_widget.setCurrentWidget(self.vista(indice))
     
     def mostrar_dialogo_producto(self):
         """Muestra el diálogo para agregar un nuevo producto"""
@@ -148,7 +198,6 @@ class MainWindow(QMainWindow):
         try:
             dialogo = ProductoDialog(parent=self)
             dialogo.setWindowModality(Qt.WindowModality.ApplicationModal)
-            dialogo.producto_guardado.connect(self.actualizar_vistas)
             dialogo.exec()
         except Exception as e:
             print(f"Error al mostrar el diálogo de producto: {str(e)}")
@@ -160,7 +209,6 @@ class MainWindow(QMainWindow):
         try:
             dialogo = ProductoDialog(producto_id=producto_id, parent=self)
             dialogo.setWindowModality(Qt.WindowModality.ApplicationModal)
-            dialogo.producto_guardado.connect(self.actualizar_vistas)
             dialogo.exec()
         except Exception as e:
             print(f"Error al mostrar el diálogo de edición de producto: {str(e)}")
@@ -172,7 +220,6 @@ class MainWindow(QMainWindow):
         try:
             dialogo = CategoriaDialog(parent=self)
             dialogo.setWindowModality(Qt.WindowModality.ApplicationModal)
-            dialogo.categoria_guardada.connect(self.actualizar_vistas)
             dialogo.exec()
         except Exception as e:
             print(f"Error al mostrar el diálogo de categoría: {str(e)}")
@@ -184,20 +231,14 @@ class MainWindow(QMainWindow):
         try:
             dialogo = CategoriaDialog(categoria_id=categoria_id, parent=self)
             dialogo.setWindowModality(Qt.WindowModality.ApplicationModal)
-            dialogo.categoria_guardada.connect(self.actualizar_vistas)
             dialogo.exec()
         except Exception as e:
             print(f"Error al mostrar el diálogo de edición de categoría: {str(e)}")
     
-    def actualizar_vistas(self):
-        """Actualiza las vistas que muestran datos"""
-        # Actualizar la vista de productos
-        if hasattr(self, 'productos_view'):
-            self.productos_view.cargar_productos()
-        
-        # Actualizar la vista de categorías
-        if hasattr(self, 'categorias_view'):
-            self.categorias_view.cargar_categorias()
+    def al_cambiar_productos(self, cambio):
+        """Actualiza el resumen de inicio si es la vista visible"""
+        if self.stacked_widget.currentIndex() == 0:
+            self.actualizar_inicio()
     
     def setup_styles(self):
         """Configura los estilos de la ventana principal"""
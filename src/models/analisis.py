@@ -0,0 +1,140 @@
+import calendar
+import threading
+from collections import OrderedDict, namedtuple
+
+from src.database import db
+from src.models.reporte import rango_fechas
+
+# Límites de la clasificación ABC sobre la participación acumulada en los ingresos
+LIMITE_A = 0.80
+LIMITE_B = 0.95
+
+# Un producto en el rango: totales, puestos y participación en los ingresos.
+# ``clase`` es 'A', 'B' o 'C' según la participación acumulada de los
+# productos que venden más que él (el que cruza el límite queda en la clase alta)
+ProductoVendido = namedtuple(
+    'ProductoVendido',
+    'producto_id codigo nombre ventas unidades ingresos puesto_unidades puesto_ingresos '
+    'participacion participacion_acumulada clase'
+)
+
+
+def _mes_mas(mes, meses):
+    """'YYYY-MM' desplazado ``meses`` meses"""
+    total = int(mes[:4]) * 12 + int(mes[5:7]) - 1 + meses
+    return f"{total // 12:04d}-{total % 12 + 1:02d}"
+
+
+def _es_ultimo_dia(fecha):
+    anio, mes = int(fecha[:4]), int(fecha[5:7])
+    return int(fecha[8:10]) == calendar.monthrange(anio, mes)[1]
+
+
+def _clase(producto, limite_a, limite_b):
+    """Clase ABC según la participación de los productos que venden más"""
+    previa = producto.participacion_acumulada - producto.participacion
+    return 'A' if previa < limite_a else 'B' if previa < limite_b else 'C'
+
+
+def _tramos(desde, hasta):
+    """Parámetros de 'analisis.productos' para el rango ``[desde, hasta]``.
+
+    Los meses completos se leen de ventas_mensuales_producto y los días de los
+    extremos de ventas_diarias_producto. Al comparar texto, 'YYYY-MM-00' queda
+    antes del primer día del mes y 'YYYY-MM-32' después del último.
+    """
+    mes_desde = desde[:7] if desde.endswith('-01') else _mes_mas(desde[:7], 1)
+    mes_hasta = hasta[:7] if _es_ultimo_dia(hasta) else _mes_mas(hasta[:7], -1)
+    if mes_desde > mes_hasta:
+        # Sin meses completos: todo sale de los acumulados diarios
+        return (mes_desde, mes_hasta, desde, hasta, None, None)
+    return (mes_desde, mes_hasta, desde, f"{mes_desde}-00", f"{mes_hasta}-32", hasta)
+
+
+class Analisis:
+    """Productos más vendidos y clasificación ABC (Pareto) por rango de fechas.
+
+    Los totales salen de los acumulados de ventas completadas (ver
+    src/models/reporte.py) y los puestos y acumulados se calculan en SQLite con
+    funciones de ventana. El resultado de cada rango se guarda en caché junto
+    con ``db.version_datos()``, así que se vuelve a consultar solo si los datos
+    cambiaron desde entonces.
+    """
+
+    CAPACIDAD_CACHE = 32
+    _cache = OrderedDict()
+    _lock = threading.Lock()
+
+    @classmethod
+    def productos(cls, desde=None, hasta=None):
+        """Todos los productos vendidos en el rango, de más a menos ingresos"""
+        rango = rango_fechas(desde, hasta)
+        # Dentro de una transacción se ven cambios sin confirmar: no se usa la caché
+        if db.in_transaction():
+            return cls._consultar(*rango)
+        version = db.version_datos()
+        with cls._lock:
+            guardado = cls._cache.get(rango)
+            if guardado is not None and guardado[0] == version:
+                cls._cache.move_to_end(rango)
+                return guardado[1]
+        productos = cls._consultar(*rango)
+        with cls._lock:
+            cls._cache[rango] = (version, productos)
+            cls._cache.move_to_end(rango)
+            while len(cls._cache) > cls.CAPACIDAD_CACHE:
+                cls._cache.popitem(last=False)
+        return productos
+
+    @classmethod
+    def _consultar(cls, desde, hasta):
+        productos = []
+        for fila in db.consultar('analisis.productos', _tramos(desde, hasta)) or []:
+            (producto_id, codigo, nombre, ventas, unidades, ingresos,
+             puesto_unidades, puesto_ingresos, acumulado, total) = fila
+            participacion = ingresos / total if total else 0.0
+            acumulada = acumulado / total if total else 0.0
+            producto = ProductoVendido(
+                producto_id, codigo, nombre, ventas, unidades, ingresos,
+                puesto_unidades, puesto_ingresos, participacion, acumulada, None
+            )
+            productos.append(producto._replace(clase=_clase(producto, LIMITE_A, LIMITE_B)))
+        return tuple(productos)
+
+    @classmethod
+    def mas_vendidos(cls, desde=None, hasta=None, limite=10, por='ingresos'):
+        """Los ``limite`` productos con más ingresos (``por='ingresos'``) o unidades"""
+        if por == 'ingresos':
+            clave = 'puesto_ingresos'
+        elif por == 'unidades':
+            clave = 'puesto_unidades'
+        else:
+            raise ValueError(f"Criterio desconocido: {por!r}")
+        productos = cls.productos(desde, hasta)
+        return sorted(productos, key=lambda p: (getattr(p, clave), p.producto_id))[:limite]
+
+    @classmethod
+    def clasificacion_abc(cls, desde=None, hasta=None, limite_a=LIMITE_A, limite_b=LIMITE_B):
+        """Productos vendidos en el rango con su clase ABC.
+
+        Con los límites por defecto, la clase A reúne los productos que suman
+        el 80% de los ingresos, la B el siguiente 15% y la C el resto.
+        """
+        productos = cls.productos(desde, hasta)
+        if (limite_a, limite_b) == (LIMITE_A, LIMITE_B):
+            return productos
+        return tuple(p._replace(clase=_clase(p, limite_a, limite_b)) for p in productos)
+
+    @classmethod
+    def resumen_abc(cls, desde=None, hasta=None, limite_a=LIMITE_A, limite_b=LIMITE_B):
+        """``{clase: (productos, ingresos)}`` de la clasificación ABC"""
+        resumen = {clase: (0, 0.0) for clase in 'ABC'}
+        for producto in cls.clasificacion_abc(desde, hasta, limite_a, limite_b):
+            cantidad, ingresos = resumen[producto.clase]
+            resumen[producto.clase] = (cantidad + 1, ingresos + producto.ingresos)
+        return resumen
+
+    @classmethod
+    def limpiar_cache(cls):
+        with cls._lock:
+            cls._cache.clear()
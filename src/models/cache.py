@@ -0,0 +1,122 @@
+import threading
+from collections import OrderedDict
+
+from src.database import db
+
+
+class MapaIdentidad:
+    """Mapa de identidad con LRU acotado para objetos leídos por clave.
+
+    Mientras un objeto está en el mapa, las búsquedas por su id (o por una de
+    las ``claves`` secundarias, p. ej. ``codigo``) devuelven la misma instancia
+    sin consultar SQLite. Las escrituras de los modelos llaman a ``invalidar``,
+    que actúa cuando la transacción se confirma; cada lectura anota la
+    generación del mapa al empezar y no guarda su resultado si mientras tanto
+    hubo una invalidación. Dentro de una transacción el mapa no se usa, para
+    que el hilo vea sus propios cambios sin confirmar.
+
+    Los objetos son compartidos: modificarlos sin guardarlos cambia lo que
+    verán las siguientes búsquedas. Los cambios hechos por otros procesos no se
+    detectan; con ``habilitado = False`` todas las búsquedas van a SQLite.
+    """
+
+    def __init__(self, capacidad=1000, claves=(), habilitado=True):
+        self.capacidad = capacidad
+        self.habilitado = habilitado
+        self.aciertos = 0
+        self.fallos = 0
+        self._objetos = OrderedDict()
+        self._indices = {clave: {} for clave in claves}
+        # Valores de las claves al guardar cada objeto (pueden cambiar después)
+        self._claves_de = {}
+        self._generacion = 0
+        self._lock = threading.Lock()
+
+    def _activo(self):
+        return self.habilitado and not db.in_transaction()
+
+    def generacion(self):
+        return self._generacion
+
+    def obtener(self, id):
+        """Objeto con ese id, o None si no está en el mapa"""
+        if not self._activo():
+            return None
+        with self._lock:
+            objeto = self._objetos.get(id)
+            if objeto is None:
+                self.fallos += 1
+                return None
+            self._objetos.move_to_end(id)
+            self.aciertos += 1
+            return objeto
+
+    def obtener_por(self, clave, valor):
+        """Objeto cuya clave secundaria ``clave`` vale ``valor``, o None"""
+        if not self._activo():
+            return None
+        with self._lock:
+            id = self._indices[clave].get(valor)
+        return self.obtener(id) if id is not None else self._fallo()
+
+    def _fallo(self):
+        self.fallos += 1
+        return None
+
+    def guardar(self, objeto, generacion):
+        """Agrega un objeto leído y devuelve la instancia que queda en el mapa.
+
+        Si ya había una instancia con el mismo id se devuelve esa, de modo que
+        dos búsquedas del mismo producto comparten el objeto.
+        """
+        if not self._activo():
+            return objeto
+        with self._lock:
+            if generacion != self._generacion:
+                return objeto
+            existente = self._objetos.get(objeto.id)
+            if existente is not None:
+                self._objetos.move_to_end(objeto.id)
+                return existente
+            self._objetos[objeto.id] = objeto
+            valores = {clave: getattr(objeto, clave) for clave in self._indices}
+            self._claves_de[objeto.id] = valores
+            for clave, valor in valores.items():
+                self._indices[clave][valor] = objeto.id
+            while len(self._objetos) > self.capacidad:
+                viejo_id, _ = next(iter(self._objetos.items()))
+                self._quitar(viejo_id)
+        return objeto
+
+    def _quitar(self, id):
+        self._objetos.pop(id, None)
+        for clave, valor in self._claves_de.pop(id, {}).items():
+            if self._indices[clave].get(valor) == id:
+                del self._indices[clave][valor]
+
+    def invalidar(self, ids=None):
+        """Olvida los objetos ``ids`` (o todos) cuando la escritura se confirme"""
+        ids = None if ids is None else list(ids)
+
+        def _invalidar():
+            with self._lock:
+                self._generacion += 1
+                if ids is None:
+                    self._vaciar()
+                    return
+                for id in ids:
+                    self._quitar(id)
+
+        db.al_confirmar(_invalidar)
+
+    def limpiar(self):
+        """Vacía el mapa de inmediato (p. ej. al cerrar una sesión de trabajo)"""
+        with self._lock:
+            self._generacion += 1
+            self._vaciar()
+
+    def _vaciar(self):
+        self._objetos.clear()
+        self._claves_de.clear()
+        for indice in self._indices.values():
+            indice.clear()
@@ -1,20 +1,33 @@
-from datetime import datetime
-from src.database import db
+from src.database import db, CATEGORIAS_RESUMEN_LLENAR
+from src import eventos
+from src.models.cache import MapaIdentidad
+from src.models.hidratacion import hidratar
 
 class Categoria:
+    # Los totales solo se llenan en obtener_con_totales
+    __slots__ = (
+        'id', 'nombre', 'descripcion', 'fecha_creacion',
+        'num_productos', 'unidades', 'valor_inventario',
+    )
+
+    # Mapa de identidad de las búsquedas por id
+    cache = MapaIdentidad(capacidad=500)
+    
     def __init__(self, nombre, descripcion="", id=None, fecha_creacion=None):
         self.id = id
         self.nombre = nombre
         self.descripcion = descripcion
-        self.fecha_creacion = fecha_creacion or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        # La fecha la asigna la base de datos al insertar (None si aún no se guardó)
+        self.fecha_creacion = fecha_creacion
+        self.num_productos = None
+        self.unidades = None
+        self.valor_inventario = None
     
     def guardar(self):
         """Guarda la categoría en la base de datos"""
-        query = """
-        INSERT INTO categorias (nombre, descripcion)
-        VALUES (?, ?)
-        """
-        self.id = db.execute_query(query, (self.nombre, self.descripcion))
+        self.id = db.consultar('categorias.insertar', (self.nombre, self.descripcion))
+        if self.id:
+            eventos.publicar(eventos.CATEGORIA, eventos.CREADO, [self.id])
         return self.id
     
     def actualizar(self):
@@ -22,12 +35,12 @@ class Categoria:
         if not self.id:
             return None
             
-        query = """
-        UPDATE categorias
-        SET nombre = ?, descripcion = ?
-        WHERE id = ?
-        """
-        db.execute_query(query, (self.nombre, self.descripcion, self.id))
+        db.consultar('categorias.actualizar', (self.nombre, self.descripcion, self.id))
+        self.cache.invalidar([self.id])
+        # Los productos en memoria llevan el nombre de su categoría
+        from src.models.producto import Producto
+        Producto.cache.invalidar()
+        eventos.publicar(eventos.CATEGORIA, eventos.ACTUALIZADO, [self.id])
         return self.id
     
     def eliminar(self):
@@ -36,36 +49,78 @@ class Categoria:
             return False
             
         # Verificar si hay productos asociados a esta categoría
-        query = "SELECT COUNT(*) as count FROM productos WHERE categoria_id = ?"
-        resultado = db.execute_query(query, (self.id,))
-        
-        if resultado and resultado[0]['count'] > 0:
+        if db.consultar('categorias.contar_productos', (self.id,)):
             raise ValueError("No se puede eliminar la categoría porque tiene productos asociados")
         
-        query = "DELETE FROM categorias WHERE id = ?"
-        db.execute_query(query, (self.id,))
+        db.consultar('categorias.eliminar', (self.id,))
+        self.cache.invalidar([self.id])
+        eventos.publicar(eventos.CATEGORIA, eventos.ELIMINADO, [self.id])
         return True
     
     @classmethod
     def obtener_todas(cls):
         """Obtiene todas las categorías de la base de datos"""
-        query = "SELECT * FROM categorias ORDER BY nombre"
-        return [cls(**dict(row)) for row in db.execute_query(query)]
+        return cls.desde_filas(db.consultar('categorias.todas'))
     
     @classmethod
     def obtener_por_id(cls, id):
         """Obtiene una categoría por su ID"""
-        query = "SELECT * FROM categorias WHERE id = ?"
-        resultado = db.execute_query(query, (id,))
-        if resultado:
-            return cls(**dict(resultado[0]))
-        return None
+        categoria = cls.cache.obtener(id)
+        if categoria is None:
+            generacion = cls.cache.generacion()
+            resultado = db.consultar('categorias.por_id', (id,))
+            if not resultado:
+                return None
+            categoria = cls.cache.guardar(cls.desde_filas([resultado])[0], generacion)
+        return categoria
+    
+    @staticmethod
+    def resumen_disponible():
+        """Indica si la base de datos tiene la tabla de totales categorias_resumen"""
+        return bool(db.consultar('esquema.existe_tabla', ('categorias_resumen',)))
+    
+    @classmethod
+    def obtener_con_totales(cls, nombre=None, usar_resumen=True):
+        """Obtiene las categorías con sus totales de inventario en una sola consulta.
+
+        Cada categoría trae ``num_productos``, ``unidades`` y ``valor_inventario``.
+        Por defecto se leen de categorias_resumen (mantenida por triggers); con
+        ``usar_resumen=False`` o si la tabla no existe se agregan los productos
+        con GROUP BY. ``nombre`` filtra por coincidencia parcial.
+        """
+        if usar_resumen and cls.resumen_disponible():
+            nombre_consulta = 'categorias.con_totales_resumen'
+        else:
+            nombre_consulta = 'categorias.con_totales_agregado'
+        patron = f"%{nombre}%" if nombre else None
+        return cls.desde_filas(db.consultar(nombre_consulta, (patron, patron)))
+    
+    @staticmethod
+    def reconstruir_resumen():
+        """Recalcula categorias_resumen a partir de los productos"""
+        with db.transaction() as connection:
+            connection.execute("DELETE FROM categorias_resumen")
+            connection.execute(CATEGORIAS_RESUMEN_LLENAR)
     
     @classmethod
     def buscar_por_nombre(cls, nombre):
         """Busca categorías por nombre (búsqueda parcial)"""
-        query = "SELECT * FROM categorias WHERE nombre LIKE ? ORDER BY nombre"
-        return [cls(**dict(row)) for row in db.execute_query(query, (f"%{nombre}%",))]
+        return cls.desde_filas(db.consultar('categorias.buscar_por_nombre', (f"%{nombre}%",)))
+
+    @classmethod
+    def desde_filas(cls, filas, columnas=None):
+        """Crea categorías a partir de filas (``sqlite3.Row`` o tuplas con ``columnas``).
+
+        Los totales quedan en None si la consulta no los trae.
+        """
+        return hidratar(cls._desde_valores, cls.__slots__, filas or [], columnas)
+
+    @staticmethod
+    def _desde_valores(valores):
+        categoria = object.__new__(Categoria)
+        (categoria.id, categoria.nombre, categoria.descripcion, categoria.fecha_creacion,
+         categoria.num_productos, categoria.unidades, categoria.valor_inventario) = valores
+        return categoria
     
     def to_dict(self):
         """Convierte el objeto a un diccionario"""
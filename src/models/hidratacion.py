@@ -0,0 +1,46 @@
+from functools import lru_cache
+from operator import itemgetter
+
+
+@lru_cache(maxsize=256)
+def mapeador(destino, origen):
+    """Función que reordena una fila de columnas ``origen`` en el orden ``destino``.
+
+    Se calcula una vez por par de listas de columnas (las posiciones no
+    cambian entre filas de la misma consulta) y sirve tanto para tuplas como
+    para ``sqlite3.Row``. Las columnas de ``destino`` que la consulta no trae
+    quedan en None.
+    """
+    posiciones = {nombre: i for i, nombre in enumerate(origen)}
+    indices = [posiciones.get(nombre) for nombre in destino]
+    if None not in indices:
+        if len(indices) == 1:
+            unico = indices[0]
+            return lambda fila: (fila[unico],)
+        return itemgetter(*indices)
+    return lambda fila: tuple(None if i is None else fila[i] for i in indices)
+
+
+def columnas_de(filas):
+    """Nombres de columna de una lista de ``sqlite3.Row`` (vacía si no hay filas)"""
+    return tuple(filas[0].keys()) if filas else ()
+
+
+def hidratar(construir, destino, filas, columnas=None):
+    """Construye un objeto por fila con ``construir(valores)``.
+
+    ``valores`` llega en el orden de ``destino``. Si no se indican
+    ``columnas`` se toman de la primera fila (``sqlite3.Row``).
+    """
+    if not filas:
+        return []
+    obtener = mapeador(tuple(destino), tuple(columnas) if columnas else columnas_de(filas))
+    return [construir(valores) for valores in map(obtener, filas)]
+
+
+def proyectar(destino, filas, columnas=None):
+    """Tuplas con solo las columnas ``destino`` (modo sin objetos)"""
+    if not filas:
+        return []
+    obtener = mapeador(tuple(destino), tuple(columnas) if columnas else columnas_de(filas))
+    return list(map(obtener, filas))
@@ -0,0 +1,115 @@
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+
+from src.database import db
+
+ENTRADA = 'entrada'
+SALIDA = 'salida'
+
+# Formato en que se guardan las fechas de los movimientos
+FORMATO_FECHA = "%Y-%m-%d %H:%M:%S"
+
+# Stock de un producto a una fecha pasada (precio actual: no se guarda su historia)
+StockEnFecha = namedtuple('StockEnFecha', 'producto_id codigo nombre precio stock')
+
+# Totales del inventario a una fecha
+ValoracionInventario = namedtuple('ValoracionInventario', 'fecha productos unidades valor')
+
+
+def ahora():
+    return datetime.now().strftime(FORMATO_FECHA)
+
+
+def _limite(fecha):
+    """Límite exclusivo para "hasta ``fecha``".
+
+    Una ``date`` incluye el día completo; un ``datetime``, hasta ese segundo.
+    """
+    if isinstance(fecha, datetime):
+        return (fecha + timedelta(seconds=1)).strftime(FORMATO_FECHA)
+    if isinstance(fecha, date):
+        return (fecha + timedelta(days=1)).isoformat()
+    raise TypeError(f"Se esperaba date o datetime, no {type(fecha).__name__}")
+
+
+class Movimiento:
+    """Libro de movimientos de inventario.
+
+    Cada cambio en la cantidad de un producto deja un movimiento con el saldo
+    resultante. El stock de un producto a una fecha es el saldo de su último
+    movimiento hasta entonces: una búsqueda en el índice
+    ``(producto_id, fecha)``, sin repasar el historial.
+    """
+
+    @staticmethod
+    def registrar(producto_id, tipo, cantidad, notas=""):
+        """Registra un movimiento ya aplicado a la cantidad del producto"""
+        return db.consultar(
+            'movimientos.insertar', (producto_id, tipo, cantidad, notas, ahora(), producto_id)
+        )
+
+    @staticmethod
+    def registrar_ajuste(producto_id, nueva_cantidad, notas=""):
+        """Registra el paso a ``nueva_cantidad``; se llama antes de fijarla"""
+        return db.consultar(
+            'movimientos.registrar_ajuste',
+            (nueva_cantidad, nueva_cantidad, notas, ahora(), nueva_cantidad, producto_id, nueva_cantidad)
+        )
+
+    @staticmethod
+    def registrar_deltas(pares, notas=""):
+        """Registra los movimientos de ``(producto_id, delta)`` ya aplicados.
+
+        Se insertan con sentencias de varias filas, en lotes que respetan el
+        límite de parámetros de SQLite.
+        """
+        fecha = ahora()
+        por_lote = max(1, (db.max_variables() - 2) // 2)
+        with db.transaction() as connection:
+            for inicio in range(0, len(pares), por_lote):
+                lote = pares[inicio:inicio + por_lote]
+                valores = ', '.join(['(?, ?)'] * len(lote))
+                connection.execute(
+                    f"""
+                    INSERT INTO movimientos (producto_id, tipo, cantidad, notas, fecha, saldo)
+                    SELECT d.column1, CASE WHEN d.column2 > 0 THEN 'entrada' ELSE 'salida' END,
+                           abs(d.column2), ?, ?, p.cantidad
+                    FROM (VALUES {valores}) AS d
+                    JOIN productos p ON p.id = d.column1
+                    """,
+                    [notas, fecha] + [valor for par in lote for valor in par]
+                )
+
+    @staticmethod
+    def stock_en_fecha(producto_id, fecha):
+        """Stock de un producto al final del día ``fecha`` (o en ese instante si es datetime).
+
+        Devuelve None si el producto no existe.
+        """
+        limite = _limite(fecha)
+        return db.consultar('movimientos.stock_en_fecha', (limite, limite, producto_id))
+
+    @staticmethod
+    def stock_en_fecha_todos(fecha):
+        """Stock de todos los productos a ``fecha`` (ver stock_en_fecha)"""
+        limite = _limite(fecha)
+        filas = db.consultar('movimientos.stock_en_fecha_todos', (limite, limite))
+        return [StockEnFecha(*fila) for fila in filas or []]
+
+    @classmethod
+    def valoracion_en_fecha(cls, fecha):
+        """Unidades y valor del inventario a ``fecha``, con los precios actuales"""
+        stock = cls.stock_en_fecha_todos(fecha)
+        return ValoracionInventario(
+            fecha,
+            sum(1 for s in stock if s.stock),
+            sum(s.stock for s in stock),
+            sum(s.stock * s.precio for s in stock),
+        )
+
+    @staticmethod
+    def historial(producto_id, desde=None, hasta=None):
+        """Movimientos de un producto entre dos fechas (inclusive), en orden"""
+        inicio = desde.strftime(FORMATO_FECHA) if desde else ''
+        fin = _limite(hasta) if hasta else '9999-12-31'
+        return db.consultar('movimientos.de_producto', (producto_id, inicio, fin)) or []
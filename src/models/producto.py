@@ -1,8 +1,41 @@
-from datetime import datetime
+import re
+import sqlite3
+from collections import namedtuple
 from src.database import db
+from src import eventos
+from src.models.cache import MapaIdentidad
+from src.models.hidratacion import hidratar, proyectar
+from src.models.movimiento import Movimiento, ENTRADA
+
+# Por encima de este número de coincidencias no se ordena por relevancia (ver buscar)
+MAX_ORDENAR_POR_RELEVANCIA = 2000
+
+# Por debajo de este stock un producto se considera con bajo stock
+STOCK_BAJO = 5
+
+# Totales del inventario bajo un filtro (ver Producto.resumen_inventario)
+ResumenInventario = namedtuple('ResumenInventario', 'productos bajo_stock unidades valor')
+
+# Consulta base de un producto con el nombre de su categoría (listas de tamaño variable)
+SELECT_PRODUCTO = """
+SELECT p.*, c.nombre as categoria_nombre
+FROM productos p
+LEFT JOIN categorias c ON p.categoria_id = c.id
+"""
+
 
 class Producto:
-    def __init__(self, codigo, nombre, precio, cantidad=0, descripcion="", categoria_id=None, id=None):
+    # Sin __dict__ por instancia: los catálogos grandes ocupan bastante menos memoria
+    __slots__ = (
+        'id', 'codigo', 'nombre', 'descripcion', 'precio', 'cantidad',
+        'categoria_id', 'fecha_creacion', 'categoria_nombre',
+    )
+
+    # Mapa de identidad de las búsquedas por id y por código exacto
+    cache = MapaIdentidad(capacidad=2000, claves=('codigo',))
+
+    def __init__(self, codigo, nombre, precio, cantidad=0, descripcion="", categoria_id=None, id=None,
+                 fecha_creacion=None, categoria_nombre=None):
         self.id = id
         self.codigo = codigo
         self.nombre = nombre
@@ -10,19 +43,22 @@ class Producto:
         self.precio = float(precio) if precio is not None else 0.0
         self.cantidad = int(cantidad) if cantidad is not None else 0
         self.categoria_id = categoria_id
-        self.fecha_creacion = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        # La fecha la asigna la base de datos al insertar (None si aún no se guardó)
+        self.fecha_creacion = fecha_creacion
+        self.categoria_nombre = categoria_nombre
     
     def guardar(self):
         """Guarda el producto en la base de datos"""
-        query = """
-        INSERT INTO productos (codigo, nombre, descripcion, precio, cantidad, categoria_id)
-        VALUES (?, ?, ?, ?, ?, ?)
-        """
-        self.id = db.execute_query(
-            query,
-            (self.codigo, self.nombre, self.descripcion, 
-             self.precio, self.cantidad, self.categoria_id)
-        )
+        with db.transaction():
+            self.id = db.consultar(
+                'productos.insertar',
+                (self.codigo, self.nombre, self.descripcion, 
+                 self.precio, self.cantidad, self.categoria_id)
+            )
+            if self.id and self.cantidad:
+                Movimiento.registrar(self.id, ENTRADA, self.cantidad, "Stock inicial")
+        if self.id:
+            eventos.publicar(eventos.PRODUCTO, eventos.CREADO, [self.id])
         return self.id
     
     def actualizar(self):
@@ -30,17 +66,16 @@ class Producto:
         if not self.id:
             return None
             
-        query = """
-        UPDATE productos
-        SET codigo = ?, nombre = ?, descripcion = ?, 
-            precio = ?, cantidad = ?, categoria_id = ?
-        WHERE id = ?
-        """
-        db.execute_query(
-            query,
-            (self.codigo, self.nombre, self.descripcion, 
-             self.precio, self.cantidad, self.categoria_id, self.id)
-        )
+        with db.transaction():
+            # Si cambió la cantidad queda en el libro de movimientos
+            Movimiento.registrar_ajuste(self.id, self.cantidad, "Ajuste al editar el producto")
+            db.consultar(
+                'productos.actualizar',
+                (self.codigo, self.nombre, self.descripcion, 
+                 self.precio, self.cantidad, self.categoria_id, self.id)
+            )
+        self.cache.invalidar([self.id])
+        eventos.publicar(eventos.PRODUCTO, eventos.ACTUALIZADO, [self.id])
         return self.id
     
     def actualizar_cantidad(self, nueva_cantidad, notas=""):
@@ -51,101 +86,318 @@ class Producto:
         diferencia = nueva_cantidad - self.cantidad
         tipo_movimiento = "entrada" if diferencia > 0 else "salida"
         
-        # Actualizar la cantidad
-        query = "UPDATE productos SET cantidad = ? WHERE id = ?"
-        db.execute_query(query, (nueva_cantidad, self.id))
-        
-        # Registrar el movimiento
-        self.registrar_movimiento(tipo_movimiento, abs(diferencia), notas)
+        with db.transaction():
+            # Actualizar la cantidad
+            db.consultar('productos.fijar_cantidad', (nueva_cantidad, self.id))
+            
+            # Registrar el movimiento
+            self.registrar_movimiento(tipo_movimiento, abs(diferencia), notas)
+            self.cache.invalidar([self.id])
+            eventos.publicar(eventos.PRODUCTO, eventos.ACTUALIZADO, [self.id])
         
         self.cantidad = nueva_cantidad
         return True
     
     def registrar_movimiento(self, tipo, cantidad, notas=""):
-        """Registra un movimiento de inventario"""
+        """Registra un movimiento de inventario ya aplicado a la cantidad"""
         if not self.id:
             return None
             
-        query = """
-        INSERT INTO movimientos (producto_id, tipo, cantidad, notas)
-        VALUES (?, ?, ?, ?)
+        return Movimiento.registrar(self.id, tipo, cantidad, notas)
+    
+    @staticmethod
+    def aplicar_deltas_stock(deltas, notas=""):
+        """Suma a la cantidad de varios productos sus deltas en una sola pasada.
+
+        ``deltas`` es un dict ``{producto_id: delta}`` o una secuencia de pares;
+        los ids repetidos se acumulan y los deltas que suman cero se omiten.
+        Con SQLite >= 3.33 se usa un único ``UPDATE ... FROM (VALUES ...)`` por
+        lote; en versiones anteriores, un UPDATE por producto.
+        Cada cambio queda en el libro de movimientos con ``notas``. Devuelve
+        cuántos productos se actualizaron: los ids que no existen no cuentan ni
+        generan eventos.
         """
-        return db.execute_query(query, (self.id, tipo, cantidad, notas))
+        acumulados = {}
+        for producto_id, delta in (deltas.items() if isinstance(deltas, dict) else deltas):
+            acumulados[producto_id] = acumulados.get(producto_id, 0) + delta
+        pares = [(producto_id, delta) for producto_id, delta in acumulados.items() if delta]
+        if not pares:
+            return 0
+
+        with db.transaction() as connection:
+            if sqlite3.sqlite_version_info < (3, 33, 0):
+                actualizados = [
+                    producto_id for producto_id, delta in pares
+                    if db.consultar('productos.sumar_cantidad', (delta, producto_id))
+                ]
+            else:
+                actualizados = []
+                por_lote = max(1, db.max_variables() // 2)
+                for inicio in range(0, len(pares), por_lote):
+                    lote = pares[inicio:inicio + por_lote]
+                    valores = ', '.join(['(?, ?)'] * len(lote))
+                    cursor = connection.execute(
+                        f"""
+                        UPDATE productos
+                        SET cantidad = cantidad + d.column2
+                        FROM (VALUES {valores}) AS d
+                        WHERE productos.id = d.column1
+                        """,
+                        [valor for par in lote for valor in par]
+                    )
+                    ids_lote = [producto_id for producto_id, _ in lote]
+                    if cursor.rowcount < len(lote):
+                        # Algún id no existe: se averigua cuáles sí se actualizaron
+                        marcadores = ', '.join('?' * len(ids_lote))
+                        ids_lote = [fila[0] for fila in connection.execute(
+                            f"SELECT id FROM productos WHERE id IN ({marcadores})", ids_lote
+                        )]
+                    actualizados += ids_lote
+            if actualizados:
+                Movimiento.registrar_deltas([(i, acumulados[i]) for i in actualizados], notas)
+                # Se aplican al confirmar la transacción
+                Producto.cache.invalidar(actualizados)
+                eventos.publicar(eventos.PRODUCTO, eventos.ACTUALIZADO, actualizados)
+        return len(actualizados)
     
     def eliminar(self):
         """Elimina el producto de la base de datos"""
         if not self.id:
             return False
             
-        # Primero eliminamos los movimientos asociados
-        db.execute_query("DELETE FROM movimientos WHERE producto_id = ?", (self.id,))
-        
-        # Luego eliminamos el producto
-        db.execute_query("DELETE FROM productos WHERE id = ?", (self.id,))
+        # Movimientos y producto se borran juntos: si falla el producto,
+        # su libro de movimientos queda como estaba
+        with db.transaction():
+            # Las ventas registradas siguen apuntando al producto
+            if db.consultar('productos.contar_ventas', (self.id,)):
+                raise ValueError("No se puede eliminar el producto porque tiene ventas registradas")
+            
+            db.consultar('movimientos.eliminar_de_producto', (self.id,))
+            if not db.consultar('productos.eliminar', (self.id,)):
+                return False
+            # Se aplican al confirmar la transacción
+            self.cache.invalidar([self.id])
+            eventos.publicar(eventos.PRODUCTO, eventos.ELIMINADO, [self.id])
         return True
     
     @classmethod
-    def obtener_todos(cls, categoria_id=None):
-        """Obtiene todos los productos, opcionalmente filtrados por categoría"""
+    def obtener_todos(cls, categoria_id=None, columnas=None):
+        """Obtiene todos los productos, opcionalmente filtrados por categoría.
+
+        Con ``columnas`` (p. ej. ``('id', 'nombre', 'cantidad')``) devuelve
+        tuplas con esas columnas en lugar de objetos Producto.
+        """
         if categoria_id is not None:
-            query = """
-            SELECT p.*, c.nombre as categoria_nombre 
-            FROM productos p
-            LEFT JOIN categorias c ON p.categoria_id = c.id
-            WHERE p.categoria_id = ?
-            ORDER BY p.nombre
-            """
-            resultados = db.execute_query(query, (categoria_id,))
+            resultados = cls._consultar('productos.por_categoria', (categoria_id,), columnas)
         else:
-            query = """
-            SELECT p.*, c.nombre as categoria_nombre 
-            FROM productos p
-            LEFT JOIN categorias c ON p.categoria_id = c.id
-            ORDER BY p.nombre
-            """
-            resultados = db.execute_query(query)
+            resultados = cls._consultar('productos.todos', (), columnas)
             
-        return [cls.crear_desde_fila(dict(row)) for row in resultados]
+        return resultados or []
     
     @classmethod
     def obtener_por_id(cls, id):
         """Obtiene un producto por su ID"""
-        query = """
-        SELECT p.*, c.nombre as categoria_nombre 
-        FROM productos p
-        LEFT JOIN categorias c ON p.categoria_id = c.id
-        WHERE p.id = ?
+        producto = cls.cache.obtener(id)
+        if producto is None:
+            generacion = cls.cache.generacion()
+            resultado = db.consultar('productos.por_id', (id,))
+            if not resultado:
+                return None
+            producto = cls.cache.guardar(cls.desde_filas([resultado])[0], generacion)
+        return producto
+    
+    @classmethod
+    def obtener_por_codigo(cls, codigo):
+        """Obtiene el producto con exactamente ese código (usa el índice UNIQUE)"""
+        if not codigo:
+            return None
+        producto = cls.cache.obtener_por('codigo', codigo)
+        if producto is None:
+            generacion = cls.cache.generacion()
+            resultado = db.consultar('productos.por_codigo', (codigo,))
+            if not resultado:
+                return None
+            producto = cls.cache.guardar(cls.desde_filas([resultado])[0], generacion)
+        return producto
+    
+    @classmethod
+    def obtener_por_codigos(cls, codigos):
+        """Resuelve varios códigos exactos a la vez.
+
+        Devuelve un dict ``{codigo: Producto}`` con los códigos encontrados; los
+        que no están en el mapa de identidad se consultan con ``IN (...)`` en
+        lotes que respetan el límite de parámetros de SQLite.
         """
-        resultado = db.execute_query(query, (id,))
-        if resultado:
-            return cls.crear_desde_fila(dict(resultado[0]))
-        return None
+        productos = {}
+        faltantes = []
+        for codigo in dict.fromkeys(c for c in codigos if c):
+            producto = cls.cache.obtener_por('codigo', codigo)
+            if producto is None:
+                faltantes.append(codigo)
+            else:
+                productos[codigo] = producto
+
+        if faltantes:
+            generacion = cls.cache.generacion()
+            por_lote = db.max_variables()
+            for inicio in range(0, len(faltantes), por_lote):
+                lote = faltantes[inicio:inicio + por_lote]
+                marcadores = ', '.join('?' * len(lote))
+                resultado = db.execute_query(
+                    SELECT_PRODUCTO + f"WHERE p.codigo IN ({marcadores})", tuple(lote)
+                ) or []
+                for producto in cls.desde_filas(resultado):
+                    producto = cls.cache.guardar(producto, generacion)
+                    productos[producto.codigo] = producto
+
+        return productos
+
+    @classmethod
+    def obtener_por_ids(cls, ids, columnas=None):
+        """Lee varios productos por id (los que existan) sin pasar por el mapa de identidad.
+
+        Con ``columnas`` devuelve tuplas como obtener_todos. Sirve para
+        refrescar solo las filas afectadas por un cambio.
+        """
+        ids = list(dict.fromkeys(ids))
+        resultados = []
+        por_lote = db.max_variables()
+        for inicio in range(0, len(ids), por_lote):
+            lote = ids[inicio:inicio + por_lote]
+            marcadores = ', '.join('?' * len(lote))
+            filas = db.execute_query(
+                SELECT_PRODUCTO + f"WHERE p.id IN ({marcadores})", tuple(lote)
+            ) or []
+            if columnas is not None:
+                resultados.extend(proyectar(columnas, filas))
+            else:
+                resultados.extend(cls.desde_filas(filas))
+        return resultados
+
+    @staticmethod
+    def expresion_busqueda(termino):
+        """Convierte el texto del usuario en una expresión MATCH de FTS5.
+
+        El índice es de trigramas: cada palabra de tres o más caracteres se
+        busca en cualquier parte del código o del nombre y todas deben
+        aparecer. Las palabras más cortas no se pueden buscar en el índice y
+        se omiten si hay alguna larga; si no queda ninguna devuelve None y la
+        búsqueda usa LIKE.
+        """
+        palabras = [p for p in re.findall(r"\w+", termino or "") if len(p) >= 3]
+        if not palabras:
+            return None
+        return " ".join(f'"{palabra}"' for palabra in palabras)
+
+    @staticmethod
+    def busqueda_fts_disponible():
+        """Indica si la base de datos tiene el índice productos_fts"""
+        return bool(db.consultar('esquema.existe_tabla', ('productos_fts',)))
+    
+    @staticmethod
+    def _coincidencias_fts(expresion):
+        """Cuenta las coincidencias de una expresión (barato: no calcula relevancia)"""
+        return db.consultar('productos.coincidencias_fts', (expresion,)) or 0
     
     @classmethod
-    def buscar(cls, termino, categoria_id=None):
-        """Busca productos por nombre o código, opcionalmente filtrados por categoría"""
+    def buscar(cls, termino, categoria_id=None, limite=None, columnas=None):
+        """Busca productos por nombre o código, opcionalmente filtrados por categoría.
+
+        Usa el índice FTS5 de trigramas (coincidencias en cualquier parte del
+        texto, resultados ordenados por relevancia) y recurre a LIKE si el
+        índice no existe o el término no tiene palabras de tres caracteres.
+        Con ``limite``, si el término es tan amplio que coincide con más de
+        MAX_ORDENAR_POR_RELEVANCIA productos se omite el cálculo de relevancia
+        y se devuelven los primeros que encuentra el índice: calcularla para
+        decenas de miles de filas es lo que domina el tiempo de las búsquedas
+        muy cortas. ``columnas`` funciona como en obtener_todos.
+        """
+        expresion = cls.expresion_busqueda(termino)
+        # En las consultas registradas NULL = todas las categorías y -1 = sin límite
+        sin_limite = -1 if limite is None else limite
+        if expresion and cls.busqueda_fts_disponible():
+            if limite is None or cls._coincidencias_fts(expresion) <= MAX_ORDENAR_POR_RELEVANCIA:
+                nombre = 'productos.buscar_fts'
+            else:
+                nombre = 'productos.buscar_fts_sin_orden'
+            resultados = cls._consultar(nombre, (expresion, categoria_id, categoria_id, sin_limite), columnas)
+            if resultados is not None:
+                return resultados
+
         termino_busqueda = f"%{termino}%"
-        
-        if categoria_id is not None:
-            query = """
-            SELECT p.*, c.nombre as categoria_nombre 
-            FROM productos p
-            LEFT JOIN categorias c ON p.categoria_id = c.id
-            WHERE (p.nombre LIKE ? OR p.codigo LIKE ?) AND p.categoria_id = ?
-            ORDER BY p.nombre
-            """
-            resultados = db.execute_query(query, (termino_busqueda, termino_busqueda, categoria_id))
-        else:
-            query = """
-            SELECT p.*, c.nombre as categoria_nombre 
-            FROM productos p
-            LEFT JOIN categorias c ON p.categoria_id = c.id
-            WHERE p.nombre LIKE ? OR p.codigo LIKE ?
-            ORDER BY p.nombre
-            """
-            resultados = db.execute_query(query, (termino_busqueda, termino_busqueda))
+        resultados = cls._consultar(
+            'productos.buscar_like',
+            (termino_busqueda, termino_busqueda, categoria_id, categoria_id, sin_limite),
+            columnas
+        )
             
-        return [cls.crear_desde_fila(dict(row)) for row in resultados]
+        return resultados or []
+
+    @classmethod
+    def resumen_inventario(cls, categoria_id=None, termino=None, stock_bajo=STOCK_BAJO):
+        """Totales del inventario con el mismo filtro que obtener_todos/buscar.
+
+        Devuelve un ResumenInventario con el número de productos, cuántos
+        tienen menos de ``stock_bajo`` unidades, las unidades y el valor
+        (precio × cantidad), calculados con un único agregado en SQLite.
+        """
+        fila = None
+        if termino:
+            expresion = cls.expresion_busqueda(termino)
+            if expresion and cls.busqueda_fts_disponible():
+                fila = db.consultar(
+                    'productos.resumen_fts', (stock_bajo, expresion, categoria_id, categoria_id)
+                )
+            if fila is None:
+                termino_busqueda = f"%{termino}%"
+                fila = db.consultar(
+                    'productos.resumen_like',
+                    (stock_bajo, termino_busqueda, termino_busqueda, categoria_id, categoria_id)
+                )
+        else:
+            fila = db.consultar('productos.resumen', (stock_bajo, categoria_id, categoria_id))
+        if fila is None:
+            return ResumenInventario(0, 0, 0, 0.0)
+        return ResumenInventario(fila['productos'], fila['bajo_stock'], fila['unidades'], float(fila['valor']))
+
+    @staticmethod
+    def resumir(productos, stock_bajo=STOCK_BAJO):
+        """ResumenInventario de una lista de productos ya cargada"""
+        return ResumenInventario(
+            len(productos),
+            sum(1 for p in productos if p.cantidad < stock_bajo),
+            sum(p.cantidad for p in productos),
+            sum(p.precio * p.cantidad for p in productos),
+        )
+
+    @classmethod
+    def _consultar(cls, nombre, params, columnas=None):
+        """Ejecuta una consulta de listado y devuelve objetos o tuplas (None si falla)"""
+        resultado = db.consultar_tuplas(nombre, params)
+        if resultado is None:
+            return None
+        origen, filas = resultado
+        if columnas is not None:
+            return proyectar(columnas, filas, origen)
+        return hidratar(cls._desde_valores, cls.__slots__, filas, origen)
+
+    @classmethod
+    def desde_filas(cls, filas, columnas=None):
+        """Crea productos a partir de filas (``sqlite3.Row`` o tuplas con ``columnas``).
+
+        Las posiciones de cada columna se resuelven una vez por consulta y los
+        valores se asignan directamente, sin pasar por dict ni por __init__.
+        """
+        return hidratar(cls._desde_valores, cls.__slots__, filas, columnas)
+
+    @staticmethod
+    def _desde_valores(valores):
+        # Los tipos ya vienen de SQLite (precio REAL, cantidad INTEGER): sin conversiones
+        producto = object.__new__(Producto)
+        (producto.id, producto.codigo, producto.nombre, producto.descripcion, producto.precio,
+         producto.cantidad, producto.categoria_id, producto.fecha_creacion,
+         producto.categoria_nombre) = valores
+        return producto
     
     @classmethod
     def crear_desde_fila(cls, fila):
@@ -157,9 +409,10 @@ class Producto:
             descripcion=fila.get('descripcion', ''),
             precio=float(fila.get('precio', 0)),
             cantidad=int(fila.get('cantidad', 0)),
-            categoria_id=fila.get('categoria_id')
+            categoria_id=fila.get('categoria_id'),
+            fecha_creacion=fila.get('fecha_creacion'),
+            categoria_nombre=fila.get('categoria_nombre')
         )
-        producto.categoria_nombre = fila.get('categoria_nombre')
         return producto
     
     def to_dict(self):
@@ -172,7 +425,7 @@ class Producto:
             'precio': self.precio,
             'cantidad': self.cantidad,
             'categoria_id': self.categoria_id,
-            'categoria_nombre': getattr(self, 'categoria_nombre', ''),
+            'categoria_nombre': self.categoria_nombre or '',
             'valor_total': self.precio * self.cantidad,
             'fecha_creacion': self.fecha_creacion
         }
@@ -0,0 +1,101 @@
+from collections import namedtuple
+from datetime import date, datetime
+
+from src.database import db, VENTAS_DIARIAS_LLENAR
+
+# Periodos en los que se pueden agrupar los acumulados diarios
+DIA = 'dia'
+MES = 'mes'
+ANIO = 'anio'
+
+_CONSULTAS_PERIODO = {
+    DIA: 'reportes.por_dia',
+    MES: 'reportes.por_mes',
+    ANIO: 'reportes.por_anio',
+}
+
+# Rango abierto: sin fecha desde/hasta se toman todos los días
+FECHA_MINIMA = '0000-01-01'
+FECHA_MAXIMA = '9999-12-31'
+
+FilaPeriodo = namedtuple('FilaPeriodo', 'periodo ventas unidades ingresos')
+TotalesVentas = namedtuple('TotalesVentas', 'ventas unidades ingresos')
+FilaProducto = namedtuple('FilaProducto', 'producto_id codigo nombre ventas unidades ingresos')
+FilaCategoria = namedtuple('FilaCategoria', 'categoria_id nombre ventas unidades ingresos')
+
+
+def _fecha(valor, por_defecto):
+    """Convierte ``date``/``datetime``/texto a 'YYYY-MM-DD' (None → por_defecto)"""
+    if valor is None:
+        return por_defecto
+    if isinstance(valor, (date, datetime)):
+        return valor.strftime("%Y-%m-%d")
+    return str(valor)[:10]
+
+
+def rango_fechas(desde, hasta):
+    """Límites 'YYYY-MM-DD' (inclusive) de un rango; None deja el extremo abierto"""
+    return _fecha(desde, FECHA_MINIMA), _fecha(hasta, FECHA_MAXIMA)
+
+
+class Reporte:
+    """Reportes de ventas leídos de los acumulados diarios.
+
+    ``ventas_diarias``, ``ventas_diarias_producto`` y ``ventas_diarias_categoria``
+    guardan una fila por día (y producto o categoría) con las ventas
+    completadas; ``ventas_mensuales_producto`` agrupa por mes los totales por
+    producto. ``Venta.guardar`` y ``Venta.cancelar_venta`` las mantienen con
+    ``aplicar_venta``, así que un reporte mensual o anual suma unos cientos de
+    filas en lugar de recorrer ``venta_items``.
+    """
+
+    @staticmethod
+    def aplicar_venta(venta_id, signo=1):
+        """Suma (``signo=1``) o resta (``signo=-1``) una venta a los acumulados.
+
+        Solo cuenta si la venta está completada. Para modificarla se resta
+        antes del cambio y se vuelve a sumar después, dentro de la misma
+        transacción.
+        """
+        params = (signo, signo, signo, venta_id)
+        with db.transaction():
+            db.consultar('reportes.sumar_venta_dia', params)
+            db.consultar('reportes.sumar_venta_productos', params)
+            db.consultar('reportes.sumar_venta_categorias', params)
+            db.consultar('reportes.sumar_venta_productos_mes', params)
+
+    @staticmethod
+    def reconstruir():
+        """Recalcula todos los acumulados a partir de las ventas"""
+        with db.transaction() as connection:
+            for tabla in VENTAS_DIARIAS_LLENAR:
+                connection.execute(f"DELETE FROM {tabla}")
+            for sentencia in VENTAS_DIARIAS_LLENAR.values():
+                connection.execute(sentencia)
+
+    @staticmethod
+    def por_periodo(periodo=DIA, desde=None, hasta=None):
+        """Ventas, unidades e ingresos por día, mes ('YYYY-MM') o año ('YYYY')"""
+        try:
+            nombre = _CONSULTAS_PERIODO[periodo]
+        except KeyError:
+            raise ValueError(f"Periodo desconocido: {periodo!r}") from None
+        return [FilaPeriodo(*fila) for fila in db.consultar(nombre, rango_fechas(desde, hasta)) or []]
+
+    @staticmethod
+    def totales(desde=None, hasta=None):
+        """Totales de ventas completadas en el rango"""
+        fila = db.consultar('reportes.totales', rango_fechas(desde, hasta))
+        return TotalesVentas(*fila) if fila else TotalesVentas(0, 0, 0.0)
+
+    @staticmethod
+    def productos_mas_vendidos(desde=None, hasta=None, limite=10):
+        """Productos ordenados por ingresos en el rango"""
+        filas = db.consultar('reportes.productos', rango_fechas(desde, hasta) + (limite,))
+        return [FilaProducto(*fila) for fila in filas or []]
+
+    @staticmethod
+    def por_categoria(desde=None, hasta=None):
+        """Ventas por categoría en el rango (``categoria_id`` 0 = sin categoría)"""
+        filas = db.consultar('reportes.categorias', rango_fechas(desde, hasta))
+        return [FilaCategoria(*fila) for fila in filas or []]
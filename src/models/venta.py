@@ -1,12 +1,29 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from typing import List, Optional
 import random
 import string
 
 from src.database import db
+from src import eventos
+from src.models.movimiento import FORMATO_FECHA
+from src.models.producto import Producto
+from src.models.reporte import Reporte
 
-@dataclass
+ITEM_COLUMNAS = ('venta_id', 'producto_id', 'cantidad', 'precio_unitario', 'subtotal')
+
+# Columna calculada con las líneas "Nombre x Cant." de cada venta, separadas por saltos de línea
+RESUMEN_ITEMS_SQL = """
+IFNULL((SELECT GROUP_CONCAT(linea, char(10)) FROM (
+    SELECT p.nombre || ' x ' || vi.cantidad AS linea
+    FROM venta_items vi
+    JOIN productos p ON p.id = vi.producto_id
+    WHERE vi.venta_id = ventas.id
+    ORDER BY vi.id
+)), '') AS resumen_items
+"""
+
+@dataclass(slots=True)
 class VentaItem:
     id: Optional[int] = None
     venta_id: Optional[int] = None
@@ -20,7 +37,7 @@ class VentaItem:
         self.subtotal = round(self.cantidad * self.precio_unitario, 2)
         return self.subtotal
 
-@dataclass
+@dataclass(slots=True)
 class Venta:
     id: Optional[int] = None
     codigo_venta: str = ""
@@ -31,6 +48,10 @@ class Venta:
     items: List[VentaItem] = field(default_factory=list)
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
+    # False cuando la venta se obtuvo sin ítems (carga diferida con cargar_items)
+    items_cargados: bool = field(default=True, repr=False, compare=False)
+    # Líneas "Nombre x Cant." leídas junto con la cabecera (ver obtener_pagina)
+    resumen_items: Optional[str] = field(default=None, repr=False, compare=False)
     
     @classmethod
     def generar_codigo_venta(cls):
@@ -68,101 +89,91 @@ class Venta:
         
         self.calcular_total()
         now = datetime.now()
+        self.fecha_venta = self._normalizar_fecha(self.fecha_venta)
         
-        if self.id is None:
-            # Insertar nueva venta
-            query = """
-            INSERT INTO ventas (codigo_venta, fecha_venta, total, estado, notas)
-            VALUES (?, ?, ?, ?, ?)
-            """
-            venta_id = db.execute_query(
-                query,
-                (
-                    self.codigo_venta,
-                    self.fecha_venta,
-                    self.total,
-                    self.estado,
-                    self.notas
-                )
-            )
-            self.id = venta_id
-            
-            # Insertar ítems
-            for item in self.items:
-                item_query = """
-                INSERT INTO venta_items (venta_id, producto_id, cantidad, precio_unitario, subtotal)
-                VALUES (?, ?, ?, ?, ?)
-                """
-                db.execute_query(
-                    item_query,
-                    (
-                        self.id,
-                        item.producto_id,
-                        item.cantidad,
-                        item.precio_unitario,
-                        item.subtotal
+        # Cabecera, ítems y stock se confirman juntos: o se guarda todo o nada
+        id_previo = self.id
+        try:
+            with db.transaction():
+                if self.id is None:
+                    # Insertar nueva venta
+                    venta_id = db.consultar(
+                        'ventas.insertar',
+                        (
+                            self.codigo_venta,
+                            self.fecha_venta.strftime(FORMATO_FECHA),
+                            self.total,
+                            self.estado,
+                            self.notas
+                        )
                     )
-                )
-                
-                # Actualizar el stock del producto
-                db.execute_query(
-                    "UPDATE productos SET cantidad = cantidad - ? WHERE id = ?",
-                    (item.cantidad, item.producto_id)
-                )
-        else:
-            # Actualizar venta existente
-            query = """
-            UPDATE ventas 
-            SET total = ?, estado = ?, notas = ?
-            WHERE id = ?
-            """
-            db.execute_query(
-                query,
-                (self.total, self.estado, self.notas, self.id)
-            )
+                    self.id = venta_id
+                    eventos.publicar(eventos.VENTA, eventos.CREADO, [venta_id])
             
-            # Eliminar ítems antiguos
-            db.execute_query("DELETE FROM venta_items WHERE venta_id = ?", (self.id,))
+                    # Insertar ítems y descontar el stock en lote
+                    self._insertar_items()
+                    Producto.aplicar_deltas_stock(
+                        [(item.producto_id, -item.cantidad) for item in self.items],
+                        f"Venta {self.codigo_venta}"
+                    )
+                    Reporte.aplicar_venta(venta_id)
+                else:
+                    # Quitar la versión anterior de los acumulados diarios
+                    Reporte.aplicar_venta(self.id, -1)
             
-            # Insertar ítems actualizados
-            for item in self.items:
-                item_query = """
-                INSERT INTO venta_items (venta_id, producto_id, cantidad, precio_unitario, subtotal)
-                VALUES (?, ?, ?, ?, ?)
-                """
-                db.execute_query(
-                    item_query,
-                    (
-                        self.id,
-                        item.producto_id,
-                        item.cantidad,
-                        item.precio_unitario,
-                        item.subtotal
+                    # Actualizar venta existente
+                    db.consultar(
+                        'ventas.actualizar',
+                        (self.total, self.estado, self.notas, self.id)
                     )
-                )
+                    eventos.publicar(eventos.VENTA, eventos.ACTUALIZADO, [self.id])
+            
+                    # Eliminar ítems antiguos
+                    db.consultar('venta_items.eliminar_de_venta', (self.id,))
+            
+                    # Insertar ítems actualizados
+                    self._insertar_items()
+                    Reporte.aplicar_venta(self.id)
+        except Exception:
+            self.id = id_previo
+            raise
         
         return self.id
+
+    def _insertar_items(self):
+        """Inserta los ítems de la venta con INSERTs de varias filas.
+
+        Cada ítem guarda la categoría de su producto en ese momento: con ella
+        se suma la venta a los acumulados por categoría y con ella se resta al
+        cancelarla o editarla.
+        """
+        db.insert_many(
+            'venta_items',
+            ITEM_COLUMNAS,
+            [
+                (self.id, item.producto_id, item.cantidad, item.precio_unitario, item.subtotal)
+                for item in self.items
+            ]
+        )
+        db.consultar('venta_items.fijar_categorias', (self.id,))
     
     @classmethod
-    def obtener_por_id(cls, venta_id: int):
-        """Obtiene una venta por su ID"""
-        venta_rows = db.execute_query(
-            "SELECT * FROM ventas WHERE id = ?",
-            (venta_id,)
-        )
-        
-        if not venta_rows:
-            return None
-        venta_data = venta_rows[0]
-            
-        # Obtener ítems de la venta
-        items_data = db.execute_query(
-            "SELECT * FROM venta_items WHERE venta_id = ?",
-            (venta_id,)
-        )
-        
-        # Asegurar que fecha_venta sea datetime
-        fecha_val = venta_data['fecha_venta']
+    def _normalizar_fecha(cls, fecha_val):
+        """Fecha de la venta como ``datetime`` al segundo, tal como se guarda.
+
+        ``fecha_venta`` se guarda como texto 'YYYY-MM-DD HH:MM:SS' para que los
+        filtros por rango comparen la columna directamente y usen el índice.
+        Un ``date`` sin hora (el del diálogo de venta) se completa con la hora actual.
+        """
+        if isinstance(fecha_val, str):
+            fecha_val = cls._parsear_fecha(fecha_val)
+        elif not isinstance(fecha_val, datetime):
+            fecha_val = datetime.combine(fecha_val, datetime.now().time())
+        return fecha_val.replace(microsecond=0)
+
+    @staticmethod
+    def _parsear_fecha(fecha_val):
+        """Asegura que una fecha leída de la base de datos sea datetime"""
         if isinstance(fecha_val, str):
             try:
                 # Intentar ISO8601 primero
@@ -177,97 +188,248 @@ class Venta:
                         fecha_val = datetime.strptime(fecha_val, "%Y-%m-%d")
                     except Exception:
                         fecha_val = datetime.now()
+        return fecha_val
 
-        # Crear objeto Venta
-        venta = cls(
+    @classmethod
+    def _desde_fila(cls, venta_data, items_cargados=True):
+        """Crea una Venta (sin ítems) a partir de una fila de ``ventas``"""
+        return cls(
             id=venta_data['id'],
             codigo_venta=venta_data['codigo_venta'],
-            fecha_venta=fecha_val,
+            fecha_venta=cls._parsear_fecha(venta_data['fecha_venta']),
             total=venta_data['total'],
             estado=venta_data['estado'],
-            notas=venta_data['notas']
+            notas=venta_data['notas'],
+            items_cargados=items_cargados,
+            resumen_items=venta_data['resumen_items'] if 'resumen_items' in venta_data.keys() else None
         )
-        
-        # Agregar ítems
-        for item_data in items_data:
-            item = VentaItem(
-                id=item_data['id'],
-                venta_id=item_data['venta_id'],
-                producto_id=item_data['producto_id'],
-                cantidad=item_data['cantidad'],
-                precio_unitario=item_data['precio_unitario'],
-                subtotal=item_data['subtotal']
-            )
-            venta.items.append(item)
+
+    @staticmethod
+    def _item_desde_fila(item_data):
+        """Crea un VentaItem a partir de una fila de ``venta_items``"""
+        return VentaItem(
+            id=item_data['id'],
+            venta_id=item_data['venta_id'],
+            producto_id=item_data['producto_id'],
+            cantidad=item_data['cantidad'],
+            precio_unitario=item_data['precio_unitario'],
+            subtotal=item_data['subtotal']
+        )
+
+    def lineas_resumen(self):
+        """Lista de líneas "Nombre x Cant." de la venta.
+
+        Usa ``resumen_items`` si vino con la consulta; si no, la arma con los
+        ítems y sus productos.
+        """
+        if self.resumen_items is not None:
+            return self.resumen_items.split("\n") if self.resumen_items else []
+        lineas = []
+        for it in self.cargar_items():
+            prod = Producto.obtener_por_id(it.producto_id)
+            if prod:
+                lineas.append(f"{prod.nombre} x {it.cantidad}")
+        return lineas
+
+    def _asignar_items(self, items):
+        """Asigna los ítems cargados y aplica los recálculos de respaldo"""
+        self.items = items
+        self.items_cargados = True
 
         # Fallback: si algún subtotal vino en 0 o nulo, recalcularlo
-        for it in venta.items:
+        for it in self.items:
             if it.subtotal is None or float(it.subtotal) == 0.0:
                 it.subtotal = round(float(it.cantidad) * float(it.precio_unitario), 2)
 
         # Fallback: si el total vino 0, recalcular a partir de ítems
         try:
-            total_val = float(venta.total)
+            total_val = float(self.total)
         except Exception:
             total_val = 0.0
-        if total_val == 0.0 and venta.items:
-            venta.calcular_total()
+        if total_val == 0.0 and self.items:
+            self.calcular_total()
 
-        return venta
-    
     @classmethod
-    def obtener_todas(cls, fecha_inicio=None, fecha_fin=None, estado=None):
-        """Obtiene todas las ventas, opcionalmente filtradas por fecha y estado"""
-        query = "SELECT * FROM ventas WHERE 1=1"
+    def obtener_por_id(cls, venta_id: int):
+        """Obtiene una venta por su ID"""
+        venta_row = db.consultar('ventas.por_id', (venta_id,))
+        
+        if not venta_row:
+            return None
+        venta = cls._desde_fila(venta_row)
+            
+        # Obtener ítems de la venta
+        items_data = db.consultar('venta_items.de_venta', (venta_id,)) or []
+        venta._asignar_items([cls._item_desde_fila(row) for row in items_data])
+        return venta
+
+    @staticmethod
+    def _filtros(fecha_inicio=None, fecha_fin=None, estado=None, termino=None):
+        """Construye la cláusula WHERE común a los listados de ventas.
+
+        ``fecha_inicio`` y ``fecha_fin`` (``date`` o ``datetime``) incluyen los
+        días completos. ``termino`` deja las ventas cuyo código o el nombre de
+        alguno de sus productos lo contiene.
+        """
+        condiciones = ["1=1"]
         params = []
         
+        # Rango semiabierto [inicio, día siguiente al fin) sobre la columna sin
+        # funciones, para que SQLite use idx_ventas_estado_fecha / idx_ventas_fecha
         if fecha_inicio:
-            query += " AND DATE(fecha_venta) >= ?"
+            condiciones.append("fecha_venta >= ?")
             params.append(fecha_inicio.strftime("%Y-%m-%d"))
             
         if fecha_fin:
-            query += " AND DATE(fecha_venta) <= ?"
-            params.append(fecha_fin.strftime("%Y-%m-%d"))
+            condiciones.append("fecha_venta < ?")
+            params.append((fecha_fin + timedelta(days=1)).strftime("%Y-%m-%d"))
             
         if estado:
-            query += " AND estado = ?"
+            condiciones.append("estado = ?")
             params.append(estado)
-            
-        query += " ORDER BY fecha_venta DESC"
+
+        if termino:
+            condiciones.append(
+                "(codigo_venta LIKE ? OR EXISTS (SELECT 1 FROM venta_items vi "
+                "JOIN productos p ON p.id = vi.producto_id "
+                "WHERE vi.venta_id = ventas.id AND p.nombre LIKE ?))"
+            )
+            params += [f"%{termino}%"] * 2
+
+        return " AND ".join(condiciones), params
+    
+    @classmethod
+    def obtener_todas(cls, fecha_inicio=None, fecha_fin=None, estado=None, con_items=True):
+        """Obtiene todas las ventas, opcionalmente filtradas por fecha y estado.
+
+        Las cabeceras y todos sus ítems se leen con dos consultas en total. Con
+        ``con_items=False`` solo se leen las cabeceras; los ítems se cargan
+        después con ``cargar_items()`` o, para varias ventas a la vez, con
+        ``Venta.cargar_items_de(ventas)``.
+        """
+        where, params = cls._filtros(fecha_inicio, fecha_fin, estado)
         
-        ventas_data = db.execute_query(query, tuple(params))
+        ventas_data = db.execute_query(
+            f"SELECT * FROM ventas WHERE {where} ORDER BY fecha_venta DESC",
+            tuple(params)
+        )
         # Manejar el caso donde execute_query devuelve None por un error
         if not ventas_data:
             return []
-        ventas = []
-        
-        for venta_data in ventas_data:
-            venta = cls.obtener_por_id(venta_data['id'])
-            if venta:
-                ventas.append(venta)
+        ventas = [cls._desde_fila(row, items_cargados=False) for row in ventas_data]
+
+        if con_items:
+            items_data = db.execute_query(
+                f"""
+                SELECT * FROM venta_items
+                WHERE venta_id IN (SELECT id FROM ventas WHERE {where})
+                ORDER BY venta_id, id
+                """,
+                tuple(params)
+            ) or []
+            cls._repartir_items(ventas, items_data)
                 
         return ventas
+
+    @classmethod
+    def obtener_pagina(cls, fecha_inicio=None, fecha_fin=None, estado=None,
+                       limite=100, cursor=None, con_items=True, con_resumen=False, termino=None):
+        """Obtiene una página de ventas paginando por clave ``(fecha_venta, id)``.
+
+        Devuelve ``(ventas, siguiente_cursor)``. ``cursor`` es el valor devuelto
+        por la página anterior (``None`` para la primera) y ``siguiente_cursor``
+        es ``None`` cuando no quedan más ventas. Cada página cuesta lo mismo sin
+        importar cuántas se hayan leído antes, porque no se usa OFFSET.
+        Con ``con_resumen=True`` cada venta trae ``resumen_items`` calculado en
+        la misma consulta, suficiente para listados que no necesitan los ítems.
+        ``termino`` filtra como en ``_filtros``: las páginas solo traen ventas
+        que coinciden.
+        """
+        where, params = cls._filtros(fecha_inicio, fecha_fin, estado, termino)
+        if cursor is not None:
+            fecha_cursor, id_cursor = cursor
+            where += " AND (fecha_venta < ? OR (fecha_venta = ? AND id < ?))"
+            params += [fecha_cursor, fecha_cursor, id_cursor]
+
+        columnas = "*, " + RESUMEN_ITEMS_SQL if con_resumen else "*"
+        # Se pide una fila de más para saber si existe una página siguiente
+        filas = db.execute_query(
+            f"SELECT {columnas} FROM ventas WHERE {where} ORDER BY fecha_venta DESC, id DESC LIMIT ?",
+            tuple(params) + (limite + 1,)
+        ) or []
+        hay_mas = len(filas) > limite
+        filas = filas[:limite]
+
+        ventas = [cls._desde_fila(row, items_cargados=False) for row in filas]
+        if con_items:
+            cls.cargar_items_de(ventas)
+
+        siguiente = (filas[-1]['fecha_venta'], filas[-1]['id']) if hay_mas else None
+        return ventas, siguiente
+
+    @classmethod
+    def totales(cls, fecha_inicio=None, fecha_fin=None, estado=None, termino=None):
+        """Devuelve ``(numero_de_ventas, monto_total)`` del rango sin cargar las ventas"""
+        where, params = cls._filtros(fecha_inicio, fecha_fin, estado, termino)
+        filas = db.execute_query(
+            f"SELECT COUNT(*) AS cantidad, COALESCE(SUM(total), 0) AS monto FROM ventas WHERE {where}",
+            tuple(params)
+        )
+        if not filas:
+            return 0, 0.0
+        return filas[0]['cantidad'], float(filas[0]['monto'])
+
+    @classmethod
+    def _repartir_items(cls, ventas, items_data):
+        """Agrupa filas de ``venta_items`` por venta y las asigna en memoria"""
+        por_venta = {}
+        for row in items_data:
+            por_venta.setdefault(row['venta_id'], []).append(cls._item_desde_fila(row))
+        for venta in ventas:
+            venta._asignar_items(por_venta.get(venta.id, []))
+
+    @classmethod
+    def cargar_items_de(cls, ventas):
+        """Carga en lote los ítems de las ventas que aún no los tienen"""
+        pendientes = [venta for venta in ventas if not venta.items_cargados]
+        por_lote = db.max_variables()
+        for inicio in range(0, len(pendientes), por_lote):
+            lote = pendientes[inicio:inicio + por_lote]
+            marcadores = ", ".join("?" * len(lote))
+            items_data = db.execute_query(
+                f"SELECT * FROM venta_items WHERE venta_id IN ({marcadores}) ORDER BY venta_id, id",
+                tuple(venta.id for venta in lote)
+            ) or []
+            cls._repartir_items(lote, items_data)
+        return ventas
+
+    def cargar_items(self):
+        """Carga los ítems de esta venta si se obtuvo solo la cabecera"""
+        if not self.items_cargados:
+            self.cargar_items_de([self])
+        return self.items
     
     @classmethod
     def cancelar_venta(cls, venta_id: int, motivo: str = ""):
         """Cancela una venta y devuelve el stock a inventario"""
-        # Obtener la venta
-        venta = cls.obtener_por_id(venta_id)
-        if not venta:
-            return False
-            
-        # Devolver el stock de cada ítem
-        for item in venta.items:
-            db.execute_query(
-                "UPDATE productos SET cantidad = cantidad + ? WHERE id = ?",
-                (item.cantidad, item.producto_id)
+        with db.transaction():
+            # Obtener la venta
+            venta = cls.obtener_por_id(venta_id)
+            if not venta or venta.estado == 'cancelada':
+                return False
+                
+            # Devolver el stock de todos los ítems
+            Producto.aplicar_deltas_stock(
+                [(item.producto_id, item.cantidad) for item in venta.items],
+                f"Cancelación de la venta {venta.codigo_venta}"
             )
-        
-        # Actualizar estado de la venta
-        notas = f"VENTA CANCELADA. {venta.notas or ''} {motivo}".strip()
-        db.execute_query(
-            "UPDATE ventas SET estado = 'cancelada', notas = ? WHERE id = ?",
-            (notas, venta_id)
-        )
+            
+            # Sacarla de los acumulados diarios mientras sigue completada
+            Reporte.aplicar_venta(venta_id, -1)
+            
+            # Actualizar estado de la venta
+            notas = f"VENTA CANCELADA. {venta.notas or ''} {motivo}".strip()
+            db.consultar('ventas.cancelar', (notas, venta_id))
+            eventos.publicar(eventos.VENTA, eventos.ACTUALIZADO, [venta_id])
         
         return True
@@ -0,0 +1,17 @@
+"""Base de datos temporal para las herramientas de medición y auditoría.
+
+Al importarse fija ``INVENTARIO_DB`` en un directorio temporal, de modo que la
+instancia global ``db`` nunca abre inventario.db. Debe importarse antes que
+cualquier módulo que importe ``src.database``::
+
+    from src.tools import _bd_temporal  # noqa: F401  (antes que los modelos)
+
+El directorio se borra al terminar el proceso.
+"""
+import os
+import tempfile
+from pathlib import Path
+
+_TMP = tempfile.TemporaryDirectory()
+RUTA = str(Path(_TMP.name) / "benchmark.db")
+os.environ["INVENTARIO_DB"] = RUTA
@@ -0,0 +1,293 @@
+import argparse
+import re
+import sys
+from datetime import date, datetime
+
+# Debe ir antes que los modelos: fija INVENTARIO_DB en un directorio temporal
+from src.tools import _bd_temporal  # noqa: F401
+
+from src import consultas
+from src.database import db
+from src.models.analisis import Analisis
+from src.models.categoria import Categoria
+from src.models.movimiento import Movimiento
+from src.models.producto import Producto
+from src.models.reporte import Reporte, MES
+from src.models.venta import Venta
+
+# Recorridos completos que son intencionales: consulta → {detalle del plan: motivo}.
+# Cualquier otro SCAN o B-tree temporal cuenta como regresión.
+PERMITIDOS = {
+    'esquema.existe_tabla': {
+        'SCAN sqlite_master': "catálogo del esquema, solo al preparar la base de datos",
+    },
+    'categorias.todas': {
+        'SCAN categorias USING INDEX sqlite_autoindex_categorias_1': "lista todas las categorías en orden",
+    },
+    'categorias.buscar_por_nombre': {
+        'SCAN categorias USING INDEX sqlite_autoindex_categorias_1': "LIKE con comodín inicial",
+    },
+    'categorias.con_totales_resumen': {
+        'SCAN c USING INDEX sqlite_autoindex_categorias_1': "lista todas las categorías en orden",
+    },
+    'categorias.con_totales_agregado': {
+        'SCAN c': "camino sin categorias_resumen; agrupa todas las categorías",
+        'USE TEMP B-TREE FOR ORDER BY': "ordena las categorías agrupadas por id",
+    },
+    'productos.todos': {
+        'SCAN p USING INDEX idx_productos_nombre': "lista todo el catálogo en orden",
+    },
+    'productos.resumen': {
+        'SCAN p': "totales de todo el catálogo",
+    },
+    'productos.buscar_fts': {
+        'USE TEMP B-TREE FOR ORDER BY': "orden por relevancia de las coincidencias",
+    },
+    'productos.buscar_like': {
+        'SCAN p USING INDEX idx_productos_nombre': "términos cortos o sin FTS5: LIKE con comodín inicial",
+    },
+    'productos.resumen_like': {
+        'SCAN p': "términos cortos o sin FTS5: LIKE con comodín inicial",
+    },
+    'movimientos.stock_en_fecha_todos': {
+        'SCAN p': "valoración de todo el catálogo (una búsqueda por producto)",
+    },
+    'reportes.sumar_venta_productos': {
+        'USE TEMP B-TREE FOR GROUP BY': "agrupa los ítems de una sola venta",
+    },
+    'reportes.sumar_venta_categorias': {
+        'USE TEMP B-TREE FOR GROUP BY': "agrupa los ítems de una sola venta",
+    },
+    'reportes.sumar_venta_productos_mes': {
+        'USE TEMP B-TREE FOR GROUP BY': "agrupa los ítems de una sola venta",
+    },
+    'reportes.por_mes': {
+        'USE TEMP B-TREE FOR GROUP BY': "agrupa por mes los días del rango",
+    },
+    'reportes.por_anio': {
+        'USE TEMP B-TREE FOR GROUP BY': "agrupa por año los días del rango",
+    },
+    'reportes.productos': {
+        'USE TEMP B-TREE FOR GROUP BY': "agrupa por producto los acumulados del rango",
+        'USE TEMP B-TREE FOR ORDER BY': "orden por ingresos",
+    },
+    'reportes.categorias': {
+        'USE TEMP B-TREE FOR GROUP BY': "agrupa por categoría los acumulados del rango",
+        'USE TEMP B-TREE FOR ORDER BY': "orden por ingresos",
+    },
+    'analisis.productos': {
+        'SCAN periodo': "filas del rango ya leídas por clave primaria",
+        'SCAN r': "productos vendidos en el rango",
+        'USE TEMP B-TREE FOR GROUP BY': "agrupa los acumulados del rango por producto",
+        'USE TEMP B-TREE FOR ORDER BY': "puestos y orden por ingresos/unidades",
+    },
+    'Producto.buscar': {
+        'USE TEMP B-TREE FOR ORDER BY': "orden por relevancia de las coincidencias",
+    },
+    'Venta.guardar': {
+        'SCAN d': "lista VALUES con los cambios de stock de la venta",
+    },
+    'Venta.cancelar_venta': {
+        'SCAN d': "lista VALUES con los cambios de stock de la venta",
+    },
+    'Reporte.reconstruir': {
+        '*': "reconstrucción completa, se ejecuta a mano",
+    },
+    'Categoria.reconstruir_resumen': {
+        '*': "reconstrucción completa, se ejecuta a mano",
+    },
+}
+
+
+# Sentencias del recorrido que no son consultas de los modelos (los triggers
+# aparecen en la traza como comentarios "-- TRIGGER nombre")
+IGNORAR = re.compile(r"^\s*(--|(PRAGMA|BEGIN|COMMIT|ROLLBACK|SAVEPOINT|RELEASE|EXPLAIN)\b)", re.IGNORECASE)
+
+# Literales y parámetros, para reconocer en el recorrido las consultas registradas
+_LITERALES = re.compile(r"'(?:[^']|'')*'|-?\b\d+(?:\.\d+)?\b|\?|\bNULL\b", re.IGNORECASE)
+
+
+def normalizar(sql):
+    return " ".join(_LITERALES.sub("?", sql).split())
+
+
+def es_problema(detalle):
+    """Recorrido completo de una tabla o índice, u ordenamiento en un B-tree temporal.
+
+    Las listas VALUES ("CONSTANT ROWS") y las tablas virtuales (FTS5, que
+    resuelve MATCH con su propio índice) no cuentan como recorridos, ni las
+    subconsultas que SQLite ya materializó.
+    """
+    if "CONSTANT ROW" in detalle or "VIRTUAL TABLE" in detalle:
+        return False
+    # Resultados intermedios de la propia consulta (subconsultas ya filtradas)
+    if detalle.startswith("SCAN (subquery-"):
+        return False
+    return detalle.startswith("SCAN ") or "USE TEMP B-TREE" in detalle
+
+
+def permitido(nombre, detalle):
+    """Si ``detalle`` figura en PERMITIDOS para la consulta (``*`` al final = prefijo)"""
+    for patron in PERMITIDOS.get(nombre.split('#')[0], {}):
+        if patron.endswith('*') and detalle.startswith(patron[:-1]) or detalle == patron:
+            return True
+    return False
+
+
+def plan(connection, sql, params=()):
+    """Filas ``detalle`` de EXPLAIN QUERY PLAN, con sangría según el árbol"""
+    filas = connection.execute("EXPLAIN QUERY PLAN " + sql, params).fetchall()
+    profundidad = {0: -1}
+    lineas = []
+    for fila in filas:
+        nodo, padre, detalle = fila[0], fila[1], fila[3]
+        profundidad[nodo] = profundidad.get(padre, -1) + 1
+        lineas.append((profundidad[nodo], detalle))
+    return lineas
+
+
+def recorrido():
+    """Ejecuta los caminos de lectura y escritura de los modelos sobre datos de ejemplo.
+
+    Devuelve ``[(paso, sql)]`` con cada sentencia que emitieron, en orden.
+    """
+    sentencias = []
+    paso_actual = ["preparación"]
+
+    def anotar(sql):
+        if not IGNORAR.match(sql):
+            sentencias.append((paso_actual[0], sql))
+
+    def paso(nombre, funcion, *args, **kwargs):
+        paso_actual[0] = nombre
+        funcion(*args, **kwargs)
+
+    hoy = date.today()
+    # Todas las consultas del hilo usan esta conexión mientras está prestada
+    with db.connection() as connection:
+        connection.set_trace_callback(anotar)
+        try:
+            categoria = Categoria(nombre="Auditoría")
+            paso("Categoria.guardar", categoria.guardar)
+            producto = Producto("AUD-1", "Producto auditoría", 10.0, 5, categoria_id=categoria.id)
+            paso("Producto.guardar", producto.guardar)
+            otro = Producto("AUD-2", "Otro producto", 3.0, 8)
+            paso("Producto.guardar", otro.guardar)
+            venta = Venta(fecha_venta=datetime.now())
+            venta.agregar_item(producto.id, 2, 10.0)
+            venta.agregar_item(otro.id, 1, 3.0)
+            paso("Venta.guardar", venta.guardar)
+            paso("Venta.guardar (edición)", venta.guardar)
+            paso("Venta.cancelar_venta", Venta.cancelar_venta, venta.id, "auditoría")
+            paso("Producto.actualizar", producto.actualizar)
+            paso("Producto.actualizar_cantidad", producto.actualizar_cantidad, 9, "auditoría")
+
+            paso("Producto.obtener_todos", Producto.obtener_todos)
+            paso("Producto.obtener_todos (categoría)", Producto.obtener_todos, categoria.id)
+            paso("Producto.obtener_por_ids", Producto.obtener_por_ids, [producto.id, otro.id])
+            Producto.cache.invalidar()
+            paso("Producto.obtener_por_codigos", Producto.obtener_por_codigos, ["AUD-1", "AUD-2"])
+            paso("Producto.buscar", Producto.buscar, "aud")
+            paso("Producto.resumen_inventario", Producto.resumen_inventario, categoria.id, "aud")
+            paso("Categoria.obtener_todas", Categoria.obtener_todas)
+
+            paso("Venta.obtener_todas", Venta.obtener_todas, hoy, hoy, "completada")
+            paso("Venta.obtener_pagina", Venta.obtener_pagina, hoy, hoy, "completada",
+                 cursor=(datetime.now().strftime("%Y-%m-%d %H:%M:%S"), venta.id), con_resumen=True)
+            paso("Venta.obtener_pagina (búsqueda)", Venta.obtener_pagina, hoy, hoy,
+                 con_items=False, con_resumen=True, termino="aud")
+            paso("Venta.totales", Venta.totales, hoy, hoy, "completada")
+            paso("Venta.totales (búsqueda)", Venta.totales, hoy, hoy, termino="aud")
+            paso("Venta.obtener_por_id", Venta.obtener_por_id, venta.id)
+
+            paso("Reporte.por_periodo", Reporte.por_periodo, MES, hoy, hoy)
+            paso("Reporte.productos_mas_vendidos", Reporte.productos_mas_vendidos, hoy, hoy)
+            paso("Reporte.por_categoria", Reporte.por_categoria, hoy, hoy)
+            paso("Analisis.productos", Analisis.productos, hoy, hoy)
+            paso("Movimiento.stock_en_fecha", Movimiento.stock_en_fecha, producto.id, hoy)
+            paso("Movimiento.valoracion_en_fecha", Movimiento.valoracion_en_fecha, hoy)
+            paso("Movimiento.historial", Movimiento.historial, producto.id, hoy, hoy)
+
+            # Borrados: SQLite revisa las claves foráneas que apuntan a la fila
+            sin_ventas = Producto("AUD-3", "Producto sin ventas", 1.0, 2, categoria_id=categoria.id)
+            sin_ventas.guardar()
+            paso("Producto.eliminar", sin_ventas.eliminar)
+            try:
+                paso("Producto.eliminar (con ventas)", producto.eliminar)
+            except ValueError:
+                pass
+            vacia = Categoria(nombre="Auditoría vacía")
+            vacia.guardar()
+            paso("Categoria.eliminar", vacia.eliminar)
+
+            paso("Reporte.reconstruir", Reporte.reconstruir)
+            paso("Categoria.reconstruir_resumen", Categoria.reconstruir_resumen)
+        finally:
+            connection.set_trace_callback(None)
+    return sentencias
+
+
+def auditar():
+    """Devuelve ``[(nombre, sql, plan, problemas)]`` de cada consulta distinta"""
+    db.preparar_esquema()
+    resultados = []
+    vistas = set()
+    with db.connection() as connection:
+        for consulta in consultas.CONSULTAS.values():
+            params = (None,) * consultas._num_parametros(consulta.sql)
+            lineas = plan(connection, consulta.sql, params)
+            resultados.append((consulta.nombre, consulta.sql, lineas))
+            vistas.add(normalizar(consulta.sql))
+
+    # Sentencias armadas en los modelos (listas IN, filtros opcionales, lotes)
+    por_paso = {}
+    for paso, sql in recorrido():
+        clave = normalizar(sql)
+        if clave in vistas:
+            continue
+        vistas.add(clave)
+        por_paso[paso] = por_paso.get(paso, 0) + 1
+        nombre = paso if por_paso[paso] == 1 else f"{paso}#{por_paso[paso]}"
+        with db.connection() as connection:
+            resultados.append((nombre, sql, plan(connection, sql)))
+
+    return [
+        (nombre, sql, lineas, [
+            detalle for _, detalle in lineas
+            if es_problema(detalle) and not permitido(nombre, detalle)
+        ])
+        for nombre, sql, lineas in resultados
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Revisa con EXPLAIN QUERY PLAN las consultas de los modelos y marca "
+                    "los recorridos completos y los ordenamientos en B-trees temporales."
+    )
+    parser.add_argument("-v", "--todas", action="store_true", help="muestra el plan de todas las consultas")
+    parser.add_argument("--sql", action="store_true", help="muestra también el SQL de las consultas marcadas")
+    parser.add_argument("--estricto", action="store_true",
+                        help="termina con código 1 si alguna consulta tiene recorridos no permitidos")
+    args = parser.parse_args()
+
+    resultados = auditar()
+    marcadas = [r for r in resultados if r[3]]
+    for nombre, sql, lineas, problemas in resultados:
+        if not problemas and not args.todas:
+            continue
+        print(f"{'✗' if problemas else '✓'} {nombre}")
+        for nivel, detalle in lineas:
+            marca = "  <-- " if detalle in problemas else ""
+            print(f"    {'  ' * nivel}{detalle}{marca}")
+        if problemas and args.sql:
+            print("    " + " ".join(sql.split()))
+    print(f"\n{len(resultados)} consultas revisadas, {len(marcadas)} con recorridos o "
+          f"ordenamientos no permitidos")
+    db.close()
+    if args.estricto and marcadas:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+import argparse
+import time
+
+# Debe ir antes que los modelos: fija INVENTARIO_DB en un directorio temporal
+from src.tools import _bd_temporal  # noqa: F401
+
+from src.database import db
+from src.models.analisis import Analisis
+from src.models.reporte import Reporte
+
+# Lo mismo que Analisis.productos pero recorriendo venta_items (referencia)
+PRODUCTOS_ESCANEO = """
+SELECT vi.producto_id, SUM(vi.cantidad) AS unidades, SUM(vi.subtotal) AS ingresos,
+       RANK() OVER (ORDER BY SUM(vi.subtotal) DESC) AS puesto_ingresos
+FROM venta_items vi
+JOIN ventas v ON v.id = vi.venta_id
+WHERE v.estado = 'completada' AND date(v.fecha_venta) BETWEEN ? AND ?
+GROUP BY vi.producto_id
+"""
+
+SECUENCIA = "WITH RECURSIVE s(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM s WHERE i < ?) "
+
+
+def preparar_ventas(ventas: int, items_por_venta: int, productos: int, dias: int) -> None:
+    """Genera las ventas con SQL (una de cada 20 cancelada).
+
+    Los productos se eligen con una distribución sesgada para que unos pocos
+    concentren la mayoría de las ventas, como en un catálogo real.
+    """
+    db.preparar_esquema()
+    with db.transaction() as con:
+        con.execute(
+            SECUENCIA + "INSERT INTO productos (codigo, nombre, descripcion, precio, cantidad) "
+            "SELECT printf('P%06d', i), 'Producto ' || i, '', 1 + i % 50, 0 FROM s",
+            (productos,),
+        )
+        con.execute(
+            SECUENCIA + "INSERT INTO ventas (id, codigo_venta, fecha_venta, total, estado) "
+            "SELECT i, 'V' || i, datetime('2020-01-01', '+' || (abs(random()) % ?) || ' minutes'), 0, "
+            "CASE WHEN i % 20 = 0 THEN 'cancelada' ELSE 'completada' END FROM s",
+            (ventas, dias * 24 * 60),
+        )
+        con.execute(
+            "WITH RECURSIVE k(j) AS (SELECT 1 UNION ALL SELECT j + 1 FROM k WHERE j < ?), "
+            "r AS (SELECT v.id AS venta_id, (abs(random()) % 1000000) / 1000000.0 AS x, "
+            "1 + abs(random()) % 5 AS c FROM ventas v, k) "
+            "INSERT INTO venta_items (venta_id, producto_id, cantidad, precio_unitario, subtotal) "
+            "SELECT venta_id, 1 + CAST(? * x * x * x AS INTEGER), c, 2.0, c * 2.0 FROM r",
+            (items_por_venta, productos),
+        )
+        con.execute(
+            "UPDATE ventas SET total = t.total FROM "
+            "(SELECT venta_id, SUM(subtotal) AS total FROM venta_items GROUP BY venta_id) t "
+            "WHERE t.venta_id = ventas.id"
+        )
+    Reporte.reconstruir()
+
+
+def medir(funcion, repeticiones: int):
+    mejor = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        filas = funcion()
+        duracion = time.perf_counter() - inicio
+        mejor = duracion if mejor is None else min(mejor, duracion)
+    return len(filas), mejor
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Mide el análisis de productos más vendidos y ABC sobre muchas líneas de venta."
+    )
+    parser.add_argument("--ventas", type=int, default=250_000,
+                        help="ventas a generar (2.500.000 con 4 ítems = 10M líneas)")
+    parser.add_argument("--items", type=int, default=4, help="ítems por venta")
+    parser.add_argument("--productos", type=int, default=5_000)
+    parser.add_argument("--dias", type=int, default=3 * 365)
+    parser.add_argument("-r", "--repeticiones", type=int, default=3)
+    parser.add_argument("--sin-escaneo", action="store_true",
+                        help="no medir la consulta de referencia sobre venta_items")
+    args = parser.parse_args()
+
+    print(f"Generando {args.ventas * args.items:,} líneas de venta...")
+    inicio = time.perf_counter()
+    preparar_ventas(args.ventas, args.items, args.productos, args.dias)
+    print(f"Datos listos en {time.perf_counter() - inicio:.1f} s")
+
+    rangos = (
+        ("todo", None, None),
+        ("rango parcial", "2020-03-15", "2022-07-09"),
+        ("un mes", "2021-02-01", "2021-02-28"),
+    )
+
+    def sin_cache(desde, hasta):
+        Analisis.limpiar_cache()
+        return Analisis.productos(desde, hasta)
+
+    for etiqueta, desde, hasta in rangos:
+        filas, segundos = medir(lambda: sin_cache(desde, hasta), args.repeticiones)
+        print(f"{etiqueta:<14} acumulados     {segundos * 1000:9.1f} ms  ({filas} productos)")
+        filas, segundos = medir(lambda: Analisis.productos(desde, hasta), args.repeticiones)
+        print(f"{etiqueta:<14} en caché       {segundos * 1000:9.3f} ms")
+        if not args.sin_escaneo:
+            filas, segundos = medir(
+                lambda: db.execute_query(PRODUCTOS_ESCANEO, (desde or "0000-01-01", hasta or "9999-12-31")), 1
+            )
+            print(f"{etiqueta:<14} venta_items    {segundos * 1000:9.1f} ms")
+
+    resumen = Analisis.resumen_abc()
+    for clase, (productos, ingresos) in resumen.items():
+        print(f"Clase {clase}: {productos} productos, ${ingresos:,.2f}")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
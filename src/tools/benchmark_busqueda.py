@@ -0,0 +1,77 @@
+import argparse
+import random
+import time
+
+# Debe ir antes que los modelos: fija INVENTARIO_DB en un directorio temporal
+from src.tools import _bd_temporal  # noqa: F401
+
+from src.database import db
+from src.models.producto import Producto
+
+PALABRAS = [
+    "arroz", "azucar", "cafe", "leche", "aceite", "harina", "galletas", "jabon",
+    "detergente", "atun", "sardina", "fideos", "avena", "cereal", "mantequilla",
+    "queso", "yogur", "jugo", "agua", "gaseosa", "chocolate", "sal", "pimienta",
+]
+
+
+def preparar_productos(cantidad: int) -> None:
+    db.preparar_esquema()
+    rnd = random.Random(42)
+    with db.transaction() as con:
+        con.executemany(
+            "INSERT INTO productos (codigo, nombre, precio, cantidad) VALUES (?, ?, ?, ?)",
+            (
+                (
+                    f"{7500000000000 + i}",
+                    f"{rnd.choice(PALABRAS).capitalize()} {rnd.choice(PALABRAS)} {i}",
+                    1.0 + i % 100,
+                    i % 50,
+                )
+                for i in range(cantidad)
+            ),
+        )
+
+
+def buscar_like(termino: str, limite: int):
+    like = f"%{termino}%"
+    return db.execute_query(
+        "SELECT p.*, c.nombre as categoria_nombre FROM productos p "
+        "LEFT JOIN categorias c ON p.categoria_id = c.id "
+        "WHERE p.nombre LIKE ? OR p.codigo LIKE ? ORDER BY p.nombre LIMIT ?",
+        (like, like, limite),
+    )
+
+
+def medir(funcion, terminos, repeticiones: int) -> float:
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        for termino in terminos:
+            funcion(termino)
+    return (time.perf_counter() - inicio) * 1000 / (repeticiones * len(terminos))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Mide la latencia de Producto.buscar (FTS5) frente a LIKE."
+    )
+    parser.add_argument("--productos", type=int, default=500_000)
+    parser.add_argument("--limite", type=int, default=50, help="Resultados por búsqueda")
+    parser.add_argument("-r", "--repeticiones", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"Generando {args.productos:,} productos...")
+    preparar_productos(args.productos)
+
+    # Búsquedas típicas de un cajero: prefijos cortos, palabras completas y códigos
+    terminos = ["ca", "arroz", "leche ent", "choco 12", "7500000012", "7500000499999"]
+
+    fts = medir(lambda t: Producto.buscar(t, limite=args.limite), terminos, args.repeticiones)
+    like = medir(lambda t: buscar_like(t, args.limite), terminos, args.repeticiones)
+    print(f"{'FTS5':<6} {fts:8.2f} ms/búsqueda")
+    print(f"{'LIKE':<6} {like:8.2f} ms/búsqueda")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
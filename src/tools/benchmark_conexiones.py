@@ -0,0 +1,82 @@
+import argparse
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from src.database import Database
+
+
+def execute_query_sin_pool(db_path: str, query: str, params=()):
+    """Reproduce la ruta anterior: abrir, configurar y cerrar una conexión por consulta."""
+    con = sqlite3.connect(db_path)
+    con.row_factory = sqlite3.Row
+    try:
+        con.execute("PRAGMA foreign_keys = ON;")
+        cur = con.execute(query, params)
+        if query.strip().upper().startswith(("SELECT", "PRAGMA")):
+            return cur.fetchall()
+        con.commit()
+        return cur.lastrowid
+    finally:
+        con.close()
+
+
+def preparar_datos(db: Database, productos: int) -> None:
+    db.preparar_esquema()
+    with db.transaction() as con:
+        con.executemany(
+            "INSERT INTO productos (codigo, nombre, precio, cantidad) VALUES (?, ?, ?, ?)",
+            ((f"P{i:06d}", f"Producto {i}", 10.0 + i % 100, 100) for i in range(productos)),
+        )
+
+
+def medir(nombre: str, funcion, repeticiones: int) -> float:
+    inicio = time.perf_counter()
+    for i in range(repeticiones):
+        funcion(i)
+    duracion = time.perf_counter() - inicio
+    qps = repeticiones / duracion if duracion else float("inf")
+    print(f"  {nombre:<28} {repeticiones:>8} consultas  {duracion:8.3f} s  {qps:12,.0f} consultas/s")
+    return qps
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compara consultas por segundo con y sin el pool de conexiones."
+    )
+    parser.add_argument("-n", "--consultas", type=int, default=5000, help="Consultas por escenario")
+    parser.add_argument("--productos", type=int, default=1000, help="Productos de prueba")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = str(Path(tmp) / "benchmark.db")
+        db = Database(db_path)
+        preparar_datos(db, args.productos)
+
+        lectura = "SELECT * FROM productos WHERE id = ?"
+        escritura = "INSERT INTO movimientos (producto_id, tipo, cantidad, notas) VALUES (?, 'entrada', 1, '')"
+
+        print("Lecturas por clave primaria")
+        antes = medir("conexión por consulta",
+                      lambda i: execute_query_sin_pool(db_path, lectura, (i % args.productos + 1,)),
+                      args.consultas)
+        despues = medir("pool de conexiones",
+                        lambda i: db.execute_query(lectura, (i % args.productos + 1,)),
+                        args.consultas)
+        print(f"  Mejora: x{despues / antes:.1f}")
+
+        print("Escrituras con commit")
+        antes = medir("conexión por consulta",
+                      lambda i: execute_query_sin_pool(db_path, escritura, (i % args.productos + 1,)),
+                      args.consultas)
+        despues = medir("pool de conexiones",
+                        lambda i: db.execute_query(escritura, (i % args.productos + 1,)),
+                        args.consultas)
+        print(f"  Mejora: x{despues / antes:.1f}")
+
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import argparse
+import time
+
+# Debe ir antes que los modelos: fija INVENTARIO_DB en un directorio temporal
+from src.tools import _bd_temporal  # noqa: F401
+
+from src.database import db
+from src.models.producto import Producto
+
+COLUMNAS_TABLA = ('id', 'codigo', 'nombre', 'categoria_nombre', 'precio', 'cantidad')
+
+
+def preparar_productos(cantidad: int) -> None:
+    db.preparar_esquema()
+    with db.transaction() as con:
+        categoria_id = con.execute("INSERT INTO categorias (nombre) VALUES ('General')").lastrowid
+        con.executemany(
+            "INSERT INTO productos (codigo, nombre, descripcion, precio, cantidad, categoria_id) "
+            "VALUES (?, ?, '', ?, ?, ?)",
+            ((f"P{i:08d}", f"Producto {i}", 1.0 + i % 100, i % 50, categoria_id) for i in range(cantidad)),
+        )
+
+
+def por_diccionario():
+    """Camino anterior: dict(row) y crear_desde_fila por cada fila"""
+    return [Producto.crear_desde_fila(dict(row)) for row in db.consultar('productos.todos')]
+
+
+def por_posiciones():
+    return Producto.obtener_todos()
+
+
+def tuplas():
+    return Producto.obtener_todos(columnas=COLUMNAS_TABLA)
+
+
+def medir(funcion, repeticiones: int):
+    mejor = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        filas = funcion()
+        duracion = time.perf_counter() - inicio
+        mejor = duracion if mejor is None else min(mejor, duracion)
+    return len(filas), mejor
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Mide cuántas filas por segundo se convierten en productos con cada método."
+    )
+    parser.add_argument("--productos", type=int, default=200_000)
+    parser.add_argument("-r", "--repeticiones", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"Generando {args.productos:,} productos...")
+    preparar_productos(args.productos)
+
+    for nombre, funcion in (
+        ("dict + crear_desde_fila", por_diccionario),
+        ("posiciones (objetos)", por_posiciones),
+        ("tuplas (sin objetos)", tuplas),
+    ):
+        filas, segundos = medir(funcion, args.repeticiones)
+        print(f"{nombre:<24} {segundos * 1000:9.1f} ms  {filas / segundos:12,.0f} filas/s")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
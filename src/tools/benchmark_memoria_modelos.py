@@ -0,0 +1,101 @@
+import argparse
+import gc
+import time
+import tracemalloc
+from datetime import datetime
+
+# Debe ir antes que los modelos: fija INVENTARIO_DB en un directorio temporal
+from src.tools import _bd_temporal  # noqa: F401
+
+from src.models.categoria import Categoria
+from src.models.producto import Producto
+from src.models.venta import Venta, VentaItem
+
+FECHA = datetime(2024, 1, 1, 12, 0, 0)
+
+
+class ConDict:
+    """Objeto con __dict__, como eran los modelos antes de usar __slots__"""
+
+    def __init__(self, **valores):
+        self.__dict__.update(valores)
+
+
+def crear_producto(i):
+    return Producto(f"P{i:07d}", f"Producto {i}", 1.0 + i % 100, i % 50, "", i % 20,
+                    i, "2024-01-01 12:00:00", "Categoría")
+
+
+def crear_producto_dict(i):
+    return ConDict(id=i, codigo=f"P{i:07d}", nombre=f"Producto {i}", descripcion="",
+                   precio=1.0 + i % 100, cantidad=i % 50, categoria_id=i % 20,
+                   fecha_creacion="2024-01-01 12:00:00", categoria_nombre="Categoría")
+
+
+def crear_categoria(i):
+    return Categoria(f"Categoría {i}", "", i, "2024-01-01 12:00:00")
+
+
+def crear_categoria_dict(i):
+    return ConDict(id=i, nombre=f"Categoría {i}", descripcion="", fecha_creacion="2024-01-01 12:00:00")
+
+
+def crear_venta(i):
+    return Venta(id=i, codigo_venta=f"V-{i:08d}", fecha_venta=FECHA, total=10.0, items_cargados=False)
+
+
+def crear_venta_dict(i):
+    return ConDict(id=i, codigo_venta=f"V-{i:08d}", fecha_venta=FECHA, total=10.0, estado="completada",
+                   notas="", items=[], created_at=None, updated_at=None, items_cargados=False,
+                   resumen_items=None)
+
+
+def crear_item(i):
+    return VentaItem(id=i, venta_id=i // 5, producto_id=i % 1000, cantidad=1, precio_unitario=2.0, subtotal=2.0)
+
+
+def crear_item_dict(i):
+    return ConDict(id=i, venta_id=i // 5, producto_id=i % 1000, cantidad=1, precio_unitario=2.0,
+                   subtotal=2.0, created_at=None)
+
+
+MODELOS = [
+    ("Producto", crear_producto, crear_producto_dict),
+    ("Categoria", crear_categoria, crear_categoria_dict),
+    ("Venta", crear_venta, crear_venta_dict),
+    ("VentaItem", crear_item, crear_item_dict),
+]
+
+
+def medir(fabrica, cantidad):
+    """Bytes por objeto y segundos para crear ``cantidad`` objetos"""
+    gc.collect()
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    inicio = time.perf_counter()
+    objetos = [fabrica(i) for i in range(cantidad)]
+    duracion = time.perf_counter() - inicio
+    despues = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objetos
+    return (despues - antes) / cantidad, duracion
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Mide la memoria por objeto de los modelos con __slots__ frente a objetos con __dict__."
+    )
+    parser.add_argument("--cantidades", type=int, nargs="+", default=[100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(f"{'modelo':<10} {'objetos':>10} {'slots B/obj':>12} {'dict B/obj':>11} {'ahorro':>7} {'slots s':>8} {'dict s':>7}")
+    for cantidad in args.cantidades:
+        for nombre, con_slots, con_dict in MODELOS:
+            bytes_slots, t_slots = medir(con_slots, cantidad)
+            bytes_dict, t_dict = medir(con_dict, cantidad)
+            ahorro = 1 - bytes_slots / bytes_dict
+            print(f"{nombre:<10} {cantidad:>10,} {bytes_slots:>12.0f} {bytes_dict:>11.0f} {ahorro:>6.0%} {t_slots:>8.2f} {t_dict:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
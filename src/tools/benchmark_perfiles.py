@@ -0,0 +1,75 @@
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+# Debe ir antes que los modelos: fija INVENTARIO_DB en un directorio temporal
+from src.tools import _bd_temporal  # noqa: F401
+
+from src.database import Database, PERFILES
+from src.models.venta import ITEM_COLUMNAS
+
+
+def preparar_productos(db: Database, productos: int) -> None:
+    db.preparar_esquema()
+    with db.transaction() as con:
+        con.executemany(
+            "INSERT INTO productos (codigo, nombre, precio, cantidad) VALUES (?, ?, ?, ?)",
+            ((f"P{i:07d}", f"Producto {i}", 1.0 + i % 100, 1_000_000) for i in range(productos)),
+        )
+
+
+def guardar_venta(db: Database, numero: int, productos: int, lineas: int) -> None:
+    """Misma secuencia de sentencias que Venta.guardar: cabecera, ítems y stock"""
+    ids = [(numero * lineas + j) % productos + 1 for j in range(lineas)]
+    with db.transaction() as con:
+        venta_id = con.execute(
+            "INSERT INTO ventas (codigo_venta, fecha_venta, total, estado, notas) VALUES (?, datetime('now'), ?, 'completada', '')",
+            (f"B{numero:08d}", 10.0 * lineas),
+        ).lastrowid
+        db.insert_many("venta_items", ITEM_COLUMNAS, [(venta_id, pid, 1, 10.0, 10.0) for pid in ids])
+        con.executemany("UPDATE productos SET cantidad = cantidad - 1 WHERE id = ?", [(pid,) for pid in ids])
+
+
+def escanear_productos(db: Database) -> None:
+    """Lectura completa como la de ProductosView"""
+    db.execute_query(
+        "SELECT p.*, c.nombre as categoria_nombre FROM productos p "
+        "LEFT JOIN categorias c ON p.categoria_id = c.id ORDER BY p.nombre"
+    )
+
+
+def medir(funcion, repeticiones: int) -> float:
+    inicio = time.perf_counter()
+    for i in range(repeticiones):
+        funcion(i)
+    duracion = time.perf_counter() - inicio
+    return repeticiones / duracion if duracion else float("inf")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compara el rendimiento de los perfiles de SQLite (ventas/s y lecturas completas/s)."
+    )
+    parser.add_argument("--perfiles", nargs="+", choices=list(PERFILES), default=list(PERFILES))
+    parser.add_argument("--productos", type=int, default=20_000)
+    parser.add_argument("--ventas", type=int, default=500, help="Ventas a guardar por perfil")
+    parser.add_argument("--lineas", type=int, default=5, help="Líneas por venta")
+    parser.add_argument("--lecturas", type=int, default=20, help="Lecturas completas del catálogo")
+    args = parser.parse_args()
+
+    print(f"{'perfil':<12} {'ventas/s':>10} {'lecturas/s':>11}")
+    for perfil in args.perfiles:
+        # Directorio nuevo por perfil: el modo WAL queda guardado en el archivo
+        with tempfile.TemporaryDirectory() as tmp:
+            db = Database(str(Path(tmp) / "benchmark.db"), perfil=perfil)
+            preparar_productos(db, args.productos)
+
+            ventas = medir(lambda i: guardar_venta(db, i, args.productos, args.lineas), args.ventas)
+            lecturas = medir(lambda i: escanear_productos(db), args.lecturas)
+            print(f"{perfil:<12} {ventas:>10,.0f} {lecturas:>11,.1f}")
+            db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+def rss_mb():
+    """Memoria residente actual del proceso en MB (None si no se puede medir)"""
+    statm = Path("/proc/self/statm")
+    if statm.exists():
+        paginas = int(statm.read_text().split()[1])
+        return paginas * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process().memory_info().rss / (1024 * 1024)
+
+
+def medir_tamano(productos: int) -> None:
+    """Carga ProductosView con ``productos`` filas e imprime tiempo y memoria"""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    tmp = tempfile.TemporaryDirectory()
+    os.environ["INVENTARIO_DB"] = str(Path(tmp.name) / "benchmark.db")
+
+    from PyQt6.QtWidgets import QApplication
+    from src.database import db
+
+    db.preparar_esquema()
+    with db.transaction() as con:
+        con.executemany("INSERT INTO categorias (nombre) VALUES (?)", ((f"Categoría {i}",) for i in range(20)))
+        con.executemany(
+            "INSERT INTO productos (codigo, nombre, precio, cantidad, categoria_id) VALUES (?, ?, ?, ?, ?)",
+            ((f"P{i:07d}", f"Producto {i}", 1.0 + i % 500, i % 40, i % 20 + 1) for i in range(productos)),
+        )
+
+    app = QApplication(sys.argv)
+    from src.views.productos.productos_view import ProductosView
+    from src.views.components.busqueda_async import pool_busquedas
+
+    rss_antes = rss_mb()
+    inicio = time.perf_counter()
+    vista = ProductosView()
+    vista.resize(1200, 800)
+    vista.show()
+    # La primera carga corre en el hilo de trabajo: esperar a que llegue a la tabla
+    pool_busquedas().waitForDone()
+    app.processEvents()
+    duracion = time.perf_counter() - inicio
+    rss_despues = rss_mb()
+
+    delta = f"{rss_despues - rss_antes:10.1f}" if rss_antes is not None else f"{'n/d':>10}"
+    print(f"{productos:>9} {duracion * 1000:>12.1f} {delta}")
+    vista.close()
+    db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Mide tiempo de carga y memoria de ProductosView con catálogos grandes."
+    )
+    parser.add_argument("--productos", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--hijo", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.hijo is not None:
+        medir_tamano(args.hijo)
+        return
+
+    print(f"{'productos':>9} {'carga (ms)':>12} {'RSS (MB)':>10}")
+    for productos in args.productos:
+        # Un proceso por tamaño para que la memoria de una medición no contamine la siguiente
+        subprocess.run(
+            [sys.executable, "-m", "src.tools.benchmark_productos_view", "--hijo", str(productos)],
+            check=True,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import argparse
+import time
+from datetime import date, timedelta
+
+# Debe ir antes que los modelos: fija INVENTARIO_DB en un directorio temporal
+from src.tools import _bd_temporal  # noqa: F401
+
+from src.database import db
+from src.models.venta import Venta
+
+# Filtro anterior: DATE() sobre la columna impide usar el índice (referencia)
+FILTRO_DATE = "DATE(fecha_venta) >= ? AND DATE(fecha_venta) <= ? AND estado = ?"
+TOTALES_DATE = f"SELECT COUNT(*), COALESCE(SUM(total), 0) FROM ventas WHERE {FILTRO_DATE}"
+LISTADO_DATE = f"SELECT * FROM ventas WHERE {FILTRO_DATE} ORDER BY fecha_venta DESC"
+
+SECUENCIA = "WITH RECURSIVE s(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM s WHERE i < ?) "
+
+INICIO = date(2020, 1, 1)
+
+
+def preparar_ventas(ventas: int, dias: int) -> None:
+    """Genera las cabeceras de venta con SQL (una de cada 20 cancelada)"""
+    db.preparar_esquema()
+    with db.transaction() as con:
+        con.execute(
+            SECUENCIA + "INSERT INTO ventas (id, codigo_venta, fecha_venta, total, estado) "
+            "SELECT i, 'V' || i, datetime(?, '+' || (abs(random()) % ?) || ' seconds'), "
+            "1 + abs(random()) % 500, "
+            "CASE WHEN i % 20 = 0 THEN 'cancelada' ELSE 'completada' END FROM s",
+            (ventas, INICIO.isoformat(), dias * 24 * 60 * 60),
+        )
+
+
+def medir(funcion, repeticiones: int):
+    mejor = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        duracion = time.perf_counter() - inicio
+        mejor = duracion if mejor is None else min(mejor, duracion)
+    return resultado, mejor
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compara el filtro por rango de fechas de las ventas con DATE() y con "
+                    "límites semiabiertos sobre la columna indexada."
+    )
+    parser.add_argument("--ventas", type=int, default=1_000_000)
+    parser.add_argument("--dias", type=int, default=3 * 365)
+    parser.add_argument("-r", "--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"Generando {args.ventas:,} ventas...")
+    inicio = time.perf_counter()
+    preparar_ventas(args.ventas, args.dias)
+    print(f"Datos listos en {time.perf_counter() - inicio:.1f} s")
+
+    desde = INICIO + timedelta(days=args.dias // 2)
+    rangos = (
+        ("un día", desde, desde),
+        ("una semana", desde, desde + timedelta(days=6)),
+        ("un mes", desde, desde + timedelta(days=29)),
+    )
+    for etiqueta, fecha_inicio, fecha_fin in rangos:
+        params = (fecha_inicio.isoformat(), fecha_fin.isoformat(), "completada")
+
+        (anterior,), t_anterior = medir(lambda: db.execute_query(TOTALES_DATE, params), args.repeticiones)
+        actual, t_actual = medir(
+            lambda: Venta.totales(fecha_inicio, fecha_fin, "completada"), args.repeticiones
+        )
+        assert tuple(anterior) == tuple(actual), (tuple(anterior), actual)
+        print(f"{etiqueta:<11} totales  DATE() {t_anterior * 1000:8.1f} ms   "
+              f"rango {t_actual * 1000:8.2f} ms  ({actual[0]:,} ventas)")
+
+        filas, t_anterior = medir(lambda: db.execute_query(LISTADO_DATE, params), args.repeticiones)
+        ventas, t_actual = medir(
+            lambda: Venta.obtener_todas(fecha_inicio, fecha_fin, "completada", con_items=False),
+            args.repeticiones,
+        )
+        assert len(filas) == len(ventas)
+        print(f"{etiqueta:<11} listado  DATE() {t_anterior * 1000:8.1f} ms   "
+              f"rango {t_actual * 1000:8.2f} ms")
+
+        (pagina, _), t_actual = medir(
+            lambda: Venta.obtener_pagina(fecha_inicio, fecha_fin, "completada", con_items=False),
+            args.repeticiones,
+        )
+        print(f"{etiqueta:<11} página de {len(pagina)}           rango {t_actual * 1000:8.2f} ms")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+# Debe ir antes que los modelos: fija INVENTARIO_DB en un directorio temporal
+from src.tools import _bd_temporal  # noqa: F401
+
+from src.database import db
+from src.models.reporte import Reporte, MES, ANIO
+
+# Reporte mensual recorriendo las ventas (lo que evitan los acumulados)
+REPORTE_MENSUAL_ESCANEO = """
+SELECT strftime('%Y-%m', v.fecha_venta) AS periodo, COUNT(DISTINCT v.id),
+       SUM(vi.cantidad), SUM(vi.subtotal)
+FROM ventas v
+JOIN venta_items vi ON vi.venta_id = v.id
+WHERE v.estado = 'completada' AND date(v.fecha_venta) BETWEEN ? AND ?
+GROUP BY periodo
+ORDER BY periodo
+"""
+
+
+def preparar_ventas(ventas: int, items_por_venta: int, productos: int, dias: int) -> None:
+    db.preparar_esquema()
+    rnd = random.Random(42)
+    inicio = datetime(2020, 1, 1)
+    with db.transaction() as con:
+        con.executemany(
+            "INSERT INTO productos (codigo, nombre, descripcion, precio, cantidad) VALUES (?, ?, '', ?, 0)",
+            ((f"P{i:06d}", f"Producto {i}", 1.0 + i % 50) for i in range(productos)),
+        )
+        for v in range(1, ventas + 1):
+            fecha = inicio + timedelta(minutes=rnd.randrange(dias * 24 * 60))
+            items = [
+                (v, rnd.randrange(1, productos + 1), rnd.randint(1, 5), 2.0)
+                for _ in range(items_por_venta)
+            ]
+            con.execute(
+                "INSERT INTO ventas (id, codigo_venta, fecha_venta, total, estado) VALUES (?, ?, ?, ?, 'completada')",
+                (v, f"V{v:09d}", fecha.strftime("%Y-%m-%d %H:%M:%S"), sum(c * p for _, _, c, p in items)),
+            )
+            con.executemany(
+                "INSERT INTO venta_items (venta_id, producto_id, cantidad, precio_unitario, subtotal) "
+                "VALUES (?, ?, ?, ?, ? * ?)",
+                ((venta_id, producto_id, c, p, c, p) for venta_id, producto_id, c, p in items),
+            )
+    Reporte.reconstruir()
+
+
+def medir(funcion, repeticiones: int):
+    mejor = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        filas = funcion()
+        duracion = time.perf_counter() - inicio
+        mejor = duracion if mejor is None else min(mejor, duracion)
+    return len(filas), mejor
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compara reportes por mes y año leídos de los acumulados diarios contra recorrer venta_items."
+    )
+    parser.add_argument("--ventas", type=int, default=200_000)
+    parser.add_argument("--items", type=int, default=3, help="ítems por venta")
+    parser.add_argument("--productos", type=int, default=2_000)
+    parser.add_argument("--dias", type=int, default=3 * 365)
+    parser.add_argument("-r", "--repeticiones", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"Generando {args.ventas:,} ventas con {args.items} ítems cada una...")
+    preparar_ventas(args.ventas, args.items, args.productos, args.dias)
+    rango = ("0000-01-01", "9999-12-31")
+
+    for nombre, funcion in (
+        ("escaneo venta_items (mes)", lambda: db.execute_query(REPORTE_MENSUAL_ESCANEO, rango)),
+        ("acumulados (mes)", lambda: Reporte.por_periodo(MES)),
+        ("acumulados (año)", lambda: Reporte.por_periodo(ANIO)),
+        ("top productos", lambda: Reporte.productos_mas_vendidos(limite=20)),
+    ):
+        filas, segundos = medir(funcion, args.repeticiones)
+        print(f"{nombre:<28} {segundos * 1000:9.1f} ms  ({filas} filas)")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import argparse
+import random
+import time
+from datetime import date, datetime, timedelta
+
+# Debe ir antes que los modelos: fija INVENTARIO_DB en un directorio temporal
+from src.tools import _bd_temporal  # noqa: F401
+
+from src.database import db
+from src.models.movimiento import Movimiento, FORMATO_FECHA
+
+INICIO = date(2020, 1, 1)
+
+# Stock a una fecha repasando todo el historial del producto (sin saldos)
+STOCK_REPASANDO = """
+SELECT IFNULL(SUM(CASE WHEN tipo = 'salida' THEN -cantidad ELSE cantidad END), 0)
+FROM movimientos
+WHERE producto_id = ? AND fecha < ?
+"""
+
+
+def preparar_movimientos(productos: int, movimientos: int, dias: int) -> None:
+    """Genera movimientos en orden cronológico con su saldo, como los deja el libro"""
+    db.preparar_esquema()
+    rnd = random.Random(7)
+    saldos = [0] * (productos + 1)
+    segundos = dias * 24 * 3600
+    instantes = sorted(rnd.randrange(segundos) for _ in range(movimientos))
+    filas = []
+    for instante in instantes:
+        producto_id = rnd.randint(1, productos)
+        if saldos[producto_id] > 0 and rnd.random() < 0.6:
+            tipo, cantidad = 'salida', rnd.randint(1, saldos[producto_id])
+            saldos[producto_id] -= cantidad
+        else:
+            tipo, cantidad = 'entrada', rnd.randint(1, 20)
+            saldos[producto_id] += cantidad
+        fecha = (datetime(INICIO.year, INICIO.month, INICIO.day) + timedelta(seconds=instante)).strftime(FORMATO_FECHA)
+        filas.append((producto_id, tipo, cantidad, fecha, saldos[producto_id]))
+    with db.transaction() as con:
+        con.executemany(
+            "INSERT INTO productos (id, codigo, nombre, descripcion, precio, cantidad) VALUES (?, ?, ?, '', ?, ?)",
+            ((i, f"P{i:06d}", f"Producto {i}", 1.0 + i % 50, saldos[i]) for i in range(1, productos + 1)),
+        )
+        con.executemany(
+            "INSERT INTO movimientos (producto_id, tipo, cantidad, fecha, saldo, notas) VALUES (?, ?, ?, ?, ?, '')",
+            filas,
+        )
+
+
+def medir(funcion, repeticiones: int):
+    mejor = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        duracion = time.perf_counter() - inicio
+        mejor = duracion if mejor is None else min(mejor, duracion)
+    return mejor
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Mide el stock a una fecha con el libro de movimientos frente a repasar el historial."
+    )
+    parser.add_argument("--productos", type=int, default=2_000)
+    parser.add_argument("--movimientos", type=int, default=1_000_000)
+    parser.add_argument("--dias", type=int, default=3 * 365)
+    parser.add_argument("--consultas", type=int, default=1_000, help="productos consultados uno a uno")
+    parser.add_argument("-r", "--repeticiones", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"Generando {args.movimientos:,} movimientos de {args.productos:,} productos...")
+    preparar_movimientos(args.productos, args.movimientos, args.dias)
+
+    rnd = random.Random(1)
+    fecha = INICIO + timedelta(days=args.dias * 2 // 3)
+    ids = [rnd.randint(1, args.productos) for _ in range(args.consultas)]
+    limite = (fecha + timedelta(days=1)).isoformat()
+
+    # Ambos caminos deben dar lo mismo
+    for producto_id in ids[:50]:
+        esperado = db.execute_query(STOCK_REPASANDO, (producto_id, limite))[0][0]
+        assert Movimiento.stock_en_fecha(producto_id, fecha) == esperado, producto_id
+
+    segundos = medir(lambda: [db.execute_query(STOCK_REPASANDO, (i, limite)) for i in ids], args.repeticiones)
+    print(f"repasando historial   {segundos / len(ids) * 1e6:9.1f} µs por producto")
+    segundos = medir(lambda: [Movimiento.stock_en_fecha(i, fecha) for i in ids], args.repeticiones)
+    print(f"libro (saldos)        {segundos / len(ids) * 1e6:9.1f} µs por producto")
+
+    segundos = medir(lambda: Movimiento.valoracion_en_fecha(fecha), args.repeticiones)
+    valoracion = Movimiento.valoracion_en_fecha(fecha)
+    print(f"catálogo completo     {segundos * 1000:9.1f} ms  "
+          f"({valoracion.unidades:,} unidades, ${valoracion.valor:,.2f} al {fecha})")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
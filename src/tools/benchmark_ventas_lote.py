@@ -0,0 +1,106 @@
+import argparse
+import time
+
+# Debe ir antes que los modelos: fija INVENTARIO_DB en un directorio temporal
+from src.tools import _bd_temporal  # noqa: F401
+
+from src.database import db
+from src.models.venta import Venta
+
+
+def preparar_productos(cantidad: int) -> list:
+    db.preparar_esquema()
+    with db.transaction() as con:
+        con.executemany(
+            "INSERT INTO productos (codigo, nombre, precio, cantidad) VALUES (?, ?, ?, ?)",
+            ((f"P{i:06d}", f"Producto {i}", 1.0 + i % 50, 10_000_000) for i in range(cantidad)),
+        )
+    return [row["id"] for row in db.execute_query("SELECT id FROM productos ORDER BY id")]
+
+
+def guardar_fila_a_fila(venta: Venta) -> None:
+    """Ruta anterior: un INSERT y un UPDATE autoconfirmados por cada línea."""
+    venta.codigo_venta = Venta.generar_codigo_venta() + str(time.perf_counter_ns())
+    venta.id = db.execute_query(
+        "INSERT INTO ventas (codigo_venta, fecha_venta, total, estado, notas) VALUES (?, ?, ?, ?, ?)",
+        (venta.codigo_venta, venta.fecha_venta, venta.total, venta.estado, venta.notas),
+    )
+    for item in venta.items:
+        db.execute_query(
+            "INSERT INTO venta_items (venta_id, producto_id, cantidad, precio_unitario, subtotal) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (venta.id, item.producto_id, item.cantidad, item.precio_unitario, item.subtotal),
+        )
+        db.execute_query(
+            "UPDATE productos SET cantidad = cantidad - ? WHERE id = ?",
+            (item.cantidad, item.producto_id),
+        )
+
+
+def guardar_en_lote(venta: Venta) -> None:
+    venta.codigo_venta = Venta.generar_codigo_venta() + str(time.perf_counter_ns())
+    venta.guardar()
+
+
+def nueva_venta(ids: list, lineas: int) -> Venta:
+    venta = Venta()
+    for i in range(lineas):
+        venta.agregar_item(ids[i % len(ids)], 1, 2.5)
+    return venta
+
+
+def contar_sentencias(guardar, ids: list, lineas: int) -> int:
+    """Sentencias que envía un guardado, sin contar las de los triggers.
+
+    Según la versión, el trace informa cada sentencia de un trigger como
+    ``-- TRIGGER nombre`` o repitiendo el SQL de la sentencia que lo disparó;
+    ninguna de las dos es un viaje aparte a SQLite.
+    """
+    sentencias = 0
+    anterior = None
+
+    def contar(sql):
+        nonlocal sentencias, anterior
+        if sql.lstrip().startswith("--") or sql == anterior:
+            return
+        anterior = sql
+        sentencias += 1
+
+    with db.connection() as con:
+        con.set_trace_callback(contar)
+        try:
+            guardar(nueva_venta(ids, lineas))
+        finally:
+            con.set_trace_callback(None)
+    return sentencias
+
+
+def medir(guardar, ids: list, lineas: int, repeticiones: int):
+    # El conteo va en una pasada aparte para no cronometrar el trace
+    sentencias = contar_sentencias(guardar, ids, lineas)
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        guardar(nueva_venta(ids, lineas))
+    return (time.perf_counter() - inicio) / repeticiones, sentencias
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compara el guardado de ventas fila a fila frente al guardado en lote."
+    )
+    parser.add_argument("--lineas", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("-r", "--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    ids = preparar_productos(max(args.lineas))
+    print(f"{'líneas':>7} {'ruta':<12} {'ms/venta':>10} {'sentencias':>11}")
+    for lineas in args.lineas:
+        for nombre, guardar in (("fila a fila", guardar_fila_a_fila), ("lote", guardar_en_lote)):
+            segundos, sentencias = medir(guardar, ids, lineas, args.repeticiones)
+            print(f"{lineas:>7} {nombre:<12} {segundos * 1000:>10.2f} {sentencias:>11}")
+
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
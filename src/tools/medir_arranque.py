@@ -0,0 +1,94 @@
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+def preparar_datos(ruta, productos: int) -> None:
+    """Crea una base de datos de prueba con ``productos`` productos y algunas ventas"""
+    os.environ["INVENTARIO_DB"] = str(ruta)
+    from src.database import db
+
+    db.preparar_esquema()
+    with db.transaction() as con:
+        con.executemany("INSERT INTO categorias (nombre) VALUES (?)", ((f"Categoría {i}",) for i in range(20)))
+        con.executemany(
+            "INSERT INTO productos (codigo, nombre, precio, cantidad, categoria_id) VALUES (?, ?, ?, ?, ?)",
+            ((f"P{i:07d}", f"Producto {i}", 1.0 + i % 500, i % 40, i % 20 + 1) for i in range(productos)),
+        )
+        con.executemany(
+            "INSERT INTO ventas (codigo_venta, total, estado) VALUES (?, 10, 'completada')",
+            ((f"V-{i:08d}",) for i in range(productos // 10)),
+        )
+    db.close()
+
+
+def medir_arranque(ruta) -> None:
+    """Mide en un proceso nuevo cuánto tarda la ventana principal en pintarse"""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    os.environ["INVENTARIO_DB"] = str(ruta)
+    inicio = time.perf_counter()
+
+    from PyQt6.QtCore import QObject, QEvent
+    from PyQt6.QtWidgets import QApplication
+    from src.database import db
+    from src.main_window import MainWindow
+    importado = time.perf_counter()
+
+    app = QApplication(sys.argv)
+    db.preparar_esquema()
+    ventana = MainWindow()
+    construido = time.perf_counter()
+
+    class PrimerPintado(QObject):
+        momento = None
+
+        def eventFilter(self, objeto, evento):
+            if evento.type() == QEvent.Type.Paint and self.momento is None:
+                self.momento = time.perf_counter()
+                app.quit()
+            return False
+
+    filtro = PrimerPintado()
+    ventana.installEventFilter(filtro)
+    ventana.show()
+    app.exec()
+
+    pintado = filtro.momento or time.perf_counter()
+    print(
+        f"{(importado - inicio) * 1000:>10.1f} {(construido - importado) * 1000:>12.1f} "
+        f"{(pintado - inicio) * 1000:>14.1f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Mide el tiempo hasta el primer pintado de MainWindow con bases de datos de distintos tamaños."
+    )
+    parser.add_argument("--productos", type=int, nargs="+", default=[0, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--hijo", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.hijo is not None:
+        medir_arranque(args.hijo)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'productos':>9} {'import (ms)':>10} {'ventana (ms)':>12} {'1er pintado (ms)':>14}")
+        for productos in args.productos:
+            ruta = Path(tmp) / f"arranque_{productos}.db"
+            # Los datos se generan en otro proceso para que el arranque medido sea en frío
+            subprocess.run(
+                [sys.executable, "-c",
+                 f"from src.tools.medir_arranque import preparar_datos; preparar_datos({str(ruta)!r}, {productos})"],
+                check=True,
+            )
+            print(f"{productos:>9} ", end="", flush=True)
+            subprocess.run([sys.executable, "-m", "src.tools.medir_arranque", "--hijo", str(ruta)], check=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,12 +8,19 @@ DEFAULT_DB_PATH = "inventario.db"
 
 
 TABLES_IN_ORDER = [
+    # Acumulados derivados de ventas y productos (sin claves foráneas)
+    "ventas_diarias",
+    "ventas_diarias_producto",
+    "ventas_diarias_categoria",
+    "ventas_mensuales_producto",
     # Children first (to respect FK constraints)
     "venta_items",
     "ventas",
     "movimientos",
     "productos",
     "categorias",
+    # Los triggers de productos la dejan en cero; se vacía al final
+    "categorias_resumen",
 ]
 
 
@@ -7,6 +7,8 @@ from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QIcon
 
 from src.models.categoria import Categoria
+from src.views.components.cambios import ReceptorCambios
+from src import eventos
 
 class CategoriasView(QWidget):
     # Señales
@@ -15,6 +17,10 @@ class CategoriasView(QWidget):
     
     def __init__(self, parent=None):
         super().__init__(parent)
+        # Los totales dependen también de los productos (stock, categoría)
+        self.cambios = ReceptorCambios(eventos.CATEGORIA, eventos.PRODUCTO, parent=self)
+        self.cambios.cambio.connect(self.aplicar_cambio)
+        self._desactualizada = False
         self.setup_ui()
         self.cargar_categorias()
     
@@ -184,16 +190,14 @@ class CategoriasView(QWidget):
     def cargar_categorias(self, categorias=None):
         """Carga las categorías en la tabla"""
         if categorias is None:
-            categorias = Categoria.obtener_todas()
+            categorias = Categoria.obtener_con_totales()
         
         self.tabla_categorias.setRowCount(0)
         categorias_sin_productos = 0
         
         for categoria in categorias:
-            # Obtener el número de productos en esta categoría
-            from src.models.producto import Producto
-            productos = Producto.obtener_todos(categoria.id)
-            num_productos = len(productos)
+            # Número de productos calculado por la misma consulta de categorías
+            num_productos = categoria.num_productos
             
             if num_productos == 0:
                 categorias_sin_productos += 1
@@ -250,12 +254,25 @@ class CategoriasView(QWidget):
         # Actualizar resumen
         self.actualizar_resumen(len(categorias), categorias_sin_productos)
     
+    def aplicar_cambio(self, cambio):
+        """Refresca la lista (pocas filas) o, si está oculta, al volver a mostrarse"""
+        if self.isVisible():
+            self.buscar_categorias()
+        else:
+            self._desactualizada = True
+    
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self._desactualizada:
+            self._desactualizada = False
+            self.buscar_categorias()
+    
     def buscar_categorias(self):
         """Busca categorías según el texto de búsqueda"""
         texto_busqueda = self.buscar_input.text().strip()
         
         if texto_busqueda:
-            categorias = Categoria.buscar_por_nombre(texto_busqueda)
+            categorias = Categoria.obtener_con_totales(texto_busqueda)
             self.cargar_categorias(categorias)
         else:
             self.cargar_categorias()
@@ -284,7 +301,6 @@ class CategoriasView(QWidget):
                         "Categoría eliminada",
                         f"La categoría '{categoria.nombre}' ha sido eliminada correctamente."
                     )
-                    self.cargar_categorias()
             except Exception as e:
                 QMessageBox.critical(
                     self,
@@ -0,0 +1,103 @@
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+
+# Pool compartido por todos los buscadores: las búsquedas se serializan y las
+# que quedan en cola obsoletas se descartan antes de ejecutarse
+_pool_busquedas = None
+
+
+def pool_busquedas():
+    global _pool_busquedas
+    if _pool_busquedas is None:
+        _pool_busquedas = QThreadPool()
+        _pool_busquedas.setMaxThreadCount(1)
+    return _pool_busquedas
+
+
+class _SenalesTarea(QObject):
+    terminada = pyqtSignal(int, object)  # generación, resultados
+    fallida = pyqtSignal(int, str)       # generación, mensaje
+
+
+class _TareaBusqueda(QRunnable):
+    """Ejecuta la función de búsqueda en un hilo del pool"""
+
+    def __init__(self, generacion, funcion, args, vigente, senales):
+        super().__init__()
+        self.generacion = generacion
+        self.funcion = funcion
+        self.args = args
+        self.vigente = vigente
+        self.senales = senales
+
+    def run(self):
+        # Si mientras esperaba en cola llegó otra búsqueda, no consultar
+        if not self.vigente(self.generacion):
+            return
+        try:
+            resultado = self.funcion(*self.args)
+        except Exception as e:
+            self.senales.fallida.emit(self.generacion, str(e))
+            return
+        if self.vigente(self.generacion):
+            self.senales.terminada.emit(self.generacion, resultado)
+
+
+class BuscadorAsincrono(QObject):
+    """Búsqueda con debounce fuera del hilo de la interfaz.
+
+    ``solicitar(*args)`` reinicia la ventana de debounce; al vencer se ejecuta
+    ``funcion(*args)`` en un hilo de trabajo. Cada solicitud invalida las
+    anteriores, de modo que solo se emiten los resultados de la última
+    (``resultados``) y las consultas obsoletas en cola nunca llegan a correr.
+    La función se ejecuta fuera del hilo de Qt: debe devolver datos simples
+    (listas, tuplas, modelos) y no tocar widgets.
+    """
+
+    resultados = pyqtSignal(object)
+    error = pyqtSignal(str)
+
+    def __init__(self, funcion, debounce_ms=250, parent=None):
+        super().__init__(parent)
+        self.funcion = funcion
+        self._generacion = 0
+        self._args = ()
+
+        self._senales = _SenalesTarea()
+        self._senales.terminada.connect(self._on_terminada)
+        self._senales.fallida.connect(self._on_fallida)
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(debounce_ms)
+        self._timer.timeout.connect(self._lanzar)
+
+    def _vigente(self, generacion):
+        # Lectura de un entero: segura desde el hilo de trabajo
+        return generacion == self._generacion
+
+    def solicitar(self, *args, inmediato=False):
+        """Programa una búsqueda con los argumentos dados"""
+        self._generacion += 1
+        self._args = args
+        if inmediato:
+            self._timer.stop()
+            self._lanzar()
+        else:
+            self._timer.start()
+
+    def cancelar(self):
+        """Descarta la búsqueda pendiente y los resultados que estén en camino"""
+        self._generacion += 1
+        self._timer.stop()
+
+    def _lanzar(self):
+        tarea = _TareaBusqueda(self._generacion, self.funcion, self._args, self._vigente, self._senales)
+        pool_busquedas().start(tarea)
+
+    def _on_terminada(self, generacion, resultado):
+        if generacion == self._generacion:
+            self.resultados.emit(resultado)
+
+    def _on_fallida(self, generacion, mensaje):
+        if generacion == self._generacion:
+            self.error.emit(mensaje)
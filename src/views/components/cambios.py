@@ -0,0 +1,22 @@
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from src import eventos
+
+
+class ReceptorCambios(QObject):
+    """Reenvía como señal Qt los cambios del bus de eventos (src/eventos.py).
+
+    Si el cambio se confirmó en otro hilo, Qt encola la señal y la vista la
+    recibe en el hilo de la interfaz. Al destruirse el receptor (junto con
+    su widget padre) deja de recibir cambios.
+    """
+
+    cambio = pyqtSignal(object)
+
+    def __init__(self, *entidades, parent=None):
+        super().__init__(parent)
+        for entidad in entidades:
+            eventos.bus.suscribir(entidad, self._recibir)
+
+    def _recibir(self, cambio):
+        self.cambio.emit(cambio)
@@ -18,6 +18,8 @@ from src.views.productos.productos_view import ProductosView
 # Temporalmente usando vistas simples para debug
 from src.views.ventas.ventas_simple import VentasSimpleView
 from src.views.reportes.reportes_simple import ReportesSimpleView
+from src.views.components.cambios import ReceptorCambios
+from src import eventos
 
 
 class MainWindow(QMainWindow):
@@ -313,20 +315,10 @@ class MainWindow(QMainWindow):
     
     def conectar_senales(self):
         """Conecta las señales de las vistas"""
-        # Conectar señales de actualización de la vista de categorías
-        categorias_view = self.stacked_widget.widget(1)
-        if hasattr(categorias_view, 'categoria_guardada'):
-            categorias_view.categoria_guardada.connect(self.actualizar_vistas)
-        
-        # Conectar señales de actualización de la vista de productos
-        productos_view = self.stacked_widget.widget(2)
-        if hasattr(productos_view, 'producto_guardado'):
-            productos_view.producto_guardado.connect(self.actualizar_vistas)
-        
-        # Conectar señales de actualización de la vista de ventas
-        ventas_view = self.stacked_widget.widget(3)
-        if hasattr(ventas_view, 'venta_realizada'):
-            ventas_view.venta_realizada.connect(self.actualizar_vistas)
+        # Las vistas de categorías, productos y ventas se actualizan solas con
+        # los cambios que publican los modelos; los reportes dependen de las ventas
+        self.cambios = ReceptorCambios(eventos.VENTA, parent=self)
+        self.cambios.cambio.connect(self.al_cambiar_ventas)
     
     def cambiar_vista(self, index):
         """Cambia la vista actual"""
@@ -360,27 +352,10 @@ class MainWindow(QMainWindow):
         self.statusBar().showMessage(mensaje_estado)
         print(f"Mensaje de estado: {mensaje_estado}")  # Debug
     
-    def actualizar_vistas(self):
-        """Actualiza todas las vistas que necesitan refrescarse"""
-        # Actualizar vista de categorías si es necesario
-        categorias_view = self.stacked_widget.widget(1)
-        if hasattr(categorias_view, 'cargar_categorias'):
-            categorias_view.cargar_categorias()
-        
-        # Actualizar vista de productos
-        productos_view = self.stacked_widget.widget(2)
-        if hasattr(productos_view, 'cargar_productos'):
-            productos_view.cargar_productos()
-        
-        # Actualizar vista de ventas
-        ventas_view = self.stacked_widget.widget(3)
-        if hasattr(ventas_view, 'cargar_ventas'):
-            ventas_view.cargar_ventas()
-        
-        # Actualizar vista de reportes si es necesario
-        reportes_view = self.stacked_widget.widget(4)
-        if hasattr(reportes_view, 'actualizar_reportes'):
-            reportes_view.actualizar_reportes()
+    def al_cambiar_ventas(self, cambio):
+        """Actualiza los reportes tras una venta nueva o cancelada"""
+        if hasattr(self, 'reportes_view') and hasattr(self.reportes_view, 'actualizar_reportes'):
+            self.reportes_view.actualizar_reportes()
     
     def mostrar_acerca_de(self):
         """Muestra el diálogo Acerca de"""
@@ -208,11 +208,10 @@ class ProductoDialog(QDialog):
         if self.precio_input.value() <= 0:
             errores.append("El precio debe ser mayor a cero")
         
-        # Verificar si el código ya existe (solo para nuevo producto)
-        if self.producto_id is None and codigo:
-            # Verificar si ya existe un producto con el mismo código
-            productos = Producto.buscar(codigo)
-            if productos:
+        # Verificar si el código ya pertenece a otro producto
+        if codigo:
+            existente = Producto.obtener_por_codigo(codigo)
+            if existente and existente.id != self.producto_id:
                 errores.append("Ya existe un producto con este código")
         
         return errores
@@ -0,0 +1,209 @@
+from bisect import bisect_right
+
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QRect, QSize, QEvent, pyqtSignal
+from PyQt6.QtGui import QColor, QIcon, QPainter, QBrush
+from PyQt6.QtWidgets import QStyledItemDelegate, QStyle, QToolTip
+
+# Por debajo de STOCK_BAJO la cantidad se resalta en rojo
+from src.models.producto import STOCK_BAJO
+
+
+class ProductosTableModel(QAbstractTableModel):
+    """Modelo de solo lectura sobre una lista compacta de tuplas de productos.
+
+    Cada fila es ``(id, codigo, nombre, categoria_nombre, precio, cantidad)``;
+    el texto de las celdas se formatea al pintarlas, así que solo las filas
+    visibles consumen tiempo.
+    """
+
+    COLUMNAS = ["Código", "Nombre", "Categoría", "Precio", "Cantidad", "Acciones"]
+    COL_CODIGO, COL_NOMBRE, COL_CATEGORIA, COL_PRECIO, COL_CANTIDAD, COL_ACCIONES = range(6)
+
+    # Posiciones dentro de la tupla de cada fila
+    ID, CODIGO, NOMBRE, CATEGORIA, PRECIO, CANTIDAD = range(6)
+    # Columnas de la consulta en ese orden (Producto.obtener_todos/buscar con columnas=)
+    COLUMNAS_FILA = ('id', 'codigo', 'nombre', 'categoria_nombre', 'precio', 'cantidad')
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._filas = []
+
+    @staticmethod
+    def filas_desde_productos(productos):
+        """Convierte objetos Producto en las tuplas que guarda el modelo"""
+        return [
+            (p.id, p.codigo, p.nombre, p.categoria_nombre, p.precio, p.cantidad)
+            for p in productos
+        ]
+
+    def set_productos(self, productos):
+        """Reemplaza el contenido del modelo con una lista de objetos Producto"""
+        self.set_filas(self.filas_desde_productos(productos))
+
+    def set_filas(self, filas):
+        """Reemplaza el contenido del modelo con tuplas ya compactas"""
+        self.beginResetModel()
+        self._filas = list(filas)
+        self.endResetModel()
+
+    def reemplazar_filas(self, filas):
+        """Sustituye las filas con el mismo id y repinta solo esas.
+
+        Devuelve las tuplas cuyo producto no estaba en el modelo.
+        """
+        por_id = {fila[self.ID]: fila for fila in filas}
+        ultima = self.columnCount() - 1
+        for row, actual in enumerate(self._filas):
+            nueva = por_id.pop(actual[self.ID], None)
+            if nueva is not None:
+                self._filas[row] = nueva
+                self.dataChanged.emit(self.index(row, 0), self.index(row, ultima))
+        return list(por_id.values())
+
+    def insertar_ordenada(self, fila):
+        """Inserta una fila en su posición según el nombre (orden de obtener_todos)"""
+        row = bisect_right(self._filas, fila[self.NOMBRE], key=lambda f: f[self.NOMBRE])
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._filas.insert(row, fila)
+        self.endInsertRows()
+
+    def quitar_ids(self, ids):
+        """Quita las filas de esos productos"""
+        ids = set(ids)
+        for row in range(len(self._filas) - 1, -1, -1):
+            if self._filas[row][self.ID] in ids:
+                self.beginRemoveRows(QModelIndex(), row, row)
+                del self._filas[row]
+                self.endRemoveRows()
+
+    def fila(self, row):
+        return self._filas[row]
+
+    def producto_id(self, row):
+        return self._filas[row][self.ID]
+
+    def filas(self):
+        return self._filas
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._filas)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNAS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.COLUMNAS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        fila = self._filas[index.row()]
+        col = index.column()
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            if col == self.COL_CODIGO:
+                return fila[self.CODIGO]
+            if col == self.COL_NOMBRE:
+                return fila[self.NOMBRE]
+            if col == self.COL_CATEGORIA:
+                return fila[self.CATEGORIA] or "Sin categoría"
+            if col == self.COL_PRECIO:
+                return f"${fila[self.PRECIO]:,.2f}"
+            if col == self.COL_CANTIDAD:
+                return str(fila[self.CANTIDAD])
+            return None
+
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            if col == self.COL_PRECIO:
+                return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+            if col == self.COL_CANTIDAD:
+                return Qt.AlignmentFlag.AlignCenter
+            return None
+
+        if role == Qt.ItemDataRole.ForegroundRole:
+            # Resaltar en rojo si hay bajo stock
+            if col == self.COL_CANTIDAD and fila[self.CANTIDAD] < STOCK_BAJO:
+                return QBrush(Qt.GlobalColor.red)
+            return None
+
+        if role == Qt.ItemDataRole.UserRole:
+            return fila[self.ID]
+
+        return None
+
+
+class AccionesDelegate(QStyledItemDelegate):
+    """Pinta los botones Editar/Eliminar de cada fila sin crear widgets"""
+
+    editar_clicked = pyqtSignal(int)    # fila
+    eliminar_clicked = pyqtSignal(int)  # fila
+
+    TAMANO_BOTON = 28
+    ESPACIADO = 5
+    MARGEN = 5
+
+    BOTONES = (
+        ('editar', QColor("#0078d7"), ":/icons/edit.png", "✎"),
+        ('eliminar', QColor("#dc3545"), ":/icons/trash-2.png", "✕"),
+    )
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._iconos = {nombre: QIcon(ruta) for nombre, _, ruta, _ in self.BOTONES}
+
+    def _rects(self, rect):
+        """Rectángulos de cada botón dentro de la celda"""
+        y = rect.top() + (rect.height() - self.TAMANO_BOTON) // 2
+        x = rect.left() + self.MARGEN
+        rects = []
+        for _ in self.BOTONES:
+            rects.append(QRect(x, y, self.TAMANO_BOTON, self.TAMANO_BOTON))
+            x += self.TAMANO_BOTON + self.ESPACIADO
+        return rects
+
+    def paint(self, painter, option, index):
+        if option.state & QStyle.StateFlag.State_Selected:
+            painter.fillRect(option.rect, option.palette.highlight())
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        for rect, (nombre, color, _, texto) in zip(self._rects(option.rect), self.BOTONES):
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(color)
+            painter.drawRoundedRect(rect, 4, 4)
+            icono = self._iconos[nombre]
+            if not icono.isNull():
+                icono.paint(painter, rect.adjusted(6, 6, -6, -6))
+            else:
+                painter.setPen(QColor("white"))
+                painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, texto)
+        painter.restore()
+
+    def sizeHint(self, option, index):
+        ancho = self.MARGEN * 2 + len(self.BOTONES) * self.TAMANO_BOTON + self.ESPACIADO * (len(self.BOTONES) - 1)
+        return QSize(ancho, self.TAMANO_BOTON + 4)
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.Type.MouseButtonRelease and event.button() == Qt.MouseButton.LeftButton:
+            pos = event.position().toPoint()
+            editar, eliminar = self._rects(option.rect)
+            if editar.contains(pos):
+                self.editar_clicked.emit(index.row())
+                return True
+            if eliminar.contains(pos):
+                self.eliminar_clicked.emit(index.row())
+                return True
+        return super().editorEvent(event, model, option, index)
+
+    def helpEvent(self, event, view, option, index):
+        if event.type() == QEvent.Type.ToolTip:
+            editar, eliminar = self._rects(option.rect)
+            if editar.contains(event.pos()):
+                QToolTip.showText(event.globalPos(), "Editar producto", view)
+                return True
+            if eliminar.contains(event.pos()):
+                QToolTip.showText(event.globalPos(), "Eliminar producto", view)
+                return True
+        return super().helpEvent(event, view, option, index)
@@ -1,6 +1,6 @@
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
-    QLineEdit, QComboBox, QTableWidget, QTableWidgetItem,
+    QLineEdit, QComboBox, QTableView, QAbstractItemView,
     QHeaderView, QMessageBox, QLabel, QFrame
 )
 from PyQt6.QtCore import Qt, pyqtSignal
@@ -8,6 +8,20 @@ from PyQt6.QtGui import QIcon, QPixmap
 
 from src.models.producto import Producto
 from src.models.categoria import Categoria
+from src.views.productos.productos_model import ProductosTableModel, AccionesDelegate
+from src.views.components.busqueda_async import BuscadorAsincrono
+from src.views.components.cambios import ReceptorCambios
+from src import eventos
+
+
+def buscar_filas_productos(texto, categoria_id):
+    """Consulta de la búsqueda y de su resumen; se ejecuta en el hilo de trabajo"""
+    columnas = ProductosTableModel.COLUMNAS_FILA
+    if texto:
+        filas = Producto.buscar(texto, categoria_id, columnas=columnas)
+    else:
+        filas = Producto.obtener_todos(categoria_id, columnas=columnas)
+    return filas, Producto.resumen_inventario(categoria_id, texto)
 
 class ProductosView(QWidget):
     # Señales
@@ -16,9 +30,14 @@ class ProductosView(QWidget):
     
     def __init__(self, parent=None):
         super().__init__(parent)
+        self.buscador = BuscadorAsincrono(buscar_filas_productos, parent=self)
+        self.buscador.resultados.connect(self.mostrar_busqueda)
+        self.cambios = ReceptorCambios(eventos.PRODUCTO, eventos.CATEGORIA, parent=self)
+        self.cambios.cambio.connect(self.aplicar_cambio)
         self.setup_ui()
         self.cargar_categorias()
-        self.cargar_productos()
+        # La primera carga va al hilo de trabajo: la vista se muestra sin esperarla
+        self.buscador.solicitar("", None, inmediato=True)
     
     def setup_ui(self):
         """Configura la interfaz de usuario de la vista de productos"""
@@ -47,23 +66,28 @@ class ProductosView(QWidget):
         search_layout.addWidget(self.categoria_combo)
         search_layout.addWidget(btn_agregar)
         
-        # Tabla de productos
-        self.tabla_productos = QTableWidget()
-        self.tabla_productos.setColumnCount(6)
-        self.tabla_productos.setHorizontalHeaderLabels([
-            "Código", "Nombre", "Categoría", "Precio", "Cantidad", "Acciones"
-        ])
+        # Tabla de productos (modelo/vista: solo se pintan las filas visibles)
+        self.modelo_productos = ProductosTableModel(self)
+        self.tabla_productos = QTableView()
+        self.tabla_productos.setModel(self.modelo_productos)
+        
+        self.delegate_acciones = AccionesDelegate(self.tabla_productos)
+        self.delegate_acciones.editar_clicked.connect(
+            lambda row: self.editar_producto.emit(self.modelo_productos.producto_id(row))
+        )
+        self.delegate_acciones.eliminar_clicked.connect(self.eliminar_producto_fila)
+        self.tabla_productos.setItemDelegateForColumn(ProductosTableModel.COL_ACCIONES, self.delegate_acciones)
         
         # Estilo para la tabla
         self.tabla_productos.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 color: black;
                 gridline-color: #d0d0d0;
             }
-            QTableWidget::item {
+            QTableView::item {
                 color: black;
             }
-            QTableWidget::item:selected {
+            QTableView::item:selected {
                 background-color: #0078d7;
                 color: white;
             }
@@ -77,28 +101,6 @@ class ProductosView(QWidget):
                 border: 1px solid #d0d0d0;
                 font-weight: bold;
             }
-            QPushButton#btn_editar {
-                color: white;
-                background-color: #0078d7;
-                border: none;
-                padding: 3px 8px;
-                border-radius: 4px;
-                margin: 1px;
-            }
-            QPushButton#btn_editar:hover {
-                background-color: #106ebe;
-            }
-            QPushButton#btn_eliminar {
-                color: white;
-                background-color: #dc3545;
-                border: none;
-                padding: 3px 8px;
-                border-radius: 4px;
-                margin: 1px;
-            }
-            QPushButton#btn_eliminar:hover {
-                background-color: #c82333;
-            }
         """)
         
         # Agregar leyenda de acciones
@@ -114,9 +116,15 @@ class ProductosView(QWidget):
         header.setSectionResizeMode(3, QHeaderView.ResizeMode.ResizeToContents)  # Precio
         header.setSectionResizeMode(4, QHeaderView.ResizeMode.ResizeToContents)  # Cantidad
         header.setSectionResizeMode(5, QHeaderView.ResizeMode.ResizeToContents)  # Acciones
+        # Medir solo una muestra de filas para ajustar columnas en catálogos grandes
+        header.setResizeContentsPrecision(200)
         
-        self.tabla_productos.verticalHeader().setVisible(False)
-        self.tabla_productos.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        vertical_header = self.tabla_productos.verticalHeader()
+        vertical_header.setVisible(False)
+        vertical_header.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        vertical_header.setDefaultSectionSize(34)
+        self.tabla_productos.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.tabla_productos.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
         
         # Widget de resumen
         resumen_widget = QFrame()
@@ -175,7 +183,7 @@ class ProductosView(QWidget):
                 color: #9E9E9E;
             }
             
-            QTableWidget {
+            QTableView {
                 background-color: white;
                 border: 1px solid #DAC0A3;
                 border-radius: 4px;
@@ -212,100 +220,97 @@ class ProductosView(QWidget):
         for categoria in categorias:
             self.categoria_combo.addItem(categoria.nombre, categoria.id)
     
+    def aplicar_cambio(self, cambio):
+        """Actualiza solo las filas afectadas por un cambio confirmado"""
+        if cambio.entidad == eventos.CATEGORIA:
+            self.aplicar_cambio_categoria(cambio)
+            return
+        
+        categoria_id = self.categoria_combo.currentData()
+        texto = self.buscar_input.text().strip()
+        
+        if cambio.operacion == eventos.ELIMINADO:
+            self.modelo_productos.quitar_ids(cambio.ids)
+        elif texto and cambio.operacion == eventos.CREADO:
+            # Si encaja con la búsqueda y dónde va lo decide la consulta
+            self.buscador.solicitar(texto, categoria_id, inmediato=True)
+            return
+        else:
+            columnas = ProductosTableModel.COLUMNAS_FILA + ('categoria_id',)
+            filas = Producto.obtener_por_ids(cambio.ids, columnas=columnas)
+            # Los que ya no pertenecen a la categoría filtrada salen de la tabla
+            fuera = [f[0] for f in filas if categoria_id is not None and f[-1] != categoria_id]
+            self.modelo_productos.quitar_ids(fuera)
+            nuevas = self.modelo_productos.reemplazar_filas(
+                [f[:-1] for f in filas if f[0] not in fuera]
+            )
+            # Los que no estaban se agregan si no hay búsqueda que los filtre
+            if not texto:
+                for fila in nuevas:
+                    self.modelo_productos.insertar_ordenada(fila)
+        
+        self.actualizar_resumen(Producto.resumen_inventario(categoria_id, texto))
+    
+    def aplicar_cambio_categoria(self, cambio):
+        """Refresca el combo de categorías y, si cambió un nombre, las filas"""
+        seleccionada = self.categoria_combo.currentData()
+        self.categoria_combo.blockSignals(True)
+        self.cargar_categorias()
+        indice = self.categoria_combo.findData(seleccionada)
+        self.categoria_combo.setCurrentIndex(max(indice, 0))
+        self.categoria_combo.blockSignals(False)
+        
+        # Las filas muestran el nombre de la categoría; se vuelve a consultar la lista
+        if cambio.operacion == eventos.ACTUALIZADO or indice < 0:
+            self.filtrar_por_categoria()
+    
     def cargar_productos(self, productos=None):
         """Carga los productos en la tabla"""
         if productos is None:
             categoria_id = self.categoria_combo.currentData()
-            productos = Producto.obtener_todos(categoria_id)
-        
-        self.tabla_productos.setRowCount(0)
+            filas = Producto.obtener_todos(categoria_id, columnas=ProductosTableModel.COLUMNAS_FILA)
+            resumen = Producto.resumen_inventario(categoria_id)
+        else:
+            filas = ProductosTableModel.filas_desde_productos(productos)
+            resumen = Producto.resumir(productos)
         
-        for producto in productos:
-            row = self.tabla_productos.rowCount()
-            self.tabla_productos.insertRow(row)
-            
-            # Agregar celdas con los datos del producto
-            self.tabla_productos.setItem(row, 0, QTableWidgetItem(producto.codigo))
-            self.tabla_productos.setItem(row, 1, QTableWidgetItem(producto.nombre))
-            self.tabla_productos.setItem(row, 2, QTableWidgetItem(producto.categoria_nombre or "Sin categoría"))
-            
-            # Formatear precio con 2 decimales
-            precio_item = QTableWidgetItem(f"${producto.precio:,.2f}")
-            precio_item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-            self.tabla_productos.setItem(row, 3, precio_item)
-            
-            # Resaltar en rojo si hay bajo stock (menos de 5 unidades)
-            cantidad_item = QTableWidgetItem(str(producto.cantidad))
-            cantidad_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            if producto.cantidad < 5:
-                cantidad_item.setForeground(Qt.GlobalColor.red)
-            self.tabla_productos.setItem(row, 4, cantidad_item)
-            
-            # Botones de acción
-            acciones_widget = QWidget()
-            acciones_layout = QHBoxLayout(acciones_widget)
-            acciones_layout.setContentsMargins(5, 2, 5, 2)
-            acciones_layout.setSpacing(5)
-            
-            btn_editar = QPushButton()
-            btn_editar.setObjectName("btn_editar")
-            btn_editar.setIcon(QIcon(":/icons/edit.png"))
-            btn_editar.setToolTip("Editar producto")
-            btn_editar.setFixedSize(28, 28)
-            btn_editar.setStyleSheet("")
-            btn_editar.clicked.connect(lambda _, p=producto: self.editar_producto.emit(p.id))
-            
-            btn_eliminar = QPushButton()
-            btn_eliminar.setObjectName("btn_eliminar")
-            btn_eliminar.setIcon(QIcon(":/icons/trash-2.png"))
-            btn_eliminar.setToolTip("Eliminar producto")
-            btn_eliminar.setFixedSize(28, 28)
-            btn_eliminar.setStyleSheet("")
-            btn_eliminar.clicked.connect(lambda _, p=producto: self.eliminar_producto(p))
-            
-            acciones_layout.addWidget(btn_editar)
-            acciones_layout.addWidget(btn_eliminar)
-            acciones_layout.addStretch()
-            
-            self.tabla_productos.setCellWidget(row, 5, acciones_widget)
+        # Una carga directa deja sin efecto cualquier búsqueda en curso
+        self.buscador.cancelar()
+        self.mostrar_filas(filas, resumen)
+    
+    def mostrar_busqueda(self, resultado):
+        """Recibe ``(filas, resumen)`` de una búsqueda terminada"""
+        filas, resumen = resultado
+        self.mostrar_filas(filas, resumen)
+    
+    def mostrar_filas(self, filas, resumen):
+        """Muestra en la tabla las filas compactas de una carga o búsqueda"""
+        self.modelo_productos.set_filas(filas)
         
         # Actualizar resumen
-        self.actualizar_resumen()
+        self.actualizar_resumen(resumen)
     
     def buscar_productos(self):
-        """Busca productos según el texto de búsqueda"""
+        """Busca productos según el texto de búsqueda (con debounce, fuera de la interfaz)"""
         texto_busqueda = self.buscar_input.text().strip()
         categoria_id = self.categoria_combo.currentData()
-        
-        if texto_busqueda:
-            productos = Producto.buscar(texto_busqueda, categoria_id)
-            self.cargar_productos(productos)
-        else:
-            self.cargar_productos()
+        self.buscador.solicitar(texto_busqueda, categoria_id)
     
     def filtrar_por_categoria(self):
         """Filtra los productos por la categoría seleccionada"""
-        self.cargar_productos()
+        self.buscador.solicitar(self.buscar_input.text().strip(), self.categoria_combo.currentData(), inmediato=True)
     
-    def actualizar_resumen(self):
-        """Actualiza el resumen de productos"""
-        total_productos = self.tabla_productos.rowCount()
-        productos_bajo_stock = 0
-        valor_total = 0.0
-        
-        for row in range(total_productos):
-            cantidad = int(self.tabla_productos.item(row, 4).text())
-            precio_text = self.tabla_productos.item(row, 3).text().replace('$', '').replace(',', '')
-            precio = float(precio_text)
-            
-            if cantidad < 5:
-                productos_bajo_stock += 1
-            
-            valor_total += cantidad * precio
-        
-        self.lbl_total_productos.setText(f"Total de productos: {total_productos}")
-        self.lbl_productos_bajo_stock.setText(f"Productos con bajo stock: {productos_bajo_stock}")
-        self.lbl_valor_inventario.setText(f"Valor total del inventario: ${valor_total:,.2f}")
+    def actualizar_resumen(self, resumen):
+        """Muestra un ResumenInventario (ver Producto.resumen_inventario)"""
+        self.lbl_total_productos.setText(f"Total de productos: {resumen.productos}")
+        self.lbl_productos_bajo_stock.setText(f"Productos con bajo stock: {resumen.bajo_stock}")
+        self.lbl_valor_inventario.setText(f"Valor total del inventario: ${resumen.valor:,.2f}")
+    
+    def eliminar_producto_fila(self, row):
+        """Elimina el producto de una fila de la tabla"""
+        producto = Producto.obtener_por_id(self.modelo_productos.producto_id(row))
+        if producto:
+            self.eliminar_producto(producto)
     
     def eliminar_producto(self, producto):
         """Muestra un diálogo de confirmación para eliminar un producto"""
@@ -327,7 +332,6 @@ class ProductosView(QWidget):
                         "Producto eliminado",
                         f"El producto '{producto.nombre}' ha sido eliminado correctamente."
                     )
-                    self.cargar_productos()
             except Exception as e:
                 QMessageBox.critical(
                     self,
@@ -0,0 +1,150 @@
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QDateEdit,
+    QTableWidget, QTableWidgetItem, QHeaderView, QFrame
+)
+from PyQt6.QtCore import Qt, QDate
+
+from src.models.reporte import Reporte, DIA, MES, ANIO
+from src.models.producto import Producto
+
+
+class ReportesSimpleView(QWidget):
+    """Reportes de ventas por periodo, producto y categoría.
+
+    Lee los acumulados diarios (ver src/models/reporte.py), así que un año
+    completo se agrupa a partir de unas cuantas filas por día.
+    """
+
+    PERIODOS = (("Por día", DIA), ("Por mes", MES), ("Por año", ANIO))
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._desactualizada = False
+        self.setup_ui()
+        self.actualizar_reportes()
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(20, 20, 20, 20)
+        layout.setSpacing(12)
+
+        title = QLabel("Reportes de ventas")
+        title.setStyleSheet("font-size: 20px; font-weight: bold; color: #2c3e50;")
+        layout.addWidget(title)
+
+        # Filtros
+        filtros_layout = QHBoxLayout()
+        self.periodo_combo = QComboBox()
+        for texto, periodo in self.PERIODOS:
+            self.periodo_combo.addItem(texto, periodo)
+        self.periodo_combo.setCurrentIndex(1)
+        self.periodo_combo.currentIndexChanged.connect(self.actualizar_reportes)
+
+        self.fecha_desde = QDateEdit()
+        self.fecha_desde.setCalendarPopup(True)
+        self.fecha_desde.setDate(QDate.currentDate().addYears(-1))
+        self.fecha_desde.dateChanged.connect(self.actualizar_reportes)
+
+        self.fecha_hasta = QDateEdit()
+        self.fecha_hasta.setCalendarPopup(True)
+        self.fecha_hasta.setDate(QDate.currentDate())
+        self.fecha_hasta.dateChanged.connect(self.actualizar_reportes)
+
+        filtros_layout.addWidget(QLabel("Agrupar:"))
+        filtros_layout.addWidget(self.periodo_combo)
+        filtros_layout.addStretch()
+        filtros_layout.addWidget(QLabel("Desde:"))
+        filtros_layout.addWidget(self.fecha_desde)
+        filtros_layout.addWidget(QLabel("Hasta:"))
+        filtros_layout.addWidget(self.fecha_hasta)
+        layout.addLayout(filtros_layout)
+
+        # Totales del rango e inventario actual
+        resumen_widget = QFrame()
+        resumen_layout = QHBoxLayout(resumen_widget)
+        self.lbl_totales = QLabel()
+        self.lbl_inventario = QLabel()
+        resumen_layout.addWidget(self.lbl_totales)
+        resumen_layout.addStretch()
+        resumen_layout.addWidget(self.lbl_inventario)
+        layout.addWidget(resumen_widget)
+
+        self.tabla_periodos = self._crear_tabla(["Periodo", "Ventas", "Unidades", "Ingresos"])
+        layout.addWidget(QLabel("<b>Ventas por periodo</b>"))
+        layout.addWidget(self.tabla_periodos, 2)
+
+        tablas_layout = QHBoxLayout()
+        productos_layout = QVBoxLayout()
+        productos_layout.addWidget(QLabel("<b>Productos más vendidos</b>"))
+        self.tabla_productos = self._crear_tabla(["Código", "Producto", "Unidades", "Ingresos"])
+        productos_layout.addWidget(self.tabla_productos)
+        categorias_layout = QVBoxLayout()
+        categorias_layout.addWidget(QLabel("<b>Ventas por categoría</b>"))
+        self.tabla_categorias = self._crear_tabla(["Categoría", "Ventas", "Unidades", "Ingresos"])
+        categorias_layout.addWidget(self.tabla_categorias)
+        tablas_layout.addLayout(productos_layout)
+        tablas_layout.addLayout(categorias_layout)
+        layout.addLayout(tablas_layout, 1)
+
+    @staticmethod
+    def _crear_tabla(encabezados):
+        tabla = QTableWidget()
+        tabla.setColumnCount(len(encabezados))
+        tabla.setHorizontalHeaderLabels(encabezados)
+        tabla.verticalHeader().setVisible(False)
+        tabla.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        tabla.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        tabla.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        return tabla
+
+    @staticmethod
+    def _llenar_tabla(tabla, filas, primera_numerica=1):
+        """Llena la tabla; las columnas desde ``primera_numerica`` se alinean a la derecha"""
+        tabla.setUpdatesEnabled(False)
+        tabla.setRowCount(len(filas))
+        for row, valores in enumerate(filas):
+            for col, valor in enumerate(valores):
+                item = QTableWidgetItem(valor)
+                if col >= primera_numerica:
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                tabla.setItem(row, col, item)
+        tabla.setUpdatesEnabled(True)
+
+    def actualizar_reportes(self):
+        """Vuelve a leer los reportes (al mostrarse si la vista está oculta)"""
+        if not self.isVisible():
+            self._desactualizada = True
+            return
+        self._desactualizada = False
+
+        desde = self.fecha_desde.date().toPyDate()
+        hasta = self.fecha_hasta.date().toPyDate()
+        periodo = self.periodo_combo.currentData()
+
+        totales = Reporte.totales(desde, hasta)
+        self.lbl_totales.setText(
+            f"Ventas: {totales.ventas}  |  Unidades: {totales.unidades}  |  "
+            f"Ingresos: ${totales.ingresos:,.2f}"
+        )
+        inventario = Producto.resumen_inventario()
+        self.lbl_inventario.setText(
+            f"Inventario: {inventario.unidades} unidades (${inventario.valor:,.2f})"
+        )
+
+        self._llenar_tabla(self.tabla_periodos, [
+            (fila.periodo, str(fila.ventas), str(fila.unidades), f"${fila.ingresos:,.2f}")
+            for fila in Reporte.por_periodo(periodo, desde, hasta)
+        ])
+        self._llenar_tabla(self.tabla_productos, [
+            (fila.codigo, fila.nombre, str(fila.unidades), f"${fila.ingresos:,.2f}")
+            for fila in Reporte.productos_mas_vendidos(desde, hasta, limite=20)
+        ], primera_numerica=2)
+        self._llenar_tabla(self.tabla_categorias, [
+            (fila.nombre, str(fila.ventas), str(fila.unidades), f"${fila.ingresos:,.2f}")
+            for fila in Reporte.por_categoria(desde, hasta)
+        ])
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self._desactualizada:
+            self.actualizar_reportes()
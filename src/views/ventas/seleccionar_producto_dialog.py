@@ -4,11 +4,25 @@ from PyQt6.QtWidgets import (
     QLineEdit, QMessageBox, QAbstractItemView, QDialogButtonBox,
     QComboBox
 )
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
 from PyQt6.QtGui import QIcon, QFont
 
 from src.models.producto import Producto
 from src.models.categoria import Categoria
+from src.views.components.busqueda_async import BuscadorAsincrono
+
+# Filas que se agregan a la tabla por cada vuelta del bucle de eventos
+FILAS_POR_LOTE = 200
+
+
+def buscar_productos_con_stock(filtro, categoria_id):
+    """Consulta de la búsqueda; se ejecuta en el hilo de trabajo"""
+    if filtro:
+        productos = Producto.buscar(filtro, categoria_id)
+    else:
+        productos = Producto.obtener_todos(categoria_id)
+    # Obtener solo productos con stock mayor a 0
+    return [p for p in productos if getattr(p, 'cantidad', 0) > 0]
 
 
 class SeleccionarProductoDialog(QDialog):
@@ -18,6 +32,9 @@ class SeleccionarProductoDialog(QDialog):
         self.setMinimumSize(600, 400)
         
         self.producto_seleccionado = None
+        self._pendientes = []
+        self.buscador = BuscadorAsincrono(buscar_productos_con_stock, parent=self)
+        self.buscador.resultados.connect(self.mostrar_productos)
         self.setup_ui()
         self.cargar_categorias()
         self.cargar_productos()
@@ -83,22 +100,27 @@ class SeleccionarProductoDialog(QDialog):
         self.buscar_input.setFocus()
     
     def cargar_productos(self, filtro=None):
-        """Carga los productos en la tabla"""
+        """Carga los productos en la tabla (la consulta corre fuera de la interfaz)"""
         categoria_id = self.categoria_combo.currentData() if hasattr(self, 'categoria_combo') else None
-        if filtro:
-            productos = Producto.buscar(filtro, categoria_id)
-        else:
-            productos = Producto.obtener_todos(categoria_id)
-        # Obtener solo productos con stock mayor a 0
-        productos = [p for p in productos if getattr(p, 'cantidad', 0) > 0]
-        
+        self.buscador.solicitar(filtro, categoria_id, inmediato=True)
+    
+    def mostrar_productos(self, productos):
+        """Reemplaza el contenido de la tabla con el resultado de una búsqueda"""
         self.tabla_productos.setRowCount(0)
-        
-        for producto in productos:
-            self.agregar_producto_tabla(producto)
+        self._pendientes = list(reversed(productos))
+        self._agregar_lote()
         
         # Ajuste de columnas manejado por header (sin forzar resize por contenido)
     
+    def _agregar_lote(self):
+        """Agrega la siguiente tanda de filas y cede el control a la interfaz"""
+        if not self._pendientes:
+            return
+        for _ in range(min(FILAS_POR_LOTE, len(self._pendientes))):
+            self.agregar_producto_tabla(self._pendientes.pop())
+        if self._pendientes:
+            QTimer.singleShot(0, self._agregar_lote)
+    
     def agregar_producto_tabla(self, producto):
         """Agrega un producto a la tabla"""
         if not producto or not hasattr(producto, 'id'):
@@ -141,7 +163,10 @@ class SeleccionarProductoDialog(QDialog):
     def filtrar_productos(self):
         """Filtra los productos según el texto de búsqueda"""
         filtro = self.buscar_input.text().strip()
-        self.cargar_productos(filtro if filtro else None)
+        categoria_id = self.categoria_combo.currentData()
+        # Una búsqueda nueva descarta las filas que quedaban por agregar
+        self._pendientes = []
+        self.buscador.solicitar(filtro or None, categoria_id)
 
     def cargar_categorias(self):
         """Carga las categorías en el combo"""
@@ -34,15 +34,6 @@ class VentaDialog(QDialog):
         
         self.setup_ui()
     
-    def reject(self):
-        # Si la venta es nueva y hay productos agregados, devolver el stock
-        if self.venta_id is None and hasattr(self, 'venta') and self.venta.items:
-            for item in self.venta.items:
-                producto = Producto.obtener_por_id(item.producto_id)
-                if producto:
-                    producto.actualizar_cantidad(producto.cantidad + item.cantidad, "Devolución por cierre de diálogo de venta")
-        super().reject()
-
     def set_read_only(self):
         """Configura el diálogo como solo lectura"""
         self.read_only = True
@@ -69,21 +60,13 @@ class VentaDialog(QDialog):
         
         if reply == QMessageBox.StandardButton.Yes:
             try:
-                # Devolver el stock de los productos
-                for item in self.venta.items:
-                    producto = Producto.obtener_por_id(item.producto_id)
-                    if producto:
-                        producto.actualizar_cantidad(
-                            producto.cantidad + item.cantidad,
-                            f"Devolución por cancelación de venta {self.venta.codigo_venta}"
-                        )
-                
-                # Marcar la venta como cancelada
-                self.venta.estado = "cancelada"
-                self.venta.guardar()
+                # Devolver el stock y marcar la venta como cancelada en una sola transacción
+                if not Venta.cancelar_venta(self.venta_id, "Cancelado desde el diálogo de venta"):
+                    QMessageBox.warning(self, "Cancelar Venta", "La venta no existe o ya estaba cancelada.")
+                    return
                 
                 QMessageBox.information(self, "Venta Cancelada", "La venta ha sido cancelada correctamente.")
-                self.venta_guardada.emit()
+                self.venta_guardada.emit(self.venta_id)
                 self.accept()
                 
             except Exception as e:
@@ -362,8 +345,14 @@ class VentaDialog(QDialog):
             # Limpiar ítems existentes
             self.venta.items = []
             
+            # Resolver todos los códigos del carrito en una sola consulta
+            filas = range(self.tabla_productos.rowCount())
+            productos = Producto.obtener_por_codigos(
+                self.tabla_productos.item(row, 0).text() for row in filas
+            )
+            
             # Recorrer la tabla y guardar los productos
-            for row in range(self.tabla_productos.rowCount()):
+            for row in filas:
                 codigo = self.tabla_productos.item(row, 0).text()
                 cantidad = int(self.tabla_productos.item(row, 3).text())
                 
@@ -371,9 +360,7 @@ class VentaDialog(QDialog):
                 precio_texto = self.tabla_productos.item(row, 2).text().replace('$', '').strip()
                 precio_unitario = float(precio_texto)
                 
-                # Buscar el producto por código
-                productos = Producto.buscar(codigo)
-                producto = productos[0] if productos else None
+                producto = productos.get(codigo)
                 if not producto:
                     QMessageBox.warning(
                         self,
@@ -419,176 +406,3 @@ class VentaDialog(QDialog):
                 "Error al guardar la venta",
                 f"Ocurrió un error al guardar la venta: {str(e)}"
             )
-
-def agregar_producto_tabla(self, item_data):
-    """Agrega un producto a la tabla de la venta"""
-    producto = item_data['producto']
-    
-    row = self.tabla_productos.rowCount()
-    self.tabla_productos.insertRow(row)
-    
-    # Código
-    codigo_item = QTableWidgetItem(producto.codigo)
-    self.tabla_productos.setItem(row, 0, codigo_item)
-    
-    # Nombre
-    nombre_item = QTableWidgetItem(producto.nombre)
-    self.tabla_productos.setItem(row, 1, nombre_item)
-    
-    # Precio unitario
-    precio_item = QTableWidgetItem(f"$ {item_data['precio_unitario']:.2f}")
-    precio_item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-    self.tabla_productos.setItem(row, 2, precio_item)
-    
-    # Cantidad
-    cantidad_item = QTableWidgetItem(str(item_data['cantidad']))
-    cantidad_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-    self.tabla_productos.setItem(row, 3, cantidad_item)
-    
-    # Subtotal
-    subtotal_item = QTableWidgetItem(f"$ {item_data['subtotal']:.2f}")
-    subtotal_item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-    self.tabla_productos.setItem(row, 4, subtotal_item)
-    
-    # Ajustar columnas
-    self.tabla_productos.resizeColumnsToContents()
-
-def eliminar_producto(self):
-    """Elimina el producto seleccionado de la venta"""
-    selected = self.tabla_productos.selectedItems()
-    if not selected:
-        QMessageBox.warning(self, "Selección requerida", "Por favor, seleccione un producto para eliminar.")
-        return
-    
-    row = selected[0].row()
-    producto = self.tabla_productos.item(row, 1).text()
-    
-    reply = QMessageBox.question(
-        self,
-        "Confirmar eliminación",
-        f"¿Está seguro de eliminar el producto {producto} de la venta?",
-        QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
-        QMessageBox.StandardButton.No
-    )
-    
-    if reply == QMessageBox.StandardButton.Yes:
-        self.tabla_productos.removeRow(row)
-        self.actualizar_total()
-
-def actualizar_total(self):
-    """Actualiza el total de la venta"""
-    total = 0.0
-    
-    for row in range(self.tabla_productos.rowCount()):
-        subtotal_text = self.tabla_productos.item(row, 4).text().replace("$", "").strip()
-        try:
-            subtotal = float(subtotal_text)
-            total += subtotal
-        except ValueError:
-            pass
-    
-    self.total_label.setText(f"$ {total:.2f}")
-
-def actualizar_botones(self):
-    """Actualiza el estado de los botones según la selección"""
-    selected = bool(self.tabla_productos.selectedItems())
-    self.btn_eliminar_producto.setEnabled(selected and not self.read_only)
-
-def guardar_venta(self):
-    """Guarda la venta en la base de datos"""
-    # Validar que haya al menos un producto
-    if self.tabla_productos.rowCount() == 0:
-        QMessageBox.warning(self, "Venta vacía", "Debe agregar al menos un producto a la venta.")
-        return
-    
-    # Crear o actualizar la venta
-    self.venta.fecha_venta = self.fecha_input.date().toPyDate()
-    self.venta.notas = self.notas_input.toPlainText()
-    
-    # Limpiar ítems existentes
-    self.venta.items = []
-    
-    # Agregar ítems a la venta
-    for row in range(self.tabla_productos.rowCount()):
-        codigo = self.tabla_productos.item(row, 0).text()
-        producto = Producto.obtener_por_codigo(codigo)
-        if not producto:
-            QMessageBox.critical(
-                self,
-                "Error",
-                f"No se encontró el producto con código {codigo}."
-            )
-            return
-        cantidad = int(self.tabla_productos.item(row, 3).text())
-        precio_text = self.tabla_productos.item(row, 2).text().replace("$", "").strip()
-        precio = float(precio_text)
-        # Verificar stock si es una venta nueva
-        if self.venta_id is None and producto.cantidad < cantidad:
-            QMessageBox.warning(
-                self,
-                "Stock insuficiente",
-                f"No hay suficiente stock para el producto {producto.nombre}.\n"
-                f"Stock disponible: {producto.cantidad}"
-            )
-            return
-        self.venta.agregar_item(producto.id, cantidad, precio)
-    
-    # Disminuir stock solo si es una venta nueva
-    if self.venta_id is None:
-        for item in self.venta.items:
-            producto = Producto.obtener_por_id(item.producto_id)
-            if producto:
-                producto.actualizar_cantidad(producto.cantidad - item.cantidad, "Salida por nueva venta")
-    
-    # Guardar la venta
-    try:
-        self.venta.guardar()
-        QMessageBox.information(
-            self,
-            "Venta guardada",
-            f"La venta {self.venta.codigo_venta} ha sido guardada correctamente."
-        )
-        self.venta_guardada.emit()
-        self.accept()
-    except Exception as e:
-        QMessageBox.critical(
-            self,
-            "Error al guardar",
-            f"No se pudo guardar la venta. Error: {str(e)}"
-        )
-
-def cancelar_venta(self):
-    """Cancela la venta actual"""
-    
-    reply = QMessageBox.question(
-        self, 
-        "Confirmar cancelación",
-        f"¿Está seguro de cancelar la venta {self.venta.codigo_venta}?\n"
-        "Esta acción no se puede deshacer y devolverá el stock al inventario.",
-        QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
-        QMessageBox.StandardButton.No
-    )
-    
-    if reply == QMessageBox.StandardButton.Yes:
-        motivo = "Cancelado desde el diálogo de edición"
-        try:
-            if Venta.cancelar_venta(self.venta.id, motivo):
-                QMessageBox.information(
-                    self,
-                    "Venta cancelada",
-                    f"La venta {self.venta.codigo_venta} ha sido cancelada."
-                )
-                self.venta_guardada.emit()
-                self.reject()
-            else:
-                QMessageBox.critical(
-                    self,
-                    "Error",
-                    "No se pudo cancelar la venta."
-                )
-        except Exception as e:
-            QMessageBox.critical(
-                self,
-                "Error al cancelar",
-                f"No se pudo cancelar la venta. Error: {str(e)}"
-            )
@@ -1,5 +1,3 @@
-import os
-import sys
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
     QTableWidget, QTableWidgetItem, QHeaderView, QLabel,
@@ -7,14 +5,18 @@ from PyQt6.QtWidgets import (
     QAbstractItemView, QDialog, QDialogButtonBox, QSpinBox,
     QDoubleSpinBox, QSizePolicy, QFrame
 )
-from PyQt6.QtCore import Qt, pyqtSignal, QDate, QSize
+from PyQt6.QtCore import Qt, pyqtSignal, QDate, QSize, QTimer
 from PyQt6.QtGui import QIcon, QFont, QPixmap
 
-# Add the src directory to the Python path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from src.models.venta import Venta
+from src.views.components.cambios import ReceptorCambios
+from src import eventos
 
-from models.venta import Venta, VentaItem
-from models.producto import Producto
+# Ventas que se piden a la base de datos cada vez que el usuario llega al final de la tabla
+TAMANO_PAGINA = 100
+
+# Espera tras la última tecla antes de repetir la búsqueda en la base de datos
+DEBOUNCE_BUSQUEDA_MS = 250
 
 
 class VentaItemDialog(QDialog):
@@ -96,6 +98,14 @@ class VentasView(QWidget):
     
     def __init__(self, parent=None):
         super().__init__(parent)
+        self._cursor = None
+        self._hay_mas = False
+        self._timer_busqueda = QTimer(self)
+        self._timer_busqueda.setSingleShot(True)
+        self._timer_busqueda.setInterval(DEBOUNCE_BUSQUEDA_MS)
+        self._timer_busqueda.timeout.connect(self.cargar_ventas)
+        self.cambios = ReceptorCambios(eventos.VENTA, parent=self)
+        self.cambios.cambio.connect(self.aplicar_cambio)
         try:
             self.setup_ui()
             self.cargar_ventas()
@@ -170,6 +180,8 @@ class VentasView(QWidget):
         self.tabla_ventas.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         self.tabla_ventas.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
         self.tabla_ventas.verticalHeader().setVisible(False)
+        # Pedir la siguiente página al acercarse al final del scroll
+        self.tabla_ventas.verticalScrollBar().valueChanged.connect(self.on_scroll_ventas)
         
         layout.addWidget(self.tabla_ventas)
 
@@ -242,25 +254,59 @@ class VentasView(QWidget):
         """)
     
     def cargar_ventas(self):
-        """Carga las ventas en la tabla"""
+        """Carga la primera página de ventas en la tabla"""
         self.tabla_ventas.setRowCount(0)
+        self._cursor = None
+        self._hay_mas = True
+        self.cargar_mas_ventas()
+        # Actualizar resumen después de cargar
+        self.actualizar_resumen()
+
+    def cargar_mas_ventas(self):
+        """Agrega a la tabla la siguiente página de ventas, si existe"""
+        if not self._hay_mas:
+            return
         
         fecha_desde = self.fecha_desde.date().toPyDate()
         fecha_hasta = self.fecha_hasta.date().toPyDate()
-        ventas = Venta.obtener_todas(fecha_desde, fecha_hasta)
+        # La búsqueda va en la consulta: todas las filas cargadas son visibles
+        ventas, self._cursor = Venta.obtener_pagina(
+            fecha_desde, fecha_hasta, limite=TAMANO_PAGINA, cursor=self._cursor,
+            con_items=False, con_resumen=True, termino=self.termino_busqueda()
+        )
+        self._hay_mas = self._cursor is not None
         
         for venta in ventas:
             self.agregar_venta_tabla(venta)
-        # Actualizar resumen después de cargar
-        self.actualizar_resumen()
+        
+        # Si la página no llena la tabla no habrá scroll: revisar tras el relayout
+        if self._hay_mas:
+            QTimer.singleShot(0, self.completar_tabla_visible)
+
+    def completar_tabla_visible(self):
+        """Pide más páginas mientras la tabla visible no tenga barra de scroll"""
+        if self._hay_mas and self.tabla_ventas.isVisible() and self.tabla_ventas.verticalScrollBar().maximum() == 0:
+            self.cargar_mas_ventas()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        QTimer.singleShot(0, self.completar_tabla_visible)
+
+    def on_scroll_ventas(self, valor):
+        """Carga la siguiente página cuando el scroll llega cerca del final"""
+        barra = self.tabla_ventas.verticalScrollBar()
+        if self._hay_mas and valor >= barra.maximum() - 5:
+            self.cargar_mas_ventas()
     
-    def agregar_venta_tabla(self, venta):
-        """Agrega una venta a la tabla"""
-        row = self.tabla_ventas.rowCount()
+    def agregar_venta_tabla(self, venta, row=None):
+        """Agrega una venta a la tabla (al final, o en la fila ``row``)"""
+        if row is None:
+            row = self.tabla_ventas.rowCount()
         self.tabla_ventas.insertRow(row)
         
-        # Código
+        # Código (con el id de la venta para ubicar la fila cuando cambie)
         codigo_item = QTableWidgetItem(venta.codigo_venta)
+        codigo_item.setData(Qt.ItemDataRole.UserRole, venta.id)
         self.tabla_ventas.setItem(row, 0, codigo_item)
         
         # Fecha
@@ -269,13 +315,7 @@ class VentasView(QWidget):
 
         # Productos (lista corta "Nombre x Cant.")
         try:
-            venta_completa = Venta.obtener_por_id(venta.id)
-            resumen_items = []
-            if venta_completa and getattr(venta_completa, 'items', None):
-                for it in venta_completa.items:
-                    prod = Producto.obtener_por_id(it.producto_id)
-                    if prod:
-                        resumen_items.append(f"{prod.nombre} x {it.cantidad}")
+            resumen_items = venta.lineas_resumen()
             # Limitar a 3 elementos y recortar
             max_items = 3
             mostrado = resumen_items[:max_items]
@@ -310,6 +350,36 @@ class VentasView(QWidget):
         acciones_layout.addStretch()
         self.tabla_ventas.setCellWidget(row, 4, acciones_widget)
     
+    def fila_de_venta(self, venta_id):
+        """Fila de la tabla que muestra la venta, o None"""
+        for row in range(self.tabla_ventas.rowCount()):
+            item = self.tabla_ventas.item(row, 0)
+            if item is not None and item.data(Qt.ItemDataRole.UserRole) == venta_id:
+                return row
+        return None
+    
+    def aplicar_cambio(self, cambio):
+        """Agrega o repinta solo las ventas afectadas por un cambio confirmado"""
+        desde = self.fecha_desde.date().toPyDate()
+        hasta = self.fecha_hasta.date().toPyDate()
+        for venta_id in cambio.ids:
+            row = self.fila_de_venta(venta_id)
+            if row is not None:
+                self.tabla_ventas.removeRow(row)
+            venta = Venta.obtener_por_id(venta_id) if cambio.operacion != eventos.ELIMINADO else None
+            if venta is None:
+                continue
+            if not self.coincide_busqueda(venta):
+                continue
+            if row is None:
+                # Las ventas nuevas van arriba si caen en el rango de fechas mostrado
+                if not (desde <= venta.fecha_venta.date() <= hasta):
+                    continue
+                row = 0
+            self.agregar_venta_tabla(venta, row)
+        
+        self.actualizar_resumen()
+    
     def nueva_venta(self):
         """Abre el diálogo para crear una nueva venta"""
         from .venta_dialog import VentaDialog
@@ -318,8 +388,7 @@ class VentasView(QWidget):
         dialog.exec()
     
     def on_venta_guardada(self, venta_id):
-        """Maneja el evento de venta guardada"""
-        self.cargar_ventas()  # Recargar la lista de ventas
+        """Maneja el evento de venta guardada (la tabla se actualiza con el cambio publicado)"""
         self.venta_realizada.emit()  # Notificar a otras partes de la aplicación
         
         # Mostrar mensaje de éxito
@@ -354,7 +423,6 @@ class VentasView(QWidget):
                     "Venta cancelada",
                     f"La venta {venta.codigo_venta} ha sido cancelada."
                 )
-                self.cargar_ventas()
                 self.venta_realizada.emit()
             else:
                 QMessageBox.critical(
@@ -363,22 +431,23 @@ class VentasView(QWidget):
                     "No se pudo cancelar la venta."
                 )
     
-    def buscar_ventas(self):
-        """Busca ventas por código"""
-        texto = self.buscar_input.text().strip().lower()
+    def termino_busqueda(self):
+        """Texto de búsqueda actual, o None si está vacío"""
+        return self.buscar_input.text().strip() or None
 
-        for row in range(self.tabla_ventas.rowCount()):
-            # Código
-            codigo_item = self.tabla_ventas.item(row, 0)
-            codigo = codigo_item.text().lower() if codigo_item else ""
-            # Productos (columna 2)
-            productos_item = self.tabla_ventas.item(row, 2)
-            productos = productos_item.text().lower() if productos_item else ""
+    def coincide_busqueda(self, venta):
+        """Indica si una venta cumple la búsqueda actual (mismo criterio que Venta._filtros)"""
+        texto = self.termino_busqueda()
+        if not texto:
+            return True
+        texto = texto.lower()
+        return texto in venta.codigo_venta.lower() or any(
+            texto in linea.rsplit(" x ", 1)[0].lower() for linea in venta.lineas_resumen()
+        )
 
-            coincide = (texto in codigo) or (texto in productos)
-            self.tabla_ventas.setRowHidden(row, not coincide) if texto else self.tabla_ventas.setRowHidden(row, False)
-        # Actualizar resumen considerando filas visibles
-        self.actualizar_resumen()
+    def buscar_ventas(self):
+        """Busca ventas por código o producto (con debounce, en la base de datos)"""
+        self._timer_busqueda.start()
     
     def filtrar_ventas(self):
         """Filtra las ventas por fecha y estado"""
@@ -386,20 +455,11 @@ class VentasView(QWidget):
 
     def actualizar_resumen(self):
         """Actualiza el resumen de ventas en el pie de página"""
-        total_ventas_visibles = 0
-        monto_total = 0.0
-
-        for row in range(self.tabla_ventas.rowCount()):
-            if self.tabla_ventas.isRowHidden(row):
-                continue
-            total_ventas_visibles += 1
-            total_text = self.tabla_ventas.item(row, 3)
-            if total_text:
-                valor = total_text.text().replace('$', '').replace(',', '').strip()
-                try:
-                    monto_total += float(valor)
-                except ValueError:
-                    pass
-
-        self.lbl_total_ventas.setText(f"Total de ventas: {total_ventas_visibles}")
+        # El resumen cubre todo el rango y la búsqueda, no solo las páginas cargadas
+        total_ventas, monto_total = Venta.totales(
+            self.fecha_desde.date().toPyDate(),
+            self.fecha_hasta.date().toPyDate(),
+            termino=self.termino_busqueda()
+        )
+        self.lbl_total_ventas.setText(f"Total de ventas: {total_ventas}")
         self.lbl_monto_total.setText(f"Monto total: ${monto_total:,.2f}")
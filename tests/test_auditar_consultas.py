@@ -0,0 +1,7 @@
+from src.tools.auditar_consultas import auditar
+
+
+def test_ninguna_consulta_recorre_tablas_sin_permiso():
+    """Falla si una consulta de los modelos vuelve a un SCAN o B-tree temporal no permitido"""
+    marcadas = {nombre: problemas for nombre, _, _, problemas in auditar() if problemas}
+    assert marcadas == {}
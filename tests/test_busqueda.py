@@ -0,0 +1,65 @@
+import itertools
+
+import pytest
+
+from src.database import db, PRODUCTOS_FTS_BORRAR, _ejecutar_script
+from src.models.producto import Producto
+
+_numeros = itertools.count(1)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def esquema():
+    db.preparar_esquema()
+
+
+@pytest.fixture
+def naranja():
+    n = next(_numeros)
+    producto = Producto(f"77012345{n:05d}", f"Naranja Valencia {n}", 1.5, 10)
+    producto.guardar()
+    return producto
+
+
+def ids(resultados):
+    return {producto.id for producto in resultados}
+
+
+def test_busca_en_cualquier_parte_del_nombre(naranja):
+    assert naranja.id in ids(Producto.buscar("anj"))
+    assert naranja.id in ids(Producto.buscar("VALENC"))
+    assert naranja.id in ids(Producto.buscar("lencia ranja"))
+    assert naranja.id not in ids(Producto.buscar("anj manzana"))
+
+
+def test_busca_por_los_ultimos_digitos_del_codigo(naranja):
+    assert naranja.id in ids(Producto.buscar(naranja.codigo[-5:]))
+    assert naranja.id in ids(Producto.buscar(naranja.codigo[4:9]))
+
+
+def test_terminos_cortos_usan_like(naranja):
+    assert Producto.expresion_busqueda("an") is None
+    assert naranja.id in ids(Producto.buscar("an"))
+    # Con alguna palabra indexable, las cortas se omiten
+    assert Producto.expresion_busqueda("naranja 1l") == '"naranja"'
+
+
+def test_indice_anterior_se_rehace_con_trigramas(naranja):
+    with db.transaction() as connection:
+        cursor = connection.cursor()
+        _ejecutar_script(cursor, PRODUCTOS_FTS_BORRAR)
+        cursor.execute(
+            "CREATE VIRTUAL TABLE productos_fts USING fts5(codigo, nombre, content='productos', "
+            "content_rowid='id', tokenize='unicode61 remove_diacritics 2', prefix='1 2 3')"
+        )
+        cursor.execute("INSERT INTO productos_fts(productos_fts) VALUES ('rebuild')")
+    assert naranja.id not in ids(Producto.buscar("anj"))
+
+    with db.transaction() as connection:
+        db._crear_indice_busqueda(connection.cursor())
+
+    assert naranja.id in ids(Producto.buscar("anj"))
+    # Los triggers se recrearon con la tabla: los productos nuevos también se indexan
+    otra = Producto(f"99-{next(_numeros)}", "Toronja rosada", 2.0, 5)
+    otra.guardar()
+    assert otra.id in ids(Producto.buscar("onja ros"))
@@ -0,0 +1,64 @@
+import itertools
+
+import pytest
+
+from src.database import db
+from src.models.producto import Producto
+from src.models.venta import Venta
+
+_numeros = itertools.count(1)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def esquema():
+    db.preparar_esquema()
+
+
+@pytest.fixture
+def producto():
+    """Producto ya leído, de modo que está en el mapa de identidad"""
+    nuevo = Producto(f"CACHE-{next(_numeros)}", "Arroz", 2.0, 50)
+    nuevo.guardar()
+    producto = Producto.obtener_por_id(nuevo.id)
+    assert Producto.obtener_por_id(nuevo.id) is producto
+    return producto
+
+
+def test_aplicar_deltas_invalida_los_productos_cambiados(producto):
+    Producto.aplicar_deltas_stock({producto.id: -5})
+
+    fresco = Producto.obtener_por_id(producto.id)
+    assert fresco is not producto
+    assert fresco.cantidad == 45
+    assert Producto.obtener_por_codigo(producto.codigo).cantidad == 45
+
+
+def test_deltas_en_cero_no_invalidan(producto):
+    assert Producto.aplicar_deltas_stock([(producto.id, 3), (producto.id, -3)]) == 0
+    assert Producto.obtener_por_id(producto.id) is producto
+
+
+def test_transaccion_revertida_no_invalida(producto):
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            Producto.aplicar_deltas_stock({producto.id: -5})
+            # Dentro de la transacción el mapa no se usa: se ve el cambio propio
+            assert Producto.obtener_por_id(producto.id).cantidad == 45
+            raise RuntimeError("falla")
+
+    assert Producto.obtener_por_id(producto.id) is producto
+    assert producto.cantidad == 50
+
+
+def test_vender_y_cancelar_invalidan_el_stock(producto):
+    venta = Venta()
+    venta.agregar_item(producto.id, 4, producto.precio)
+    venta.guardar()
+    vendido = Producto.obtener_por_id(producto.id)
+    assert vendido.cantidad == 46
+
+    assert Venta.cancelar_venta(venta.id, "prueba")
+
+    repuesto = Producto.obtener_por_id(producto.id)
+    assert repuesto is not vendido
+    assert repuesto.cantidad == 50
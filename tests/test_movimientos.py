@@ -0,0 +1,81 @@
+import itertools
+from datetime import date, datetime
+
+import pytest
+
+from src.database import db
+from src.models import movimiento
+from src.models.movimiento import Movimiento
+from src.models.producto import Producto
+
+_numeros = itertools.count(1)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def esquema():
+    db.preparar_esquema()
+
+
+@pytest.fixture
+def reloj(monkeypatch):
+    """Fija la fecha con que se registran los movimientos"""
+    actual = {}
+    monkeypatch.setattr(movimiento, "ahora", lambda: actual["fecha"])
+
+    def fijar(fecha):
+        actual["fecha"] = fecha
+    return fijar
+
+
+@pytest.fixture
+def producto(reloj):
+    """Historia: 10 el 1/3, -3 el 5/3 a las 9:00, +5 el 5/3 a las 18:00, ajuste a 4 el 10/3"""
+    reloj("2002-03-01 10:00:00")
+    producto = Producto(f"MOV-{next(_numeros)}", "Café molido", 3.0, 10)
+    producto.guardar()
+    reloj("2002-03-05 09:00:00")
+    Producto.aplicar_deltas_stock({producto.id: -3})
+    reloj("2002-03-05 18:00:00")
+    Producto.aplicar_deltas_stock({producto.id: 5})
+    reloj("2002-03-10 12:00:00")
+    producto = Producto.obtener_por_id(producto.id)
+    producto.cantidad = 4
+    producto.actualizar()
+    return producto
+
+
+@pytest.mark.parametrize("fecha, stock", [
+    (date(2002, 2, 28), 0),
+    (date(2002, 3, 1), 10),
+    (date(2002, 3, 4), 10),
+    (datetime(2002, 3, 5, 8, 59, 59), 10),
+    (datetime(2002, 3, 5, 9, 0, 0), 7),
+    (date(2002, 3, 5), 12),
+    (date(2002, 3, 9), 12),
+    (date(2002, 3, 10), 4),
+    (date(2030, 1, 1), 4),
+])
+def test_stock_en_fecha_es_el_saldo_del_ultimo_movimiento(producto, fecha, stock):
+    assert Movimiento.stock_en_fecha(producto.id, fecha) == stock
+
+
+def test_producto_sin_movimientos_usa_la_cantidad_actual():
+    producto_id = db.execute_query(
+        "INSERT INTO productos (codigo, nombre, precio, cantidad) VALUES (?, ?, ?, ?)",
+        (f"MOV-{next(_numeros)}", "Sin historia", 1.0, 6)
+    )
+    assert Movimiento.stock_en_fecha(producto_id, date(2002, 1, 1)) == 6
+
+
+def test_producto_inexistente_devuelve_none():
+    assert Movimiento.stock_en_fecha(-1, date.today()) is None
+
+
+def test_fecha_invalida():
+    with pytest.raises(TypeError):
+        Movimiento.stock_en_fecha(1, "2002-03-01")
+
+
+def test_stock_de_todos_coincide_con_el_individual(producto):
+    stock = {fila.producto_id: fila.stock for fila in Movimiento.stock_en_fecha_todos(date(2002, 3, 5))}
+    assert stock[producto.id] == 12
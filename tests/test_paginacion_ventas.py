@@ -0,0 +1,80 @@
+import itertools
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from src.database import db
+from src.models.producto import Producto
+from src.models.venta import Venta
+
+_dias = itertools.count(0)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def esquema():
+    db.preparar_esquema()
+
+
+@pytest.fixture
+def dia():
+    """Un día sin otras ventas, para que cada prueba vea solo las suyas"""
+    return date(2001, 1, 1) + timedelta(days=next(_dias))
+
+
+def vender(producto, fecha):
+    venta = Venta(fecha_venta=fecha)
+    venta.agregar_item(producto.id, 1, 1.0)
+    venta.guardar()
+    return venta
+
+
+def todas_las_paginas(dia, limite, **filtros):
+    paginas, cursor = [], None
+    while True:
+        ventas, cursor = Venta.obtener_pagina(dia, dia, limite=limite, cursor=cursor,
+                                              con_items=False, **filtros)
+        paginas.append([venta.id for venta in ventas])
+        if cursor is None:
+            return paginas
+
+
+@pytest.fixture
+def producto(dia):
+    producto = Producto(f"PAG-{dia.isoformat()}", "Pera de agua", 1.0, 1000)
+    producto.guardar()
+    return producto
+
+
+def test_ventas_con_la_misma_fecha_no_se_repiten_ni_se_pierden(dia, producto):
+    mediodia = datetime.combine(dia, datetime.min.time()) + timedelta(hours=12)
+    iguales = [vender(producto, mediodia).id for _ in range(5)]
+    antes = vender(producto, mediodia - timedelta(hours=1)).id
+    despues = vender(producto, mediodia + timedelta(hours=1)).id
+
+    for limite in (1, 2, 3, 5, 7, 10):
+        paginas = todas_las_paginas(dia, limite)
+        ids = [venta_id for pagina in paginas for venta_id in pagina]
+        # Orden (fecha_venta DESC, id DESC); el empate se resuelve por id
+        assert ids == [despues] + sorted(iguales, reverse=True) + [antes]
+        assert all(len(pagina) <= limite for pagina in paginas)
+
+
+def test_la_ultima_pagina_llena_no_deja_cursor(dia, producto):
+    mediodia = datetime.combine(dia, datetime.min.time()) + timedelta(hours=12)
+    for _ in range(4):
+        vender(producto, mediodia)
+    paginas = todas_las_paginas(dia, 2)
+    assert [len(pagina) for pagina in paginas] == [2, 2]
+
+
+def test_la_busqueda_pagina_solo_las_coincidencias(dia, producto):
+    otro = Producto(f"PAG-X-{dia.isoformat()}", "Sandía", 1.0, 1000)
+    otro.guardar()
+    mediodia = datetime.combine(dia, datetime.min.time()) + timedelta(hours=12)
+    peras = [vender(producto, mediodia).id for _ in range(3)]
+    for _ in range(3):
+        vender(otro, mediodia)
+
+    paginas = todas_las_paginas(dia, 2, termino="pera")
+    assert [venta_id for pagina in paginas for venta_id in pagina] == sorted(peras, reverse=True)
+    assert Venta.totales(dia, dia, termino="pera") == (3, 3.0)
@@ -0,0 +1,105 @@
+import sqlite3
+import threading
+
+import pytest
+
+from src.database import ConnectionPool
+
+
+@pytest.fixture
+def pool(tmp_path):
+    ruta = tmp_path / "pool.db"
+
+    def abrir():
+        return sqlite3.connect(ruta, isolation_level=None, check_same_thread=False)
+
+    pool = ConnectionPool(abrir, size=2, timeout=0.2)
+    yield pool
+    pool.close()
+
+
+def en_otro_hilo(funcion):
+    resultado = {}
+
+    def correr():
+        try:
+            resultado['valor'] = funcion()
+        except Exception as e:
+            resultado['error'] = e
+
+    hilo = threading.Thread(target=correr)
+    hilo.start()
+    hilo.join()
+    if 'error' in resultado:
+        raise resultado['error']
+    return resultado['valor']
+
+
+def test_extracciones_anidadas_reutilizan_la_conexion(pool):
+    with pool.checkout() as exterior:
+        with pool.checkout() as interior:
+            assert interior is exterior
+        # Salir del bloque interno no devuelve la conexión al pool
+        assert pool._libres == []
+    assert pool._total == 1
+    assert len(pool._libres) == 1
+
+
+def test_la_conexion_liberada_se_reutiliza(pool):
+    with pool.checkout() as primera:
+        pass
+    with pool.checkout() as segunda:
+        assert segunda is primera
+
+
+def test_cada_hilo_usa_su_propia_conexion(pool):
+    with pool.checkout() as propia:
+        def extraer():
+            with pool.checkout() as otra:
+                return otra
+        assert en_otro_hilo(extraer) is not propia
+
+
+def test_pool_lleno_espera_y_luego_falla(pool):
+    def extraer():
+        with pool.checkout():
+            pass
+
+    with pool.checkout():
+        en_otro_hilo(extraer)  # segunda conexión: cabe en el pool
+        tomada, soltar = threading.Event(), threading.Event()
+
+        def retener():
+            with pool.checkout():
+                tomada.set()
+                soltar.wait()
+
+        hilo = threading.Thread(target=retener)
+        hilo.start()
+        tomada.wait()
+        try:
+            with pytest.raises(sqlite3.OperationalError):
+                en_otro_hilo(extraer)
+        finally:
+            soltar.set()
+            hilo.join()
+
+
+def test_liberar_revierte_la_transaccion_abierta(pool):
+    with pool.checkout() as connection:
+        connection.execute("CREATE TABLE t (x)")
+        connection.execute("BEGIN")
+        connection.execute("INSERT INTO t VALUES (1)")
+    with pool.checkout() as connection:
+        assert not connection.in_transaction
+        assert connection.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+
+
+def test_pool_cerrado_rechaza_extracciones(pool):
+    pool.close()
+    with pytest.raises(sqlite3.ProgrammingError):
+        with pool.checkout():
+            pass
+    pool.reset()
+    with pool.checkout():
+        pass
@@ -0,0 +1,97 @@
+import itertools
+
+import pytest
+
+from src.database import db, VENTAS_DIARIAS_LLENAR
+from src.models.categoria import Categoria
+from src.models.producto import Producto
+from src.models.reporte import Reporte
+from src.models.venta import Venta
+
+
+def acumulados():
+    """Contenido de todas las tablas de acumulados, sin las filas en cero"""
+    contenido = {}
+    with db.connection() as connection:
+        for tabla in VENTAS_DIARIAS_LLENAR:
+            filas = connection.execute(f"SELECT * FROM {tabla} WHERE ventas != 0 ORDER BY 1, 2").fetchall()
+            contenido[tabla] = [tuple(fila) for fila in filas]
+    return contenido
+
+
+_numeros = itertools.count(1)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def esquema():
+    db.preparar_esquema()
+
+
+@pytest.fixture
+def producto():
+    n = next(_numeros)
+    categoria = Categoria(nombre=f"Bebidas {n}")
+    categoria.guardar()
+    producto = Producto(f"REP-{n}", "Jugo", 10.0, 100, categoria_id=categoria.id)
+    producto.guardar()
+    return producto
+
+
+def cambiar_categoria(producto, nombre):
+    categoria = Categoria(nombre=f"{nombre} {next(_numeros)}")
+    categoria.guardar()
+    producto.categoria_id = categoria.id
+    producto.actualizar()
+    return categoria
+
+
+def test_cancelar_tras_cambio_de_categoria_coincide_con_reconstruir(producto):
+    venta = Venta()
+    venta.agregar_item(producto.id, 3, 10.0)
+    venta.guardar()
+    original = producto.categoria_id
+    cambiar_categoria(producto, "Lácteos")
+
+    Venta.cancelar_venta(venta.id, "prueba")
+
+    incrementales = acumulados()
+    Reporte.reconstruir()
+    assert incrementales == acumulados()
+    assert original not in {fila.categoria_id for fila in Reporte.por_categoria()}
+
+
+def test_editar_tras_cambio_de_categoria_coincide_con_reconstruir(producto):
+    venta = Venta()
+    venta.agregar_item(producto.id, 2, 10.0)
+    venta.guardar()
+    nueva = cambiar_categoria(producto, "Snacks")
+
+    venta.items[0].cantidad = 4
+    venta.items[0].calcular_subtotal()
+    venta.guardar()
+
+    incrementales = acumulados()
+    Reporte.reconstruir()
+    assert incrementales == acumulados()
+    # La versión editada cuenta en la categoría que tiene el producto al guardarla
+    por_categoria = {fila.categoria_id: fila.ingresos for fila in Reporte.por_categoria()}
+    assert por_categoria[nueva.id] == 40.0
+
+
+def test_migraciones_y_cancelar_tras_cambio_de_categoria(producto):
+    from run_migrations import run_migrations
+
+    venta = Venta()
+    venta.agregar_item(producto.id, 3, 10.0)
+    venta.guardar()
+    original = producto.categoria_id
+    cambiar_categoria(producto, "Congelados")
+
+    # 007 vuelve a llenar los acumulados; 013 debe dejarlos con la categoría de la venta
+    run_migrations()
+    Venta.cancelar_venta(venta.id, "prueba")
+
+    incrementales = acumulados()
+    Reporte.reconstruir()
+    assert incrementales == acumulados()
+    assert original not in {fila.categoria_id for fila in Reporte.por_categoria()}
@@ -0,0 +1,93 @@
+import pytest
+
+from src.database import db
+
+
+@pytest.fixture(scope="module", autouse=True)
+def tabla():
+    db.preparar_esquema()
+    db.execute_query("CREATE TABLE IF NOT EXISTS prueba_transacciones (valor TEXT)")
+
+
+@pytest.fixture(autouse=True)
+def vaciar():
+    db.execute_query("DELETE FROM prueba_transacciones")
+
+
+def insertar(valor):
+    db.execute_query("INSERT INTO prueba_transacciones (valor) VALUES (?)", (valor,))
+
+
+def valores():
+    filas = db.execute_query("SELECT valor FROM prueba_transacciones ORDER BY rowid")
+    return [fila['valor'] for fila in filas]
+
+
+def test_confirma_al_salir_del_bloque():
+    with db.transaction():
+        insertar("a")
+        insertar("b")
+        assert db.in_transaction()
+    assert not db.in_transaction()
+    assert valores() == ["a", "b"]
+
+
+def test_error_revierte_todo_el_bloque():
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            insertar("a")
+            raise RuntimeError("falla")
+    assert valores() == []
+
+
+def test_error_en_bloque_anidado_solo_revierte_su_savepoint():
+    with db.transaction():
+        insertar("exterior")
+        with pytest.raises(RuntimeError):
+            with db.transaction():
+                insertar("interior")
+                raise RuntimeError("falla")
+        insertar("despues")
+    assert valores() == ["exterior", "despues"]
+
+
+def test_error_exterior_revierte_los_savepoints_confirmados():
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            with db.transaction():
+                insertar("interior")
+            raise RuntimeError("falla")
+    assert valores() == []
+
+
+def test_al_confirmar_espera_al_commit_exterior():
+    ejecutados = []
+    with db.transaction():
+        with db.transaction():
+            db.al_confirmar(lambda: ejecutados.append("interior"))
+        db.al_confirmar(lambda: ejecutados.append("exterior"))
+        assert ejecutados == []
+    assert ejecutados == ["interior", "exterior"]
+
+
+def test_al_confirmar_se_descarta_con_el_bloque_revertido():
+    ejecutados = []
+    with db.transaction():
+        db.al_confirmar(lambda: ejecutados.append("exterior"))
+        with pytest.raises(RuntimeError):
+            with db.transaction():
+                db.al_confirmar(lambda: ejecutados.append("interior"))
+                raise RuntimeError("falla")
+    assert ejecutados == ["exterior"]
+
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            db.al_confirmar(lambda: ejecutados.append("revertido"))
+            raise RuntimeError("falla")
+    assert ejecutados == ["exterior"]
+
+
+def test_al_confirmar_fuera_de_transaccion_se_ejecuta_de_inmediato():
+    ejecutados = []
+    db.al_confirmar(lambda: ejecutados.append("ya"))
+    assert ejecutados == ["ya"]